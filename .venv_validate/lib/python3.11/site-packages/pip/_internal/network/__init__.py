@@ -0,0 +1 @@
+"""Contains purely network-related utilities."""
@@ -0,0 +1,86 @@
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from pip._vendor.packaging.dependency_groups import DependencyGroupResolver
+from pip._vendor.packaging.errors import ExceptionGroup
+
+from pip._internal.exceptions import InstallationError
+from pip._internal.utils.compat import tomllib
+
+
+def parse_dependency_groups(groups: list[tuple[str, str]]) -> list[str]:
+    """
+    Parse dependency groups data as provided via the CLI, in a `[path:]group` syntax.
+
+    Raises InstallationErrors if anything goes wrong.
+    """
+    resolvers = _build_resolvers(path for (path, _) in groups)
+    return list(_resolve_all_groups(resolvers, groups))
+
+
+def _resolve_all_groups(
+    resolvers: dict[str, DependencyGroupResolver], groups: list[tuple[str, str]]
+) -> Iterator[str]:
+    """
+    Run all resolution, converting any error from `DependencyGroupResolver` into
+    an InstallationError.
+    """
+    for path, groupname in groups:
+        resolver = resolvers[path]
+        try:
+            yield from (str(req) for req in resolver.resolve(groupname))
+        except ExceptionGroup as eg:
+            # Convert ExceptionGroup to a single InstallationError with all messages
+            messages = [str(e) for e in eg.exceptions]
+            raise InstallationError(
+                f"[dependency-groups] resolution failed for '{groupname}' "
+                f"from '{path}': {'; '.join(messages)}"
+            ) from eg
+
+
+def _build_resolvers(paths: Iterable[str]) -> dict[str, Any]:
+    resolvers = {}
+    for path in paths:
+        if path in resolvers:
+            continue
+
+        pyproject = _load_pyproject(path)
+        if "dependency-groups" not in pyproject:
+            raise InstallationError(
+                f"[dependency-groups] table was missing from '{path}'. "
+                "Cannot resolve '--group' option."
+            )
+        raw_dependency_groups = pyproject["dependency-groups"]
+        if not isinstance(raw_dependency_groups, dict):
+            raise InstallationError(
+                f"[dependency-groups] table was malformed in {path}. "
+                "Cannot resolve '--group' option."
+            )
+
+        try:
+            resolvers[path] = DependencyGroupResolver(raw_dependency_groups)
+        except ExceptionGroup as eg:
+            # Handle ExceptionGroup from resolver initialization
+            messages = [str(e) for e in eg.exceptions]
+            raise InstallationError(
+                f"[dependency-groups] data was invalid in {path}: {'; '.join(messages)}"
+            ) from eg
+
+    return resolvers
+
+
+def _load_pyproject(path: str) -> dict[str, Any]:
+    """
+    This helper loads a pyproject.toml as TOML.
+
+    It raises an InstallationError if the operation fails.
+    """
+    try:
+        with open(path, "rb") as fp:
+            return tomllib.load(fp)
+    except FileNotFoundError:
+        raise InstallationError(f"{path} not found. Cannot resolve '--group' option.")
+    except tomllib.TOMLDecodeError as e:
+        raise InstallationError(f"Error parsing {path}: {e}") from e
+    except OSError as e:
+        raise InstallationError(f"Error reading {path}: {e}") from e
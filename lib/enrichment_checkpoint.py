@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, TypedDict
+
+from lib.json_files import read_json, write_json_atomic
+
+
+def default_checkpoint_dir(repo_root: Path) -> Path:
+    return repo_root / ".cache" / "enrichment"
+
+
+class CheckpointedPick(TypedDict, total=False):
+    url: str  # product URL the image was resolved from
+    image: str  # public path written to products[].image
+    fields: dict[str, Any]  # extra products[] keys (dimensions/variants)
+
+
+class EnrichmentCheckpoint:
+    """
+    Sidecar progress file for pick image enrichment, one JSON file per post:
+
+      <root>/<post_slug>.json -> {"version": 1, "picks": {pick_id: CheckpointedPick}}
+
+    Each finished pick is recorded immediately (atomic rewrite), so a run that dies or hits
+    its deadline before the frontmatter is written resumes without re-downloading. The file
+    is cleared once the post's frontmatter has been written.
+    """
+
+    def __init__(self, *, root: Path) -> None:
+        self._root = root
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def _path(self, slug: str) -> Path:
+        return self._root / f"{slug.strip().replace('/', '-')}.json"
+
+    def load(self, slug: str) -> dict[str, CheckpointedPick]:
+        raw = read_json(self._path(slug))
+        picks = raw.get("picks") if isinstance(raw, dict) else None
+        if not isinstance(picks, dict):
+            return {}
+        return {str(k): v for k, v in picks.items() if isinstance(v, dict) and v.get("image")}
+
+    def record(self, slug: str, pick_id: str, pick: CheckpointedPick) -> None:
+        picks = self.load(slug)
+        picks[pick_id] = pick
+        write_json_atomic(self._path(slug), {"version": 1, "picks": picks}, indent=None, sort_keys=False)
+
+    def clear(self, slug: str) -> None:
+        self._path(slug).unlink(missing_ok=True)
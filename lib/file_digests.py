@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from typing import TypedDict
+
+from lib.image_store import sha256_file
+from lib.json_files import read_json_items, write_json_atomic
+
+
+def default_file_digest_index_path(repo_root: Path) -> Path:
+    return repo_root / ".cache" / "file_digests.json"
+
+
+class FileDigest(TypedDict):
+    size: int
+    mtime_ns: int
+    sha256: str
+
+
+class FileDigestIndex:
+    """
+    SHA-256 digests of local files, keyed by absolute path and trusted while the file's
+    (size, mtime_ns) is unchanged. A rewritten file gets a new mtime and is hashed again.
+
+    With `path=None` the index lives in memory only (one hash per file per process);
+    otherwise it is loaded lazily and `save()` writes it back if anything changed.
+    Safe to share between threads.
+    """
+
+    def __init__(self, *, path: Path | None = None) -> None:
+        self._path = path
+        self._items: dict[str, FileDigest] | None = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> Path | None:
+        return self._path
+
+    def _load(self) -> dict[str, FileDigest]:
+        if self._items is not None:
+            return self._items
+        items: dict[str, FileDigest] = {}
+        if self._path is not None:
+            items = {k: v for k, v in read_json_items(self._path).items() if v.get("sha256")}  # type: ignore[misc]
+        self._items = items
+        return items
+
+    def digest(self, path: Path, st: os.stat_result | None = None) -> str:
+        """SHA-256 of `path`; only hashed when the index has no entry for its current size/mtime.
+
+        Pass `st` when the caller has already stat'ed the file.
+        """
+        st = st if st is not None else path.stat()
+        key = str(path.resolve())
+        with self._lock:
+            entry = self._load().get(key)
+        if entry and entry.get("size") == st.st_size and entry.get("mtime_ns") == st.st_mtime_ns:
+            return str(entry["sha256"])
+        digest = sha256_file(path)
+        self.remember(path, digest, st)
+        return digest
+
+    def remember(self, path: Path, digest: str, st: os.stat_result | None = None) -> None:
+        """Records a digest the caller already knows (e.g. right after copying a file)."""
+        st = st if st is not None else path.stat()
+        entry: FileDigest = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest}
+        with self._lock:
+            self._load()[str(path.resolve())] = entry
+            self._dirty = True
+
+    def prune_missing(self) -> int:
+        """Drops entries whose file no longer exists; returns how many were removed."""
+        with self._lock:
+            items = self._load()
+            gone = [k for k in items if not os.path.exists(k)]
+            for k in gone:
+                del items[k]
+            if gone:
+                self._dirty = True
+        return len(gone)
+
+    def save(self) -> None:
+        with self._lock:
+            if self._path is None or not self._dirty or self._items is None:
+                return
+            write_json_atomic(self._path, {"version": 1, "items": self._items})
+            self._dirty = False
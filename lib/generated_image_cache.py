@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+
+# Generated sources are ~1-2 MB each, so this keeps several hundred heroes.
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+
+def default_generated_image_cache_dir(repo_root: Path) -> Path:
+    return repo_root / ".cache" / "generated_images"
+
+
+def generated_image_key(*, prompt: str, model: str, size: str) -> str:
+    """Cache key of a generation request: the same prompt, model and size give the same key."""
+    payload = json.dumps({"prompt": prompt, "model": model, "size": size}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class GeneratedImageCache:
+    """
+    Raw images returned by the image API, keyed by `generated_image_key`.
+
+    On disk:
+      <root>/<key>.img    -> the image bytes exactly as the API returned them
+      <root>/<key>.json   -> request metadata (prompt, model, size, created_at), for inspection
+
+    Eviction is LRU by size: a hit refreshes the entry's mtime, and once the cache holds
+    more than `max_bytes` the least recently used entries are removed. Copy the directory
+    to another machine to reuse its generations there.
+    """
+
+    def __init__(self, *, root: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self._root = root
+        self._max_bytes = int(max_bytes)
+        self._lock = threading.Lock()
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def _path(self, key: str) -> Path:
+        return self._root / f"{key}.img"
+
+    def get(self, key: str) -> bytes | None:
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+        if not data:
+            return None
+        try:
+            os.utime(path)  # recency for LRU eviction
+        except OSError:
+            pass
+        return data
+
+    def put(self, key: str, data: bytes, *, prompt: str = "", model: str = "", size: str = "") -> None:
+        self._root.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.part")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        meta = {"prompt": prompt, "model": model, "size": size, "bytes": len(data), "created_at": time.time()}
+        path.with_suffix(".json").write_text(json.dumps(meta, indent=2, ensure_ascii=False), encoding="utf-8")
+        self.evict()
+
+    def usage(self) -> tuple[int, int]:
+        """(entries, bytes) currently cached."""
+        entries = [p.stat().st_size for p in self._root.glob("*.img")] if self._root.exists() else []
+        return len(entries), sum(entries)
+
+    def evict(self) -> int:
+        """Removes least recently used entries until the cache fits `max_bytes`; returns how many."""
+        if not self._root.exists():
+            return 0
+        with self._lock:
+            entries = []
+            for p in self._root.glob("*.img"):
+                try:
+                    st = p.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime_ns, st.st_size, p))
+            total = sum(size for _, size, _ in entries)
+            removed = 0
+            for _, size, p in sorted(entries, key=lambda e: e[0]):
+                if total <= self._max_bytes:
+                    break
+                p.unlink(missing_ok=True)
+                p.with_suffix(".json").unlink(missing_ok=True)
+                total -= size
+                removed += 1
+            return removed
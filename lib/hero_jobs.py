@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+
+
+# A job claimed longer ago than this is assumed to belong to a worker that died; it is
+# handed out again. Generation takes seconds, so this only matters after a crash.
+DEFAULT_LEASE_SECONDS = 15 * 60
+
+DEFAULT_MAX_ATTEMPTS = 5
+
+# Retry delay after the n-th failure: RETRY_BASE_SECONDS * 2**(n-1), capped.
+RETRY_BASE_SECONDS = 60.0
+RETRY_MAX_SECONDS = 60.0 * 60.0
+
+_PENDING = "pending"
+_RUNNING = "running"
+_FAILED = "failed"
+
+
+def default_hero_job_dir(repo_root: Path) -> Path:
+    return repo_root / ".cache" / "hero_jobs"
+
+
+@dataclass(frozen=True)
+class HeroJob:
+    slug: str
+    encoder_profile: str | None = None
+    reuse_generated_images: bool = True
+    enqueued_at: float = 0.0
+    attempts: int = 0
+    not_before: float = 0.0  # earliest retry time after a failure
+    last_error: str | None = None
+
+
+def _job_from_json(raw: object) -> HeroJob | None:
+    if not isinstance(raw, dict) or not str(raw.get("slug") or "").strip():
+        return None
+    return HeroJob(
+        slug=str(raw["slug"]),
+        encoder_profile=raw.get("encoder_profile") or None,
+        reuse_generated_images=bool(raw.get("reuse_generated_images", True)),
+        enqueued_at=float(raw.get("enqueued_at") or 0.0),
+        attempts=int(raw.get("attempts") or 0),
+        not_before=float(raw.get("not_before") or 0.0),
+        last_error=raw.get("last_error") or None,
+    )
+
+
+class HeroJobQueue:
+    """
+    Durable queue of deferred hero generations, one JSON file per post slug:
+
+      <root>/pending/<slug>.json  -> waiting (or waiting for a retry after `not_before`)
+      <root>/running/<slug>.json  -> claimed by a worker
+      <root>/failed/<slug>.json   -> gave up after `max_attempts`; re-enqueue to retry
+
+    Claiming renames the file from pending/ to running/, so concurrent workers never get
+    the same job and a job survives the process that enqueued it. Enqueueing a slug that is
+    already pending replaces its job (one generation per post, whatever the number of
+    hydrations). Jobs left in running/ longer than `lease_seconds` are handed out again.
+    """
+
+    def __init__(
+        self,
+        *,
+        root: Path,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    ) -> None:
+        self._root = root
+        self._lease_seconds = float(lease_seconds)
+        self._max_attempts = max(1, int(max_attempts))
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def _path(self, state: str, slug: str) -> Path:
+        return self._root / state / f"{slug.strip().replace('/', '-')}.json"
+
+    def _write(self, path: Path, job: HeroJob) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(asdict(job), ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def _read(self, path: Path) -> HeroJob | None:
+        try:
+            return _job_from_json(json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, json.JSONDecodeError, TypeError, ValueError):
+            return None
+
+    def _list(self, state: str) -> list[HeroJob]:
+        jobs = [self._read(p) for p in sorted((self._root / state).glob("*.json"))]
+        return [j for j in jobs if j is not None]
+
+    def enqueue(
+        self, slug: str, *, encoder_profile: str | None = None, reuse_generated_images: bool = True
+    ) -> HeroJob:
+        job = HeroJob(
+            slug=slug,
+            encoder_profile=encoder_profile,
+            reuse_generated_images=reuse_generated_images,
+            enqueued_at=time.time(),
+        )
+        self._write(self._path(_PENDING, slug), job)
+        self._path(_FAILED, slug).unlink(missing_ok=True)
+        return job
+
+    def claim(self, *, limit: int | None = None, now: float | None = None) -> list[HeroJob]:
+        """Moves up to `limit` due jobs (oldest first) to running/ and returns them."""
+
+        now = time.time() if now is None else now
+        self._requeue_expired(now)
+        due = sorted((j for j in self._list(_PENDING) if j.not_before <= now), key=lambda j: j.enqueued_at)
+        claimed: list[HeroJob] = []
+        for job in due:
+            if limit is not None and len(claimed) >= limit:
+                break
+            src, dst = self._path(_PENDING, job.slug), self._path(_RUNNING, job.slug)
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                os.rename(src, dst)  # atomic: exactly one worker wins
+            except FileNotFoundError:
+                continue
+            os.utime(dst)  # lease starts now
+            claimed.append(self._read(dst) or job)
+        return claimed
+
+    def complete(self, job: HeroJob) -> None:
+        self._path(_RUNNING, job.slug).unlink(missing_ok=True)
+
+    def fail(self, job: HeroJob, error: str, *, now: float | None = None) -> bool:
+        """Records a failed attempt; returns True if the job will be retried, False if it moved to failed/."""
+
+        now = time.time() if now is None else now
+        attempts = job.attempts + 1
+        retry = attempts < self._max_attempts
+        delay = min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+        updated = replace(job, attempts=attempts, last_error=error, not_before=now + delay if retry else 0.0)
+        pending = self._path(_PENDING, job.slug)
+        # A fresh enqueue while this job was running supersedes it.
+        if pending.exists():
+            self.complete(job)
+            return True
+        self._write(pending if retry else self._path(_FAILED, job.slug), updated)
+        self.complete(job)
+        return retry
+
+    def _requeue_expired(self, now: float) -> None:
+        for path in (self._root / _RUNNING).glob("*.json"):
+            try:
+                expired = now - path.stat().st_mtime > self._lease_seconds
+            except OSError:
+                continue
+            if expired:
+                job = self._read(path)
+                if job is not None and not self._path(_PENDING, job.slug).exists():
+                    self._write(self._path(_PENDING, job.slug), job)
+                path.unlink(missing_ok=True)
+
+    def pending(self) -> list[HeroJob]:
+        return self._list(_PENDING)
+
+    def running(self) -> list[HeroJob]:
+        return self._list(_RUNNING)
+
+    def failed(self) -> list[HeroJob]:
+        return self._list(_FAILED)
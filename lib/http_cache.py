@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+
+# Within the TTL a cached response is reused without touching the network; after it,
+# the entry is revalidated with If-None-Match / If-Modified-Since (a 304 costs no body).
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+
+
+def default_http_cache_dir(repo_root: Path) -> Path:
+    return repo_root / ".cache" / "http"
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    url: str
+    final_url: str
+    etag: str | None
+    last_modified: str | None
+    content_type: str | None
+    encoding: str | None
+    validated_at: float
+    has_body: bool
+    local_path: str | None = None
+
+
+@dataclass(frozen=True)
+class CacheLookup:
+    """Result of `HttpCache.prepare`.
+
+    - `fresh` means the entry is within TTL and no request is needed.
+    - `body` is the cached body (for entries stored with one), used on a hit or a 304.
+    - `headers` carries conditional request headers when revalidation is possible.
+    """
+
+    entry: CachedResponse | None
+    fresh: bool
+    body: bytes | None
+    headers: dict[str, str]
+
+
+class HttpCache:
+    """
+    On-disk HTTP response cache for retailer page and image fetches.
+
+    Layout (under `root`):
+      <sha256(url)>.json  -> CachedResponse metadata (validators, final URL, timestamps)
+      <sha256(url)>.body  -> response body (only for entries stored with a body)
+
+    Image entries are stored without a body: the downloaded file under site/public is
+    the body (`local_path`), so validators are only sent while that file still exists.
+    """
+
+    def __init__(self, *, root: Path, ttl_seconds: float = DEFAULT_TTL_SECONDS) -> None:
+        self._root = root
+        self._ttl_seconds = float(ttl_seconds)
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    @property
+    def ttl_seconds(self) -> float:
+        return self._ttl_seconds
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _meta_path(self, url: str) -> Path:
+        return self._root / f"{self._key(url)}.json"
+
+    def _body_path(self, url: str) -> Path:
+        return self._root / f"{self._key(url)}.body"
+
+    def _write_atomic(self, path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    def get(self, url: str) -> CachedResponse | None:
+        path = self._meta_path(url)
+        try:
+            raw: Any = json.loads(path.read_text(encoding="utf-8"))
+            entry = CachedResponse(**raw)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Corrupt/old-format entries are treated as misses.
+            return None
+        if entry.has_body and not self._body_path(url).exists():
+            return None
+        return entry
+
+    def is_fresh(self, entry: CachedResponse, *, now: float | None = None) -> bool:
+        if self._ttl_seconds <= 0:
+            return False
+        t = time.time() if now is None else now
+        return (t - entry.validated_at) < self._ttl_seconds
+
+    @staticmethod
+    def conditional_headers(entry: CachedResponse) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if entry.etag:
+            headers["if-none-match"] = entry.etag
+        if entry.last_modified:
+            headers["if-modified-since"] = entry.last_modified
+        return headers
+
+    def read_body(self, entry: CachedResponse) -> bytes | None:
+        if not entry.has_body:
+            return None
+        try:
+            return self._body_path(entry.url).read_bytes()
+        except OSError:
+            return None
+
+    def prepare(self, url: str, *, revalidate: bool = False, local_path: Path | None = None) -> CacheLookup:
+        """Look up `url` and decide between a cache hit and a (conditional) request.
+
+        `revalidate=True` skips the TTL shortcut (used for force re-runs).
+        `local_path` is the file a body-less entry must still point at (downloaded images);
+        if it moved or was deleted, the entry is ignored and a full request is needed.
+        """
+
+        entry = self.get(url)
+        if entry is None:
+            return CacheLookup(entry=None, fresh=False, body=None, headers={})
+
+        if entry.has_body:
+            body = self.read_body(entry)
+            if body is None:
+                return CacheLookup(entry=None, fresh=False, body=None, headers={})
+        else:
+            body = None
+            if local_path is None or entry.local_path != str(local_path) or not local_path.exists():
+                return CacheLookup(entry=None, fresh=False, body=None, headers={})
+
+        if (not revalidate) and self.is_fresh(entry):
+            return CacheLookup(entry=entry, fresh=True, body=body, headers={})
+
+        return CacheLookup(entry=entry, fresh=False, body=body, headers=self.conditional_headers(entry))
+
+    def store(
+        self,
+        url: str,
+        *,
+        response: httpx.Response,
+        body: bytes | None,
+        local_path: Path | None = None,
+    ) -> CachedResponse:
+        entry = CachedResponse(
+            url=url,
+            final_url=str(response.url),
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified"),
+            content_type=response.headers.get("content-type"),
+            encoding=response.encoding if body is not None else None,
+            validated_at=time.time(),
+            has_body=body is not None,
+            local_path=str(local_path) if local_path is not None else None,
+        )
+        if body is not None:
+            self._write_atomic(self._body_path(url), body)
+        else:
+            self._body_path(url).unlink(missing_ok=True)
+        self._write_atomic(self._meta_path(url), json.dumps(asdict(entry)).encode("utf-8"))
+        return entry
+
+    def revalidated(self, entry: CachedResponse, *, response: httpx.Response) -> CachedResponse:
+        """Refresh an entry after a 304, picking up any rotated validators."""
+
+        updated = replace(
+            entry,
+            etag=response.headers.get("etag") or entry.etag,
+            last_modified=response.headers.get("last-modified") or entry.last_modified,
+            validated_at=time.time(),
+        )
+        self._write_atomic(self._meta_path(entry.url), json.dumps(asdict(updated)).encode("utf-8"))
+        return updated
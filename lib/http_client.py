@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import atexit
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+try:  # h2 is in requirements; without it (a trimmed install) httpx falls back to HTTP/1.1
+    import h2  # noqa: F401
+except Exception:  # pragma: no cover
+    _H2_AVAILABLE = False
+else:
+    _H2_AVAILABLE = True
+
+
+REQUEST_HEADERS = {
+    # Use a mainstream UA; some retailers serve interstitial pages otherwise.
+    "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
+    "accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "accept-language": "en-GB,en;q=0.9",
+}
+
+# Reads are per chunk, so a slow-but-streaming page is not cut off. Waiting for a pooled
+# connection is bounded separately: the callers' own concurrency caps normally keep it at zero.
+DEFAULT_TIMEOUT = httpx.Timeout(20.0, connect=10.0, pool=30.0)
+
+# Enough keep-alive connections for the batch concurrency across a handful of retailers;
+# idle connections are kept long enough to span consecutive posts of a hydration run.
+DEFAULT_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=60.0)
+
+
+def http2_available() -> bool:
+    return _H2_AVAILABLE
+
+
+@dataclass
+class ConnectionStats:
+    """
+    Connection reuse counters, fed by the httpcore `trace` extension.
+
+    Every request either opens a connection (`connections_opened`, with a TLS handshake
+    for https) or rides an existing keep-alive / HTTP/2 connection (`reused`). Requests
+    answered by in-process transports (replay, mocks) never reach httpcore and are not
+    counted.
+    """
+
+    requests: int = 0
+    connections_opened: int = 0
+    tls_handshakes: int = 0
+    http2_requests: int = 0
+
+    def __post_init__(self) -> None:
+        self._lock = threading.Lock()
+
+    @property
+    def reused(self) -> int:
+        return max(0, self.requests - self.connections_opened)
+
+    @property
+    def reuse_ratio(self) -> float:
+        return self.reused / self.requests if self.requests else 0.0
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests = self.connections_opened = self.tls_handshakes = self.http2_requests = 0
+
+    def snapshot(self) -> "ConnectionStats":
+        with self._lock:
+            return ConnectionStats(
+                requests=self.requests,
+                connections_opened=self.connections_opened,
+                tls_handshakes=self.tls_handshakes,
+                http2_requests=self.http2_requests,
+            )
+
+    def summary(self) -> str:
+        text = (
+            f"{self.requests} requests over {self.connections_opened} connections "
+            f"({self.reused} reused, {self.reuse_ratio:.0%})"
+        )
+        if self.tls_handshakes:
+            text += f", {self.tls_handshakes} TLS handshakes"
+        if self.http2_requests:
+            text += f", {self.http2_requests} over HTTP/2"
+        return text
+
+    def _trace(self, event: str, info: dict[str, Any]) -> None:
+        if event == "connection.connect_tcp.complete":
+            with self._lock:
+                self.connections_opened += 1
+        elif event == "connection.start_tls.complete":
+            with self._lock:
+                self.tls_handshakes += 1
+        elif event in ("http11.send_request_headers.started", "http2.send_request_headers.started"):
+            with self._lock:
+                self.requests += 1
+                if event.startswith("http2."):
+                    self.http2_requests += 1
+
+    def _on_request(self, request: httpx.Request) -> None:
+        request.extensions.setdefault("trace", self._trace)
+
+    async def _on_request_async(self, request: httpx.Request) -> None:
+        async def trace(event: str, info: dict[str, Any]) -> None:
+            self._trace(event, info)
+
+        request.extensions.setdefault("trace", trace)
+
+
+_STATS = ConnectionStats()
+
+
+def connection_stats() -> ConnectionStats:
+    """Process-wide counters for every client built by this module (unless given its own `stats`)."""
+    return _STATS
+
+
+def _client_kwargs(
+    stats: ConnectionStats | None, event_hooks: dict[str, list[Any]] | None, is_async: bool, overrides: dict[str, Any]
+) -> dict[str, Any]:
+    stats = stats if stats is not None else _STATS
+    hooks = {k: list(v) for k, v in (event_hooks or {}).items()}
+    hooks.setdefault("request", []).insert(0, stats._on_request_async if is_async else stats._on_request)
+    kwargs: dict[str, Any] = {
+        "follow_redirects": True,
+        "headers": REQUEST_HEADERS,
+        "timeout": DEFAULT_TIMEOUT,
+        "limits": DEFAULT_LIMITS,
+        "event_hooks": hooks,
+    }
+    if overrides.get("transport") is None:
+        kwargs["http2"] = _H2_AVAILABLE
+    kwargs.update(overrides)
+    return kwargs
+
+
+def build_client(
+    *,
+    stats: ConnectionStats | None = None,
+    event_hooks: dict[str, list[Any]] | None = None,
+    **overrides: Any,
+) -> httpx.Client:
+    """A new `httpx.Client` with the shared defaults (headers, timeouts, pool limits, HTTP/2 when available).
+
+    `overrides` are passed to `httpx.Client` (e.g. `transport=`); `event_hooks` run after the
+    connection counter hook.
+    """
+    return httpx.Client(**_client_kwargs(stats, event_hooks, False, overrides))
+
+
+def build_async_client(
+    *,
+    stats: ConnectionStats | None = None,
+    event_hooks: dict[str, list[Any]] | None = None,
+    **overrides: Any,
+) -> httpx.AsyncClient:
+    """Async counterpart of `build_client`.
+
+    Async clients are bound to the event loop that first uses them, so they are not shared
+    process-wide: build one per `asyncio.run` and pass it to every step of that run.
+    """
+    return httpx.AsyncClient(**_client_kwargs(stats, event_hooks, True, overrides))
+
+
+_shared: httpx.Client | None = None
+_shared_lock = threading.Lock()
+
+
+def shared_client() -> httpx.Client:
+    """The process-wide pooled client, built on first use and closed at interpreter exit.
+
+    Callers borrow it and must not close it; connections stay warm across posts and steps.
+    """
+    global _shared
+    with _shared_lock:
+        if _shared is None or _shared.is_closed:
+            _shared = build_client()
+        return _shared
+
+
+def close_shared_client() -> None:
+    global _shared
+    with _shared_lock:
+        client, _shared = _shared, None
+    if client is not None:
+        client.close()
+
+
+atexit.register(close_shared_client)
@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import httpx
+
+
+# Response headers worth replaying. Bodies are stored decoded, so content-encoding and
+# content-length are never kept.
+_KEPT_HEADERS = frozenset({"content-type", "etag", "last-modified", "location", "cache-control", "retry-after"})
+
+
+@dataclass(frozen=True)
+class CassetteEntry:
+    status: int
+    headers: tuple[tuple[str, str], ...]
+    body: bytes
+
+    def header(self, name: str) -> str | None:
+        name = name.lower()
+        return next((v for k, v in self.headers if k == name), None)
+
+
+def _key(method: str, url: str) -> str:
+    return f"{method.upper()} {url}"
+
+
+def _kept_headers(headers: httpx.Headers | dict[str, str]) -> tuple[tuple[str, str], ...]:
+    return tuple((k.lower(), v) for k, v in headers.items() if k.lower() in _KEPT_HEADERS)
+
+
+class Cassette:
+    """
+    Recorded HTTP exchanges, replayed by `ReplayTransport` and `RetailerStandIn`.
+
+    On disk (optional, `root`):
+      index.json        -> {"version": 1, "entries": {"GET <url>": {"status", "headers", "body"}}}
+      bodies/<sha256>   -> response bodies, shared between entries with the same content
+
+    Every hop of a redirect is its own entry, exactly as the transport saw it.
+    """
+
+    def __init__(self, *, root: Path | None = None) -> None:
+        self._root = root
+        self._entries: dict[str, CassetteEntry] = {}
+        self._lock = threading.Lock()
+        if root is not None and (root / "index.json").exists():
+            self._load(root)
+
+    @property
+    def root(self) -> Path | None:
+        return self._root
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _load(self, root: Path) -> None:
+        raw = json.loads((root / "index.json").read_text(encoding="utf-8"))
+        for key, e in (raw.get("entries") or {}).items():
+            body = (root / "bodies" / e["body"]).read_bytes() if e.get("body") else b""
+            headers = tuple((str(k), str(v)) for k, v in e.get("headers") or [])
+            self._entries[str(key)] = CassetteEntry(status=int(e["status"]), headers=headers, body=body)
+
+    def add(
+        self,
+        url: str,
+        *,
+        status: int = 200,
+        headers: dict[str, str] | None = None,
+        body: bytes = b"",
+        method: str = "GET",
+    ) -> None:
+        entry = CassetteEntry(status=int(status), headers=_kept_headers(headers or {}), body=body)
+        with self._lock:
+            self._entries[_key(method, url)] = entry
+
+    def record(self, request: httpx.Request, response: httpx.Response, body: bytes) -> None:
+        entry = CassetteEntry(status=response.status_code, headers=_kept_headers(response.headers), body=body)
+        with self._lock:
+            self._entries[_key(request.method, str(request.url))] = entry
+
+    def lookup(self, method: str, url: str) -> CassetteEntry | None:
+        return self._entries.get(_key(method, url))
+
+    def urls(self, *, content_type: str = "", method: str = "GET") -> list[str]:
+        """Recorded 200 URLs, optionally only those whose content-type starts with `content_type`."""
+        prefix = f"{method.upper()} "
+        out: list[str] = []
+        for key, e in self._entries.items():
+            if key.startswith(prefix) and e.status == 200 and (e.header("content-type") or "").startswith(content_type):
+                out.append(key[len(prefix) :])
+        return sorted(out)
+
+    def save(self) -> None:
+        if self._root is None:
+            raise ValueError("cassette has no root directory")
+        bodies = self._root / "bodies"
+        bodies.mkdir(parents=True, exist_ok=True)
+        index: dict[str, dict[str, object]] = {}
+        with self._lock:
+            entries = dict(self._entries)
+        for key, e in sorted(entries.items()):
+            digest = hashlib.sha256(e.body).hexdigest() if e.body else ""
+            if digest and not (bodies / digest).exists():
+                (bodies / digest).write_bytes(e.body)
+            index[key] = {"status": e.status, "headers": [list(h) for h in e.headers], "body": digest}
+        tmp = self._root / f"index.json.{os.getpid()}.tmp"
+        tmp.write_text(json.dumps({"version": 1, "entries": index}, indent=2, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self._root / "index.json")
+
+
+class FaultInjector:
+    """
+    Latency and failure injection shared by the replay transport and the stand-in server.
+
+    Each request waits `latency_seconds` plus up to `jitter_seconds`; with probability
+    `error_rate` it then fails, as a 503 or (for `reset_share` of the failures) as a
+    dropped connection.
+    """
+
+    def __init__(
+        self,
+        *,
+        latency_seconds: float = 0.0,
+        jitter_seconds: float = 0.0,
+        error_rate: float = 0.0,
+        reset_share: float = 0.0,
+        seed: int | None = 0,
+    ) -> None:
+        self.latency_seconds = max(0.0, float(latency_seconds))
+        self.jitter_seconds = max(0.0, float(jitter_seconds))
+        self.error_rate = min(1.0, max(0.0, float(error_rate)))
+        self.reset_share = min(1.0, max(0.0, float(reset_share)))
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def draw(self) -> tuple[float, str | None]:
+        """(delay seconds, fault) where fault is None, "503" or "reset"."""
+        with self._lock:
+            delay = self.latency_seconds + self._rng.uniform(0.0, self.jitter_seconds)
+            fault = None
+            if self.error_rate and self._rng.random() < self.error_rate:
+                fault = "reset" if self._rng.random() < self.reset_share else "503"
+        return delay, fault
+
+
+def _replay_response(request: httpx.Request, entry: CassetteEntry | None, fault: str | None) -> httpx.Response:
+    if fault == "reset":
+        raise httpx.ReadError("connection reset (injected)", request=request)
+    if fault == "503":
+        return httpx.Response(503, headers={"retry-after": "0"}, request=request)
+    if entry is None:
+        return httpx.Response(404, headers={"x-replay-miss": "1"}, request=request)
+    etag = entry.header("etag")
+    if etag and request.headers.get("if-none-match") == etag:
+        return httpx.Response(304, headers=list(entry.headers), request=request)
+    return httpx.Response(entry.status, headers=list(entry.headers), content=entry.body, request=request)
+
+
+class ReplayTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """In-process transport answering from a `Cassette` (unknown URLs get a 404).
+
+    Works for both `httpx.Client` and `httpx.AsyncClient`; no sockets are opened.
+    """
+
+    def __init__(self, cassette: Cassette, *, faults: FaultInjector | None = None) -> None:
+        self._cassette = cassette
+        self._faults = faults or FaultInjector()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        delay, fault = self._faults.draw()
+        if delay:
+            time.sleep(delay)
+        return _replay_response(request, self._cassette.lookup(request.method, str(request.url)), fault)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        delay, fault = self._faults.draw()
+        if delay:
+            await asyncio.sleep(delay)
+        return _replay_response(request, self._cassette.lookup(request.method, str(request.url)), fault)
+
+
+def _recorded_response(response: httpx.Response, body: bytes) -> httpx.Response:
+    # The body is already decoded, so the encoding/length headers no longer apply.
+    dropped = ("content-encoding", "content-length")
+    headers = [(k, v) for k, v in response.headers.multi_items() if k.lower() not in dropped]
+    return httpx.Response(response.status_code, headers=headers, content=body, extensions=response.extensions)
+
+
+class RecordingTransport(httpx.BaseTransport):
+    """Wraps a real transport and records every exchange into a `Cassette`."""
+
+    def __init__(self, cassette: Cassette, *, inner: httpx.BaseTransport | None = None) -> None:
+        self._cassette = cassette
+        self._inner = inner or httpx.HTTPTransport()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        response = self._inner.handle_request(request)
+        try:
+            body = response.read()
+        finally:
+            response.close()
+        self._cassette.record(request, response, body)
+        return _recorded_response(response, body)
+
+    def close(self) -> None:
+        self._inner.close()
+
+
+class AsyncRecordingTransport(httpx.AsyncBaseTransport):
+    """Async counterpart of `RecordingTransport`."""
+
+    def __init__(self, cassette: Cassette, *, inner: httpx.AsyncBaseTransport | None = None) -> None:
+        self._cassette = cassette
+        self._inner = inner or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self._inner.handle_async_request(request)
+        try:
+            body = await response.aread()
+        finally:
+            await response.aclose()
+        self._cassette.record(request, response, body)
+        return _recorded_response(response, body)
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
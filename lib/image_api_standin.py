@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from typing import Any
+
+from lib.http_replay import FaultInjector
+
+try:
+    from PIL import Image  # type: ignore
+except Exception:  # pragma: no cover
+    Image = None  # type: ignore
+
+
+def stub_image_png(prompt: str, size: str = "1024x1024") -> bytes:
+    """Deterministic photo-like PNG for `prompt`: a tinted gradient plus noise, so encoders work as on real images."""
+
+    if Image is None:
+        raise RuntimeError("Pillow is required to render stub images")
+    width, _, height = size.partition("x")
+    w, h = int(width or 1024), int(height or width or 1024)
+    digest = hashlib.sha256(prompt.encode("utf-8")).digest()
+    gradient = Image.linear_gradient("L").resize((w, h))
+    noise = Image.effect_noise((w, h), 32 + digest[3] % 32)
+    tint = Image.new("RGB", (w, h), tuple(digest[:3]))
+    im = Image.blend(Image.merge("RGB", (gradient, noise, gradient.transpose(Image.Transpose.ROTATE_90))), tint, 0.4)
+    buf = BytesIO()
+    im.save(buf, format="PNG", compress_level=1)
+    return buf.getvalue()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_StandInHTTPServer"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - stdlib signature
+        return
+
+    def do_POST(self) -> None:  # noqa: N802 - stdlib naming
+        standin = self.server.standin
+        body = self.rfile.read(int(self.headers.get("content-length") or 0))
+        if not self.path.rstrip("/").endswith("/images/generations"):
+            self._json(404, {"error": {"message": f"unknown path {self.path}", "type": "invalid_request_error"}})
+            return
+
+        delay, fault = standin.faults.draw()
+        if delay:
+            time.sleep(delay)
+        standin._count()
+
+        if fault == "reset":
+            self.close_connection = True
+            return
+        if fault == "503":
+            self._json(503, {"error": {"message": "overloaded (injected)", "type": "server_error"}})
+            return
+
+        try:
+            req = json.loads(body or b"{}")
+            png = stub_image_png(str(req.get("prompt") or ""), str(req.get("size") or "1024x1024"))
+        except Exception as e:
+            self._json(400, {"error": {"message": str(e), "type": "invalid_request_error"}})
+            return
+        self._json(200, {"created": int(time.time()), "data": [{"b64_json": base64.b64encode(png).decode("ascii")}]})
+
+    def _json(self, status: int, payload: dict[str, Any]) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class _StandInHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, addr: tuple[str, int], standin: "ImageApiStandIn") -> None:
+        super().__init__(addr, _Handler)
+        self.standin = standin
+
+    def handle_error(self, request: Any, client_address: Any) -> None:
+        exc = sys.exc_info()[1]
+        if not isinstance(exc, (ConnectionResetError, BrokenPipeError)):
+            super().handle_error(request, client_address)
+
+
+class ImageApiStandIn:
+    """
+    Local stand-in for the OpenAI image generation endpoint (`POST /v1/images/generations`).
+
+    Answers every prompt with a deterministic stub image after the latency drawn from
+    `faults` (which can also inject 503s and dropped connections), so batch hero
+    generation can be exercised and benchmarked offline. Point a client at it with
+    `OpenAI(base_url=standin.base_url, api_key="stub")`.
+    """
+
+    def __init__(self, *, faults: FaultInjector | None = None, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.faults = faults or FaultInjector()
+        self._addr = (host, int(port))
+        self._server: _StandInHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self.requests_served = 0
+
+    def _count(self) -> None:
+        with self._lock:
+            self.requests_served += 1
+
+    @property
+    def base_url(self) -> str:
+        """Base URL including the `/v1` prefix the OpenAI SDK expects."""
+        if self._server is None:
+            raise RuntimeError("image API stand-in is not running")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "ImageApiStandIn":
+        if self._server is None:
+            self._server = _StandInHTTPServer(self._addr, self)
+            self._thread = threading.Thread(target=self._server.serve_forever, name="image-api-standin", daemon=True)
+            self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._server = _StandInHTTPServer(self._addr, self)
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "ImageApiStandIn":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
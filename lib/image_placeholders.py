@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import base64
+from dataclasses import dataclass
+from io import BytesIO
+from pathlib import Path
+
+try:
+    from PIL import Image, ImageOps  # type: ignore
+except Exception:  # pragma: no cover
+    Image = None  # type: ignore
+    ImageOps = None  # type: ignore
+
+
+# Longest side of the preview. Browsers upscale it smoothly, which reads as a blur; at this
+# size the WebP data URI stays around 100-300 bytes, cheap enough to inline in the HTML.
+LQIP_MAX_SIDE = 16
+LQIP_QUALITY = 40
+
+
+def pillow_available() -> bool:
+    return Image is not None
+
+
+@dataclass(frozen=True)
+class ImagePlaceholder:
+    """Intrinsic size of an image plus a tiny blurred preview of it, as a data URI."""
+
+    width: int
+    height: int
+    data_uri: str
+
+
+def lqip_data_uri(im: "Image.Image", *, max_side: int = LQIP_MAX_SIDE) -> str:
+    """`data:image/webp;base64,...` preview of `im`, at most `max_side` px on its longest side."""
+
+    if Image is None:
+        raise RuntimeError("Pillow is required to build image placeholders")
+    if im.mode not in ("RGB", "RGBA", "L", "LA"):
+        im = im.convert("RGBA")
+    scale = min(1.0, max_side / max(im.size))
+    size = (max(1, round(im.width * scale)), max(1, round(im.height * scale)))
+    small = im.resize(size, Image.Resampling.BOX, reducing_gap=2.0)
+    if small.mode != "RGB":
+        rgba = small.convert("RGBA")
+        small = Image.new("RGB", rgba.size, (255, 255, 255))
+        small.paste(rgba, mask=rgba.getchannel("A"))
+    buf = BytesIO()
+    small.save(buf, format="WEBP", quality=LQIP_QUALITY, method=6)
+    return "data:image/webp;base64," + base64.b64encode(buf.getvalue()).decode("ascii")
+
+
+def image_placeholder(im: "Image.Image") -> ImagePlaceholder:
+    return ImagePlaceholder(width=im.width, height=im.height, data_uri=lqip_data_uri(im))
+
+
+def image_placeholder_for_file(path: Path) -> ImagePlaceholder:
+    """Placeholder for an image file (EXIF orientation applied, as browsers do)."""
+
+    if Image is None or ImageOps is None:
+        raise RuntimeError("Pillow is required to build image placeholders")
+    with Image.open(path) as raw:
+        width, height = raw.size
+        orientation = raw.getexif().get(0x0112, 1)
+        if orientation in (5, 6, 7, 8):  # rotated by 90 degrees
+            width, height = height, width
+        raw.draft("RGB", (LQIP_MAX_SIDE * 2, LQIP_MAX_SIDE * 2))
+        im = ImageOps.exif_transpose(raw)
+        return ImagePlaceholder(width=width, height=height, data_uri=lqip_data_uri(im))
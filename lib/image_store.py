@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import threading
+from pathlib import Path
+
+try:  # reflinks are Linux-only here (FICLONE); elsewhere link_or_copy goes straight to copying
+    import fcntl
+except Exception:  # pragma: no cover
+    fcntl = None  # type: ignore
+
+
+BLOB_DIRNAME = "_blobs"
+_HASH_CHUNK = 1024 * 1024
+
+# linux/fs.h: _IOW(0x94, 9, int)
+_FICLONE = 0x40049409
+
+
+def sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(_HASH_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _reflink(src: Path, dst: Path) -> bool:
+    """Copy-on-write clone of `src` at `dst` (btrfs, XFS, ...); False if unsupported."""
+
+    if fcntl is None:
+        return False
+    try:
+        with src.open("rb") as fs, dst.open("wb") as fd:
+            fcntl.ioctl(fd.fileno(), _FICLONE, fs.fileno())
+        return True
+    except OSError:
+        dst.unlink(missing_ok=True)
+        return False
+
+
+def link_or_copy(src: Path, dst: Path) -> None:
+    """Materialize `src` at `dst`: a hardlink where the filesystem allows it, else a reflink, else a copy.
+
+    `dst` is replaced atomically. Writers must never modify a linked file in place (write a
+    temporary file and `os.replace` it), or every path sharing the inode changes with it.
+    """
+
+    if dst.exists() and os.path.samefile(src, dst):
+        return
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dst.with_name(f".{dst.name}.{os.getpid()}.{threading.get_ident()}.part")
+    tmp.unlink(missing_ok=True)
+    try:
+        os.link(src, tmp)
+    except OSError:
+        if not _reflink(src, tmp):
+            shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+
+
+def default_pick_image_store(repo_root: Path) -> "ImageBlobStore":
+    public_dir = repo_root / "site" / "public"
+    return ImageBlobStore(public_dir=public_dir, root=public_dir / "images" / "picks" / BLOB_DIRNAME)
+
+
+class ImageBlobStore:
+    """
+    Content-addressed image store under site/public.
+
+    Every distinct image is stored once as `<root>/<sha256><ext>` and referenced from
+    frontmatter by its stable public URL (e.g. /images/picks/_blobs/<sha256>.jpg), so a
+    product image featured in several posts ships once in the deploy artifact. Blobs are
+    immutable; unreferenced ones are removed by scripts/dedupe_pick_images.py --prune.
+    """
+
+    def __init__(self, *, public_dir: Path, root: Path) -> None:
+        self._public_dir = public_dir
+        self._root = root
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def path_for(self, digest: str, ext: str) -> Path:
+        return self._root / f"{digest}{ext.lower()}"
+
+    def url_for(self, path: Path) -> str:
+        return "/" + path.relative_to(self._public_dir).as_posix()
+
+    def path_for_url(self, url: str) -> Path | None:
+        """Blob file behind a public URL, or None if the URL is not a blob URL."""
+        if not self.is_blob_url(url):
+            return None
+        return self._public_dir / url.lstrip("/")
+
+    def is_blob_url(self, url: str) -> bool:
+        prefix = self.url_for(self._root) + "/"
+        return str(url or "").startswith(prefix)
+
+    def contains(self, path: Path) -> bool:
+        try:
+            return path.parent.resolve() == self._root.resolve()
+        except OSError:
+            return False
+
+    def put_file(self, src: Path, *, digest: str | None = None, ext: str | None = None, move: bool = False) -> Path:
+        """Add `src` to the store and return its blob path.
+
+        If the content is already stored, nothing is written (`src` is removed when `move`).
+        Without `move`, new content is hardlinked into the store (copied if linking fails).
+        """
+
+        digest = digest or sha256_file(src)
+        dst = self.path_for(digest, ext if ext is not None else src.suffix)
+        if dst.exists():
+            if move:
+                src.unlink(missing_ok=True)
+            return dst
+        self._root.mkdir(parents=True, exist_ok=True)
+        if move:
+            os.replace(src, dst)
+        else:
+            link_or_copy(src, dst)
+        return dst
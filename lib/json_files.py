@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+
+def read_json(path: Path) -> Any:
+    """Parsed JSON at `path`; None if it is missing, empty or corrupt (stores treat that as empty)."""
+    try:
+        text = path.read_text(encoding="utf-8")
+        return json.loads(text) if text.strip() else None
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def read_json_items(path: Path) -> dict[str, dict[str, Any]]:
+    """Object entries of a `{"version": 1, "items": {...}}` store file ({} if unreadable)."""
+    raw = read_json(path)
+    if not isinstance(raw, dict) or not isinstance(raw.get("items"), dict):
+        return {}
+    return {str(k): v for k, v in raw["items"].items() if isinstance(v, dict)}
+
+
+def write_json_atomic(path: Path, data: Any, *, indent: int | None = 2, sort_keys: bool = True) -> None:
+    """Writes `data` aside and swaps it in with `os.replace`, so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp.write_text(json.dumps(data, indent=indent, ensure_ascii=False, sort_keys=sort_keys), encoding="utf-8")
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Callable
+from urllib.parse import urlparse
+
+
+# Statuses that mean "slow down" rather than "this URL is broken".
+RETRYABLE_STATUS = frozenset({429, 503})
+
+
+@dataclass(frozen=True)
+class HostPolicyConfig:
+    """
+    Per-host network policy.
+
+    The token bucket starts at `rate_per_second` and adapts (AIMD): every successful
+    response nudges the rate up by `rate_increase_per_success` (up to `max_rate_per_second`);
+    every throttle response halves it (down to `min_rate_per_second`).
+    """
+
+    rate_per_second: float = 4.0
+    burst: int = 8
+    min_rate_per_second: float = 0.25
+    max_rate_per_second: float = 16.0
+    rate_increase_per_success: float = 0.25
+
+    max_retries: int = 3
+    backoff_base_seconds: float = 0.5
+    backoff_max_seconds: float = 30.0
+
+    breaker_threshold: int = 5  # consecutive failures before the breaker opens
+    breaker_cooldown_seconds: float = 60.0
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request to a host whose breaker is open."""
+
+    def __init__(self, host: str, retry_in: float) -> None:
+        super().__init__(f"circuit open for {host} (retry in {retry_in:.0f}s)")
+        self.host = host
+        self.retry_in = retry_in
+
+
+class TokenBucket:
+    """Reservation-style token bucket: `reserve()` returns how long the caller must wait."""
+
+    def __init__(self, *, rate: float, burst: int, clock: Callable[[], float] = time.monotonic) -> None:
+        self._rate = float(rate)
+        self._burst = max(1, int(burst))
+        self._clock = clock
+        self._tokens = float(self._burst)
+        self._updated = clock()
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    def set_rate(self, rate: float) -> None:
+        self._refill()
+        self._rate = float(rate)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(float(self._burst), self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        self._refill()
+        self._tokens -= 1.0
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / self._rate
+
+
+class CircuitBreaker:
+    """Closed -> open after N consecutive failures -> half-open after a cooldown (one probe)."""
+
+    def __init__(self, *, threshold: int, cooldown_seconds: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self._threshold = max(1, int(threshold))
+        self._cooldown = float(cooldown_seconds)
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def retry_in(self) -> float:
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self._opened_at + self._cooldown - self._clock())
+
+    def allow(self) -> bool:
+        if self._opened_at is None:
+            return True
+        if self._probing or self.retry_in() > 0:
+            return False
+        # Half-open: let exactly one request through to probe the host.
+        self._probing = True
+        return True
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._probing or self._failures >= self._threshold:
+            self._opened_at = self._clock()
+        self._probing = False
+
+    def release_probe(self) -> None:
+        """The probe ended without an outcome (cancelled, local error): let the next request probe."""
+        self._probing = False
+
+
+@dataclass
+class HostStats:
+    requests: int = 0
+    retries: int = 0
+    throttled: int = 0
+    errors: int = 0
+    short_circuited: int = 0
+
+
+@dataclass
+class _HostState:
+    config: HostPolicyConfig
+    bucket: TokenBucket
+    breaker: CircuitBreaker
+    stats: HostStats = field(default_factory=HostStats)
+
+
+def _retry_after_seconds(value: str | None) -> float | None:
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        dt = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, dt.timestamp() - time.time())
+
+
+class NetworkPolicy:
+    """
+    Shared rate-limit / retry / circuit-breaker policy for retailer fetches.
+
+    Callers drive it around each request attempt:
+      - `before_request(url)` -> seconds to wait (raises CircuitOpenError)
+      - `after_response(url, status, retry_after=..., attempt=...)` -> backoff seconds if the
+        attempt should be retried, else None
+      - `after_error(url, attempt=...)` -> same, for transport errors
+      - `abandon(url)` when the attempt ended with neither (cancelled, non-transport error),
+        so a half-open breaker does not wait forever for its probe
+    The policy never sleeps itself, so the same instance serves sync and async clients.
+    """
+
+    def __init__(
+        self,
+        config: HostPolicyConfig | None = None,
+        *,
+        overrides: dict[str, HostPolicyConfig] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        self._default = config or HostPolicyConfig()
+        self._overrides = {k.lower(): v for k, v in (overrides or {}).items()}
+        self._clock = clock
+        self._rng = rng
+        self._hosts: dict[str, _HostState] = {}
+        self._lock = threading.Lock()
+
+    def _config_for(self, host: str) -> HostPolicyConfig:
+        for suffix, cfg in self._overrides.items():
+            if host == suffix or host.endswith("." + suffix):
+                return cfg
+        return self._default
+
+    def _state(self, url: str) -> tuple[str, _HostState]:
+        host = (urlparse(url).hostname or "").lower()
+        st = self._hosts.get(host)
+        if st is None:
+            cfg = self._config_for(host)
+            st = _HostState(
+                config=cfg,
+                bucket=TokenBucket(rate=cfg.rate_per_second, burst=cfg.burst, clock=self._clock),
+                breaker=CircuitBreaker(
+                    threshold=cfg.breaker_threshold, cooldown_seconds=cfg.breaker_cooldown_seconds, clock=self._clock
+                ),
+            )
+            self._hosts[host] = st
+        return host, st
+
+    def stats(self) -> dict[str, HostStats]:
+        with self._lock:
+            return {host: st.stats for host, st in sorted(self._hosts.items())}
+
+    def before_request(self, url: str) -> float:
+        with self._lock:
+            host, st = self._state(url)
+            if not st.breaker.allow():
+                st.stats.short_circuited += 1
+                raise CircuitOpenError(host, st.breaker.retry_in())
+            st.stats.requests += 1
+            return st.bucket.reserve()
+
+    def _backoff(self, cfg: HostPolicyConfig, attempt: int, retry_after: float | None) -> float:
+        # Full jitter; a server-provided Retry-After is treated as a floor.
+        cap = min(cfg.backoff_max_seconds, cfg.backoff_base_seconds * (2 ** attempt))
+        delay = self._rng() * cap
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, cfg.backoff_max_seconds))
+        return delay
+
+    def after_response(self, url: str, status: int, *, retry_after: str | None = None, attempt: int = 0) -> float | None:
+        with self._lock:
+            _host, st = self._state(url)
+            cfg = st.config
+            if status in RETRYABLE_STATUS:
+                st.stats.throttled += 1
+                st.breaker.record_failure()
+                st.bucket.set_rate(max(cfg.min_rate_per_second, st.bucket.rate / 2.0))
+                if attempt >= cfg.max_retries or st.breaker.is_open:
+                    return None
+                st.stats.retries += 1
+                return self._backoff(cfg, attempt, _retry_after_seconds(retry_after))
+
+            if status >= 500:
+                st.breaker.record_failure()
+            else:
+                st.breaker.record_success()
+                st.bucket.set_rate(min(cfg.max_rate_per_second, st.bucket.rate + cfg.rate_increase_per_success))
+            return None
+
+    def abandon(self, url: str) -> None:
+        with self._lock:
+            _host, st = self._state(url)
+            st.breaker.release_probe()
+
+    def after_error(self, url: str, *, attempt: int = 0) -> float | None:
+        with self._lock:
+            _host, st = self._state(url)
+            cfg = st.config
+            st.stats.errors += 1
+            st.breaker.record_failure()
+            if attempt >= cfg.max_retries or st.breaker.is_open:
+                return None
+            st.stats.retries += 1
+            return self._backoff(cfg, attempt, None)
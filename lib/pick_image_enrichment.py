@@ -1,20 +1,54 @@
 from __future__ import annotations
 
+import asyncio
+import codecs
+import hashlib
+import html as html_lib
 import json
+import os
 import re
-from dataclasses import dataclass
+import tempfile
+import time
+from contextlib import AsyncExitStack, ExitStack, asynccontextmanager, contextmanager
+from dataclasses import dataclass, field, replace
 from html.parser import HTMLParser
 from pathlib import Path
-from typing import Any
+from typing import Any, AsyncIterator, Iterator
 from urllib.parse import urlparse
 
 import httpx
 import yaml
 
+from lib.enrichment_checkpoint import EnrichmentCheckpoint
+from lib.http_cache import CachedResponse, CacheLookup, HttpCache
+from lib.http_client import build_async_client, shared_client
+from lib.image_store import ImageBlobStore, link_or_copy
+from lib.net_policy import CircuitOpenError, NetworkPolicy
+from lib.pick_image_failures import REASON_DOWNLOAD_FAILED, REASON_NO_IMAGE, ImageFailureCache, iso_timestamp
+from lib.pick_image_variants import DEFAULT_VARIANT_WIDTHS, EncodedImage, VariantEncoder, VariantSpec
+from lib.product_image_cache import ImageResolution, ProductImageCache, resolution_keys
+
 
 RE_FRONTMATTER = re.compile(r"^---\s*\n(.*?)\n---\s*\n", re.DOTALL)
 RE_PRODUCTS_LINE_JSON = re.compile(r"^products:\s*(\[.*\])\s*$", re.MULTILINE)
 
+# Async engine defaults: total in-flight requests, and in-flight requests per retailer host.
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_MAX_PER_HOST = 4
+
+# Images are streamed to disk in chunks; anything larger than the cap is discarded.
+DEFAULT_MAX_IMAGE_BYTES = 25 * 1024 * 1024
+IMAGE_CHUNK_SIZE = 64 * 1024
+
+# Product pages are read incrementally and abandoned once the image is known.
+PAGE_CHUNK_SIZE = 16 * 1024
+# An abandoned response takes its connection down with it. When little of the page is left,
+# reading (and discarding) the rest is cheaper than a new TCP + TLS handshake to the retailer.
+PAGE_DRAIN_MAX_BYTES = 64 * 1024
+
+# Retailer renditions are chosen to cover this width (the largest pick image variant).
+DEFAULT_TARGET_IMAGE_WIDTH = max(DEFAULT_VARIANT_WIDTHS)
+
 
 @dataclass(frozen=True)
 class PickImageEnrichmentResult:
@@ -22,6 +56,49 @@ class PickImageEnrichmentResult:
     picks_updated: int
     picks_skipped: int
     errors: list[str]
+    timed_out: bool = False  # deadline hit: only the picks finished in time were applied
+
+
+@dataclass
+class EnrichmentStats:
+    """Network throughput counters, accumulated across every pick in a run."""
+
+    picks_attempted: int = 0
+    picks_updated: int = 0
+    picks_failed: int = 0
+    picks_reused: int = 0  # served from the product image resolution cache, no network
+    picks_known_failed: int = 0  # skipped: failed recently (negative cache), no network
+    requests: int = 0
+    bytes_downloaded: int = 0
+    connections_dropped: int = 0  # pages abandoned with too much left to drain (connection not reused)
+    elapsed_seconds: float = 0.0
+    failures_by_host: dict[str, int] = field(default_factory=dict)
+    pick_seconds: list[float] = field(default_factory=list)  # per processed pick, start to outcome
+
+    @property
+    def picks_per_second(self) -> float:
+        return self.picks_attempted / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    def record(self, outcome: "_PickOutcome") -> None:
+        self.picks_attempted += 1
+        if outcome.seconds:
+            self.pick_seconds.append(outcome.seconds)
+        if outcome.image is not None:
+            self.picks_updated += 1
+            self.picks_reused += 1 if outcome.reused else 0
+            return
+        self.picks_failed += 1
+        if outcome.known_failure:
+            self.picks_known_failed += 1
+            return
+        host = outcome.host or "unknown"
+        self.failures_by_host[host] = self.failures_by_host.get(host, 0) + 1
+
+
+@dataclass(frozen=True)
+class BatchPickImageEnrichmentResult:
+    results: dict[str, PickImageEnrichmentResult]  # keyed by post slug
+    stats: EnrichmentStats
 
 
 class _MetaTagParser(HTMLParser):
@@ -129,6 +206,219 @@ def _extract_amazon_product_image(html: str) -> str | None:
     return None
 
 
+# Single-pass scanner patterns for `_StreamingImageExtractor`.
+_RE_SCAN = re.compile(
+    r"""<meta\b[^>]*>"""
+    r"""|<img\b[^>]*\blandingImage\b[^>]*>"""
+    r"""|</head\s*>"""
+    r"""|"(?:hiRes|large)"\s*:\s*"https:[^"]+\"""",
+    re.IGNORECASE,
+)
+_RE_TAG_ATTR = re.compile(r"""([a-zA-Z_:][-a-zA-Z0-9_:.]*)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""")
+_RE_SCRIPT_IMAGE = re.compile(r'"(hiRes|large)"\s*:\s*"(https:[^"]+)"')
+
+# Characters kept unscanned at the end of the buffer so a pattern split across chunks still
+# matches; an open tag is kept whole, up to _SCAN_MAX_KEEP.
+_SCAN_TAIL_KEEP = 512
+_SCAN_MAX_KEEP = 64 * 1024
+
+
+def _tag_attrs(tag: str) -> dict[str, str]:
+    attrs: dict[str, str] = {}
+    for m in _RE_TAG_ATTR.finditer(tag):
+        value = m.group(2) if m.group(2) is not None else m.group(3) if m.group(3) is not None else m.group(4)
+        attrs[m.group(1).lower()] = html_lib.unescape(value or "")
+    return attrs
+
+
+def _dynamic_image_renditions(raw: str) -> list[tuple[str, int, int]]:
+    """Parse `data-a-dynamic-image` ({"<url>": [width, height], ...}) in document order."""
+
+    try:
+        data = json.loads(raw)
+    except Exception:
+        return []
+    renditions: list[tuple[str, int, int]] = []
+    if isinstance(data, dict):
+        for k, v in data.items():
+            if not (isinstance(k, str) and k.startswith("http")):
+                continue
+            try:
+                w, h = int(v[0]), int(v[1])
+            except Exception:
+                w, h = 0, 0
+            renditions.append((k.strip(), w, h))
+    return renditions
+
+
+def _smallest_adequate_rendition(renditions: list[tuple[str, int, int]], target_width: int) -> str | None:
+    """Smallest rendition at least `target_width` wide, else the widest one available."""
+
+    sized = [r for r in renditions if r[1] > 0]
+    if not sized:
+        return None
+    adequate = [r for r in sized if r[1] >= target_width]
+    if adequate:
+        return min(adequate, key=lambda r: r[1])[0]
+    return max(sized, key=lambda r: r[1])[0]
+
+
+_AMAZON_IMAGE_HOSTS = ("media-amazon.com", "ssl-images-amazon.com", "images-amazon.com")
+# `<id>._AC_SL1500_.jpg`: the `._..._` block before the extension selects the rendition.
+_RE_AMAZON_IMAGE_MODS = re.compile(r"\.(_[A-Za-z0-9_,]*_)\.(jpe?g|png|gif|webp)$", re.IGNORECASE)
+_RE_AMAZON_IMAGE_PLAIN = re.compile(r"/images/I/[^/.]+\.(jpe?g|png|gif|webp)$", re.IGNORECASE)
+_RE_AMAZON_SIZE_TOKEN = re.compile(r"(?:SL|SX|SY|UL|UX|UY|US|SS)(\d+)")
+
+
+def _sized_amazon_image_url(url: str, target_width: int) -> str:
+    """Ask Amazon's image server for a rendition whose longest side is `target_width`.
+
+    Only shrinks: URLs already at or below the target (and non-Amazon URLs) are unchanged.
+    """
+
+    parsed = urlparse(url)
+    host = (parsed.hostname or "").lower()
+    if parsed.query or not host.endswith(_AMAZON_IMAGE_HOSTS):
+        return url
+    m = _RE_AMAZON_IMAGE_MODS.search(url)
+    if m:
+        sizes = [int(n) for n in _RE_AMAZON_SIZE_TOKEN.findall(m.group(1))]
+        if sizes and max(sizes) <= target_width:
+            return url
+        return f"{url[: m.start()]}._SL{int(target_width)}_.{m.group(2)}"
+    if _RE_AMAZON_IMAGE_PLAIN.search(parsed.path):
+        # Bare originals are typically the full-resolution upload.
+        stem, _, ext = url.rpartition(".")
+        return f"{stem}._SL{int(target_width)}_.{ext}"
+    return url
+
+
+class _StreamingImageExtractor:
+    """
+    Incremental, early-terminating replacement for `_best_image_url_from_html`.
+
+    Feed decoded HTML chunks; `feed()` returns True once the answer can no longer change
+    in practice, so the caller can stop reading the response:
+      - a usable og:image (highest priority) -> stop immediately
+      - after </head>: twitter:image / og:image:secure_url -> stop
+      - Amazon pages, after </head>: the `landingImage` tag -> stop
+    Otherwise the whole document is scanned and `result()` applies the same priority order
+    as the full-document extractor.
+
+    With a `target_width`, Amazon results are size-aware: the smallest `data-a-dynamic-image`
+    rendition covering the width is preferred over the hi-res original, and Amazon image
+    URLs are rewritten (`._SL<width>_`) so no larger rendition than needed is downloaded.
+    """
+
+    def __init__(self, *, base_url: str, target_width: int | None = None) -> None:
+        self._base_url = base_url
+        self._target_width = target_width
+        self._is_amazon = _looks_like_amazon(base_url)
+        self._buf = ""
+        self._head_closed = False
+        self._meta: dict[str, str] = {}
+        self._landing: str | None = None
+        self._renditions: list[tuple[str, int, int]] = []
+        self._script: dict[str, str] = {}
+        self.chars_scanned = 0
+
+    def _usable(self, url: str | None) -> str | None:
+        if not url:
+            return None
+        resolved = _resolve_url(self._base_url, url.strip())
+        return None if _is_probably_placeholder_image(resolved) else resolved
+
+    def _handle(self, token: str) -> None:
+        low = token[:12].lower()
+        if low.startswith("</head"):
+            self._head_closed = True
+        elif low.startswith("<meta"):
+            attrs = _tag_attrs(token)
+            content = attrs.get("content")
+            if not content:
+                return
+            key = attrs.get("property") or attrs.get("name") or ""
+            if key in ("og:image", "twitter:image", "og:image:secure_url"):
+                self._meta.setdefault(key, content.strip())
+        elif low.startswith("<img"):
+            if self._landing is not None:
+                return
+            attrs = _tag_attrs(token)
+            if attrs.get("id") != "landingImage":
+                return
+            self._renditions = _dynamic_image_renditions(attrs.get("data-a-dynamic-image") or "")
+            img = (attrs.get("data-old-hires") or "").strip()
+            if not img and self._renditions:
+                img = self._renditions[0][0]
+            if img:
+                self._landing = img
+        else:
+            m = _RE_SCRIPT_IMAGE.match(token)
+            if m:
+                self._script.setdefault(m.group(1), m.group(2).strip())
+
+    def _meta_image(self) -> str | None:
+        for key in ("og:image", "twitter:image", "og:image:secure_url"):
+            if key in self._meta:
+                return self._meta[key]
+        return None
+
+    def _confident(self) -> bool:
+        if self._usable(self._meta.get("og:image")):
+            return True
+        if not self._head_closed:
+            return False
+        meta = self._meta_image()
+        if meta and self._usable(meta):
+            return True
+        return self._is_amazon and self._landing is not None
+
+    def feed(self, text: str) -> bool:
+        self._buf += text
+        self.chars_scanned += len(text)
+
+        last_end = 0
+        for m in _RE_SCAN.finditer(self._buf):
+            self._handle(m.group(0))
+            last_end = m.end()
+
+        # Keep a possibly-incomplete tag (from the last '<') or a short tail for the next chunk.
+        keep_from = len(self._buf) - _SCAN_TAIL_KEEP
+        lt = self._buf.rfind("<", last_end)
+        if lt != -1:
+            keep_from = min(keep_from, lt)
+        keep_from = max(keep_from, len(self._buf) - _SCAN_MAX_KEEP)
+        self._buf = self._buf[max(last_end, keep_from, 0):]
+
+        return self._confident()
+
+    def _best(self) -> str | None:
+        img = self._usable(self._meta_image())
+        if img:
+            return img
+        if self._is_amazon:
+            sized = None
+            if self._target_width:
+                sized = _smallest_adequate_rendition(self._renditions, self._target_width)
+            for candidate in (sized, self._landing, self._script.get("hiRes"), self._script.get("large")):
+                img = self._usable(candidate)
+                if img:
+                    return img
+        return None
+
+    def result(self) -> str | None:
+        img = self._best()
+        if img and self._target_width:
+            img = _sized_amazon_image_url(img, self._target_width)
+        return img
+
+
+def _extract_image_url_from_html(*, html: str, base_url: str, target_width: int | None = None) -> str | None:
+    extractor = _StreamingImageExtractor(base_url=base_url, target_width=target_width)
+    extractor.feed(html)
+    return extractor.result()
+
+
 def _is_probably_placeholder_image(image_url: str) -> bool:
     u = image_url.lower().strip()
     if "amazon" in u and ("logo" in u or "nav" in u or "sprite" in u):
@@ -149,26 +439,366 @@ def _ext_from_content_type(ct: str | None) -> str | None:
     }.get(ct)
 
 
-def _download_image(*, client: httpx.Client, url: str, out_path: Path) -> bool:
+def _decode_body(body: bytes, encoding: str | None) -> str:
     try:
-        r = client.get(url, timeout=20.0)
-        r.raise_for_status()
-        out_path.parent.mkdir(parents=True, exist_ok=True)
-        out_path.write_bytes(r.content)
+        return body.decode(encoding or "utf-8", errors="replace")
+    except LookupError:
+        return body.decode("utf-8", errors="replace")
+
+
+def _page_lookup(*, cache: HttpCache | None, url: str, revalidate: bool) -> CacheLookup | None:
+    if cache is None:
+        return None
+    return cache.prepare(url, revalidate=revalidate)
+
+
+def _ext_from_magic(head: bytes) -> str | None:
+    if head.startswith(b"\xff\xd8\xff"):
+        return ".jpg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return ".png"
+    if head.startswith((b"GIF87a", b"GIF89a")):
+        return ".gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return ".webp"
+    return None
+
+
+class _ImageTooLarge(Exception):
+    pass
+
+
+class _ImageSink:
+    """Streams an image response into `<out_dir>/<stem><ext>` via a temp file.
+
+    The extension is resolved from the content-type, else from the magic bytes of the
+    first chunk (falling back to .jpg). Bodies larger than `max_bytes` are discarded.
+    In dry-run mode only the extension is resolved; nothing is written.
+    With a `blob_store` the body is hashed while streaming and committed into the store
+    instead (an already-stored image is simply dropped).
+    """
+
+    def __init__(
+        self,
+        *,
+        out_dir: Path,
+        stem: str,
+        max_bytes: int,
+        dry_run: bool,
+        blob_store: ImageBlobStore | None = None,
+    ) -> None:
+        self._out_dir = out_dir
+        self._blob_store = blob_store
+        self._sha256 = hashlib.sha256() if blob_store is not None else None
+        self._stem = stem
+        self._max_bytes = int(max_bytes)
+        self._dry_run = dry_run
+        self._content_type: str | None = None
+        self._ext: str | None = None
+        self._tmp: Path | None = None
+        self._fh: Any = None
+        self.bytes_written = 0
+
+    @property
+    def out_path(self) -> Path | None:
+        return self._out_dir / f"{self._stem}{self._ext}" if self._ext else None
+
+    def begin(self, response: httpx.Response) -> None:
+        self._content_type = response.headers.get("content-type")
+        length = response.headers.get("content-length")
+        if self._max_bytes and length and length.isdigit() and int(length) > self._max_bytes:
+            raise _ImageTooLarge(f"content-length {length} exceeds {self._max_bytes}")
+
+    def feed(self, chunk: bytes) -> bool:
+        """Consume a chunk. Returns False once no more data is needed (dry run)."""
+
+        if not chunk:
+            return True
+        if self._ext is None:
+            self._ext = _ext_from_content_type(self._content_type) or _ext_from_magic(chunk[:16]) or ".jpg"
+            if self._dry_run:
+                return False
+            tmp_dir = self._blob_store.root if self._blob_store is not None else self._out_dir
+            tmp_dir.mkdir(parents=True, exist_ok=True)
+            # Unique per download: coroutines share a thread, and the same pick stem can be in flight
+            # for several posts at once, all writing into the shared blob root.
+            self._fh = tempfile.NamedTemporaryFile(dir=tmp_dir, prefix=f".{self._stem}.", suffix=".part", delete=False)
+            self._tmp = Path(self._fh.name)
+
+        self.bytes_written += len(chunk)
+        if self._max_bytes and self.bytes_written > self._max_bytes:
+            raise _ImageTooLarge(f"body exceeds {self._max_bytes} bytes")
+        self._fh.write(chunk)
+        if self._sha256 is not None:
+            self._sha256.update(chunk)
         return True
-    except Exception:
-        return False
+
+    def commit(self) -> Path | None:
+        if self._dry_run:
+            return self.out_path
+        if self._fh is None or self._tmp is None:
+            # Empty body.
+            return None
+        self._fh.close()
+        self._fh = None
+        tmp, self._tmp = self._tmp, None
+        if self._blob_store is not None and self._sha256 is not None:
+            return self._blob_store.put_file(tmp, digest=self._sha256.hexdigest(), ext=self._ext, move=True)
+        out_path = self.out_path
+        assert out_path is not None
+        os.replace(tmp, out_path)
+        return out_path
+
+    def abort(self) -> None:
+        if self._fh is not None:
+            try:
+                self._fh.close()
+            except Exception:
+                pass
+            self._fh = None
+        if self._tmp is not None:
+            self._tmp.unlink(missing_ok=True)
+            self._tmp = None
+
+
+class _TransientFetchError(Exception):
+    """The retailer could not be reached (network error, 408/429/5xx, open breaker).
+
+    Unlike a page without an image, this says nothing about the product, so it is never
+    recorded in the negative cache.
+    """
+
+    def __init__(self, url: str, cause: BaseException) -> None:
+        if isinstance(cause, httpx.HTTPStatusError):
+            message = f"HTTP {cause.response.status_code} from {_host(url)}"
+        else:
+            message = str(cause) or type(cause).__name__
+        super().__init__(message)
+        self.host = _host(url)
 
 
-def _fetch_best_image_url(*, client: httpx.Client, product_url: str) -> str | None:
+def _raise_if_transient(url: str, exc: Exception) -> None:
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        if status in (408, 425, 429) or status >= 500:
+            raise _TransientFetchError(url, exc) from exc
+    elif isinstance(exc, (httpx.TransportError, CircuitOpenError)):
+        raise _TransientFetchError(url, exc) from exc
+
+
+@contextmanager
+def _abandon_unless_settled(policy: NetworkPolicy | None, url: str) -> Iterator[None]:
+    """Hands an attempt back to `policy` when it ends without a response or a transport error.
+
+    Those two are reported by the caller (`after_response` / `after_error`); anything else
+    (cancellation, a local error) would otherwise leave a half-open breaker probing forever.
+    """
     try:
-        r = client.get(product_url, timeout=20.0)
-        r.raise_for_status()
-        html = r.text
-    except Exception:
+        yield
+    except httpx.TransportError:
+        raise
+    except BaseException:
+        if policy is not None:
+            policy.abandon(url)
+        raise
+
+
+@contextmanager
+def _open_stream(
+    client: httpx.Client, url: str, *, headers: dict[str, str] | None, policy: NetworkPolicy | None
+) -> Iterator[httpx.Response]:
+    """`client.stream("GET", ...)` with the host's rate limit, retry/backoff and breaker applied.
+
+    Only opening the response is retried; once a non-retryable status arrives it is yielded.
+    """
+
+    attempt = 0
+    while True:
+        wait = policy.before_request(url) if policy is not None else 0.0
+        with ExitStack() as stack:
+            try:
+                with _abandon_unless_settled(policy, url):
+                    if wait > 0:
+                        time.sleep(wait)
+                    r = stack.enter_context(client.stream("GET", url, headers=headers))
+            except httpx.TransportError:
+                delay = policy.after_error(url, attempt=attempt) if policy is not None else None
+                if delay is None:
+                    raise
+            else:
+                delay = None
+                if policy is not None:
+                    delay = policy.after_response(
+                        url, r.status_code, retry_after=r.headers.get("retry-after"), attempt=attempt
+                    )
+                if delay is None:
+                    yield r
+                    return
+        time.sleep(delay)
+        attempt += 1
+
+
+@asynccontextmanager
+async def _open_stream_async(
+    client: httpx.AsyncClient, url: str, *, headers: dict[str, str] | None, policy: NetworkPolicy | None
+) -> AsyncIterator[httpx.Response]:
+    attempt = 0
+    while True:
+        wait = policy.before_request(url) if policy is not None else 0.0
+        async with AsyncExitStack() as stack:
+            try:
+                with _abandon_unless_settled(policy, url):
+                    if wait > 0:
+                        await asyncio.sleep(wait)  # a deadline cancel here must not strand a breaker probe
+                    r = await stack.enter_async_context(client.stream("GET", url, headers=headers))
+            except httpx.TransportError:
+                delay = policy.after_error(url, attempt=attempt) if policy is not None else None
+                if delay is None:
+                    raise
+            else:
+                delay = None
+                if policy is not None:
+                    delay = policy.after_response(
+                        url, r.status_code, retry_after=r.headers.get("retry-after"), attempt=attempt
+                    )
+                if delay is None:
+                    yield r
+                    return
+        await asyncio.sleep(delay)
+        attempt += 1
+
+
+def _image_lookup(
+    *,
+    cache: HttpCache | None,
+    url: str,
+    out_dir: Path,
+    stem: str,
+    revalidate: bool,
+    blob_store: ImageBlobStore | None = None,
+) -> CacheLookup | None:
+    """Conditional-request state for an image, if the cache still points at our file.
+
+    Blobs are content-addressed, so with a blob store any cached blob for the URL is ours.
+    """
+
+    if cache is None:
+        return None
+    entry = cache.get(url)
+    if entry is None or not entry.local_path:
+        return None
+    local = Path(entry.local_path)
+    if blob_store is not None:
+        if not blob_store.contains(local):
+            return None
+    elif local.parent != out_dir or local.stem != stem:
         return None
+    return cache.prepare(url, revalidate=revalidate, local_path=local)
+
+
+def _download_image(
+    *,
+    client: httpx.Client,
+    url: str,
+    out_dir: Path,
+    stem: str,
+    cache: HttpCache | None = None,
+    revalidate: bool = False,
+    max_bytes: int = DEFAULT_MAX_IMAGE_BYTES,
+    dry_run: bool = False,
+    stats: EnrichmentStats | None = None,
+    policy: NetworkPolicy | None = None,
+    blob_store: ImageBlobStore | None = None,
+) -> Path | None:
+    """Fetch an image with a single streamed GET. Returns the written path, or None.
 
-    base_url = str(getattr(r, "url", product_url))
+    Raises `_TransientFetchError` when the host could not be reached (rather than refused the image).
+    """
+
+    lookup = _image_lookup(
+        cache=cache, url=url, out_dir=out_dir, stem=stem, revalidate=revalidate, blob_store=blob_store
+    )
+    if lookup and lookup.entry and lookup.fresh:
+        return Path(str(lookup.entry.local_path))
+
+    sink = _ImageSink(out_dir=out_dir, stem=stem, max_bytes=max_bytes, dry_run=dry_run, blob_store=blob_store)
+    r: httpx.Response | None = None
+    try:
+        with _open_stream(client, url, headers=lookup.headers if lookup else None, policy=policy) as r:
+            if r.status_code == 304 and cache and lookup and lookup.entry:
+                cache.revalidated(lookup.entry, response=r)
+                return Path(str(lookup.entry.local_path))
+            r.raise_for_status()
+            sink.begin(r)
+            for chunk in r.iter_bytes(IMAGE_CHUNK_SIZE):
+                if not sink.feed(chunk):
+                    break
+            out_path = sink.commit()
+            if out_path is not None and cache is not None and not dry_run:
+                cache.store(url, response=r, body=None, local_path=out_path)
+            return out_path
+    except Exception as e:
+        sink.abort()
+        _raise_if_transient(url, e)
+        return None
+    finally:
+        _record_transfer(stats, r)
+
+
+async def _download_image_async(
+    *,
+    client: httpx.AsyncClient,
+    url: str,
+    out_dir: Path,
+    stem: str,
+    cache: HttpCache | None = None,
+    revalidate: bool = False,
+    max_bytes: int = DEFAULT_MAX_IMAGE_BYTES,
+    dry_run: bool = False,
+    stats: EnrichmentStats | None = None,
+    policy: NetworkPolicy | None = None,
+    blob_store: ImageBlobStore | None = None,
+) -> Path | None:
+    lookup = _image_lookup(
+        cache=cache, url=url, out_dir=out_dir, stem=stem, revalidate=revalidate, blob_store=blob_store
+    )
+    if lookup and lookup.entry and lookup.fresh:
+        return Path(str(lookup.entry.local_path))
+
+    sink = _ImageSink(out_dir=out_dir, stem=stem, max_bytes=max_bytes, dry_run=dry_run, blob_store=blob_store)
+    r: httpx.Response | None = None
+    try:
+        async with _open_stream_async(client, url, headers=lookup.headers if lookup else None, policy=policy) as r:
+            if r.status_code == 304 and cache and lookup and lookup.entry:
+                cache.revalidated(lookup.entry, response=r)
+                return Path(str(lookup.entry.local_path))
+            r.raise_for_status()
+            sink.begin(r)
+            async for chunk in r.aiter_bytes(IMAGE_CHUNK_SIZE):
+                if not sink.feed(chunk):
+                    break
+            out_path = sink.commit()
+            if out_path is not None and cache is not None and not dry_run:
+                cache.store(url, response=r, body=None, local_path=out_path)
+            return out_path
+    except asyncio.CancelledError:
+        # Deadline cancellation: never leave a half-written temp file behind.
+        sink.abort()
+        raise
+    except Exception as e:
+        sink.abort()
+        _raise_if_transient(url, e)
+        return None
+    finally:
+        _record_transfer(stats, r)
+
+
+def _best_image_url_from_html(*, html: str, base_url: str) -> str | None:
+    """Full-document extractor (HTMLParser + regex passes).
+
+    Superseded by `_StreamingImageExtractor`; kept as the baseline for
+    scripts/bench_image_extractor.py.
+    """
 
     img = _extract_og_image(html)
     if img:
@@ -187,6 +817,152 @@ def _fetch_best_image_url(*, client: httpx.Client, product_url: str) -> str | No
     return None
 
 
+class _PageScan:
+    """Feeds a streamed product page through `_StreamingImageExtractor`.
+
+    The bytes actually read are what gets cached: when the scan stops early the cached body
+    is a prefix, which re-extracts to the same answer on a cache hit or 304.
+    """
+
+    def __init__(self, response: httpx.Response, *, target_width: int | None = None) -> None:
+        self._response = response
+        try:
+            decoder_cls = codecs.getincrementaldecoder(response.encoding or "utf-8")
+        except LookupError:
+            decoder_cls = codecs.getincrementaldecoder("utf-8")
+        self._decoder = decoder_cls(errors="replace")
+        self._extractor = _StreamingImageExtractor(base_url=str(response.url), target_width=target_width)
+        self._raw: list[bytes] = []
+
+    def feed(self, chunk: bytes) -> bool:
+        self._raw.append(chunk)
+        return self._extractor.feed(self._decoder.decode(chunk))
+
+    def finish(self, *, cache: HttpCache | None, url: str) -> str | None:
+        self._extractor.feed(self._decoder.decode(b"", final=True))
+        if cache is not None:
+            cache.store(url, response=self._response, body=b"".join(self._raw))
+        return self._extractor.result()
+
+
+def _worth_draining(r: httpx.Response) -> bool:
+    length = r.headers.get("content-length", "")
+    # Unknown lengths (chunked) are drained up to the cap and dropped past it.
+    return not length.isdigit() or int(length) - r.num_bytes_downloaded <= PAGE_DRAIN_MAX_BYTES
+
+
+def _drain_page(r: httpx.Response, chunks: Iterator[bytes], stats: EnrichmentStats | None) -> None:
+    """Read the rest of an abandoned page when little is left, so its connection goes back to the pool."""
+
+    if _worth_draining(r):
+        start = r.num_bytes_downloaded
+        for _ in chunks:
+            if r.num_bytes_downloaded - start > PAGE_DRAIN_MAX_BYTES:
+                break
+        else:
+            return
+    if stats is not None:
+        stats.connections_dropped += 1
+
+
+async def _drain_page_async(r: httpx.Response, chunks: AsyncIterator[bytes], stats: EnrichmentStats | None) -> None:
+    if _worth_draining(r):
+        start = r.num_bytes_downloaded
+        async for _ in chunks:
+            if r.num_bytes_downloaded - start > PAGE_DRAIN_MAX_BYTES:
+                break
+        else:
+            return
+    if stats is not None:
+        stats.connections_dropped += 1
+
+
+def _record_transfer(stats: EnrichmentStats | None, response: httpx.Response | None) -> None:
+    if stats is not None and response is not None:
+        stats.requests += 1
+        stats.bytes_downloaded += response.num_bytes_downloaded
+
+
+def _cached_page_image_url(*, entry: CachedResponse, body: bytes, target_width: int | None) -> str | None:
+    return _extract_image_url_from_html(
+        html=_decode_body(body, entry.encoding), base_url=entry.final_url, target_width=target_width
+    )
+
+
+def _fetch_best_image_url(
+    *,
+    client: httpx.Client,
+    product_url: str,
+    cache: HttpCache | None = None,
+    revalidate: bool = False,
+    stats: EnrichmentStats | None = None,
+    policy: NetworkPolicy | None = None,
+    target_width: int | None = None,
+) -> str | None:
+    lookup = _page_lookup(cache=cache, url=product_url, revalidate=revalidate)
+    if cache and lookup and lookup.fresh and lookup.entry and lookup.body is not None:
+        return _cached_page_image_url(entry=lookup.entry, body=lookup.body, target_width=target_width)
+
+    r: httpx.Response | None = None
+    try:
+        with _open_stream(client, product_url, headers=lookup.headers if lookup else None, policy=policy) as r:
+            if r.status_code == 304 and cache and lookup and lookup.entry and lookup.body is not None:
+                entry = cache.revalidated(lookup.entry, response=r)
+                return _cached_page_image_url(entry=entry, body=lookup.body, target_width=target_width)
+            r.raise_for_status()
+            scan = _PageScan(r, target_width=target_width)
+            chunks = r.iter_bytes(PAGE_CHUNK_SIZE)
+            for chunk in chunks:
+                if scan.feed(chunk):
+                    image_url = scan.finish(cache=cache, url=product_url)
+                    _drain_page(r, chunks, stats)
+                    return image_url
+            return scan.finish(cache=cache, url=product_url)
+    except Exception as e:
+        _raise_if_transient(product_url, e)
+        return None
+    finally:
+        _record_transfer(stats, r)
+
+
+async def _fetch_best_image_url_async(
+    *,
+    client: httpx.AsyncClient,
+    product_url: str,
+    cache: HttpCache | None = None,
+    revalidate: bool = False,
+    stats: EnrichmentStats | None = None,
+    policy: NetworkPolicy | None = None,
+    target_width: int | None = None,
+) -> str | None:
+    lookup = _page_lookup(cache=cache, url=product_url, revalidate=revalidate)
+    if cache and lookup and lookup.fresh and lookup.entry and lookup.body is not None:
+        return _cached_page_image_url(entry=lookup.entry, body=lookup.body, target_width=target_width)
+
+    r: httpx.Response | None = None
+    try:
+        async with _open_stream_async(
+            client, product_url, headers=lookup.headers if lookup else None, policy=policy
+        ) as r:
+            if r.status_code == 304 and cache and lookup and lookup.entry and lookup.body is not None:
+                entry = cache.revalidated(lookup.entry, response=r)
+                return _cached_page_image_url(entry=entry, body=lookup.body, target_width=target_width)
+            r.raise_for_status()
+            scan = _PageScan(r, target_width=target_width)
+            chunks = r.aiter_bytes(PAGE_CHUNK_SIZE)
+            async for chunk in chunks:
+                if scan.feed(chunk):
+                    image_url = scan.finish(cache=cache, url=product_url)
+                    await _drain_page_async(r, chunks, stats)
+                    return image_url
+            return scan.finish(cache=cache, url=product_url)
+    except Exception as e:
+        _raise_if_transient(product_url, e)
+        return None
+    finally:
+        _record_transfer(stats, r)
+
+
 def _extract_products_json_line(frontmatter: str) -> tuple[list[dict[str, Any]], str] | None:
     m = RE_PRODUCTS_LINE_JSON.search(frontmatter)
     if not m:
@@ -205,42 +981,50 @@ def _extract_products_json_line(frontmatter: str) -> tuple[list[dict[str, Any]],
     return normalized, raw
 
 
-def enrich_pick_images_for_markdown(
-    *,
-    markdown_path: Path,
-    slug: str,
-    repo_root: Path | None = None,
-    allow_yaml_frontmatter_rewrite: bool = False,
-    dry_run: bool = False,
-    max_picks: int = 0,
-    force: bool = False,
-) -> PickImageEnrichmentResult:
-    """Populate products[].image and download images under site/public.
+@dataclass
+class _PostProducts:
+    md: str
+    fm: str
+    products: list[dict[str, Any]]
+    use_json_line: bool
 
-    Supports the repo’s preferred Astro post format where `products:` is a single-line JSON array.
-    If `allow_yaml_frontmatter_rewrite=True`, will also handle YAML-list products by rewriting the
-    whole frontmatter block (used for content_factory outputs).
-    """
 
-    errors: list[str] = []
-    picks_updated = 0
-    picks_skipped = 0
+@dataclass(frozen=True)
+class _PickJob:
+    index: int
+    pick_id: str
+    url: str
+    old_local_abs: Path | None
+    resolution_keys: tuple[str, ...] = ()
 
-    repo = repo_root or Path(__file__).resolve().parents[1]
-    public_picks_dir = repo / "site" / "public" / "images" / "picks" / slug
 
+@dataclass(frozen=True)
+class _PickOutcome:
+    index: int
+    image: str | None = None
+    error: str | None = None
+    host: str | None = None  # host that failed, for batch stats
+    reused: bool = False
+    path: Path | None = None  # local file behind `image`
+    fields: dict[str, Any] | None = None  # extra products[] keys (image dimensions/variants)
+    known_failure: bool = False  # skipped because of a cached failure
+    seconds: float = 0.0  # wall time spent on the pick (async: includes waiting for a slot)
+
+
+def _load_post_products(
+    *, markdown_path: Path, allow_yaml_frontmatter_rewrite: bool
+) -> tuple[_PostProducts | None, str | None]:
     md = _read_text(markdown_path)
     fm = _extract_frontmatter(md)
     if not fm:
-        return PickImageEnrichmentResult(updated=False, picks_updated=0, picks_skipped=0, errors=["missing frontmatter"])
+        return None, "missing frontmatter"
 
     products: list[dict[str, Any]] | None = None
-    raw_products_json: str | None = None
     use_json_line = False
 
     extracted = _extract_products_json_line(fm)
     if extracted:
-        products, raw_products_json = extracted
+        products, _raw = extracted
         use_json_line = True
     elif allow_yaml_frontmatter_rewrite:
         try:
@@ -252,79 +1036,487 @@ def enrich_pick_images_for_markdown(
             products = None
 
     if not products:
-        return PickImageEnrichmentResult(updated=False, picks_updated=0, picks_skipped=0, errors=["no products found"])
+        return None, "no products found"
 
-    headers = {
-        # Use a mainstream UA; some retailers serve interstitial pages otherwise.
-        "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
-        "accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        "accept-language": "en-GB,en;q=0.9",
-    }
+    return _PostProducts(md=md, fm=fm, products=products, use_json_line=use_json_line), None
 
-    updated_any = False
-    with httpx.Client(follow_redirects=True, headers=headers) as client:
-        for i, p in enumerate(products):
-            if max_picks and i >= max_picks:
-                break
 
-            pick_id = str(p.get("pick_id") or "").strip()
-            url = str(p.get("url") or "").strip()
-            if not pick_id or not url:
-                picks_skipped += 1
-                continue
+def _plan_pick_jobs(
+    *,
+    products: list[dict[str, Any]],
+    slug: str,
+    repo: Path,
+    max_picks: int,
+    force: bool,
+    blob_store: ImageBlobStore | None = None,
+) -> tuple[list[_PickJob], int]:
+    """Decide which picks need network work. Returns (jobs, picks_skipped)."""
+
+    jobs: list[_PickJob] = []
+    picks_skipped = 0
+    for i, p in enumerate(products):
+        if max_picks and i >= max_picks:
+            break
 
-            existing = str(p.get("image") or "").strip()
+        pick_id = str(p.get("pick_id") or "").strip()
+        url = str(p.get("url") or "").strip()
+        if not pick_id or not url:
+            picks_skipped += 1
+            continue
 
-            old_local_abs: Path | None = None
-            if force and existing.startswith("/images/picks/"):
-                old_local_abs = repo / "site" / "public" / existing.lstrip("/")
+        existing = str(p.get("image") or "").strip()
 
-            # If already set and file exists, skip.
-            if (not force) and existing and existing.startswith(f"/images/picks/{slug}/"):
-                existing_file = repo / "site" / "public" / existing.lstrip("/")
-                if existing_file.exists():
-                    picks_skipped += 1
-                    continue
+        old_local_abs: Path | None = None
+        if force and existing.startswith("/images/picks/"):
+            old_local_abs = repo / "site" / "public" / existing.lstrip("/")
 
-            image_url = _fetch_best_image_url(client=client, product_url=url)
-            if not image_url:
-                errors.append(f"no og image for {pick_id}")
+        # If already set and file exists, skip.
+        own_image = existing.startswith(f"/images/picks/{slug}/") or (
+            blob_store is not None and blob_store.is_blob_url(existing)
+        )
+        if (not force) and existing and own_image:
+            existing_file = repo / "site" / "public" / existing.lstrip("/")
+            if existing_file.exists():
                 picks_skipped += 1
                 continue
 
-            # Determine extension
-            ext = None
+        jobs.append(
+            _PickJob(
+                index=i,
+                pick_id=pick_id,
+                url=url,
+                old_local_abs=old_local_abs,
+                resolution_keys=tuple(resolution_keys(p)),
+            )
+        )
+
+    return jobs, picks_skipped
+
+
+def _remove_replaced_image(*, job: _PickJob, out_file: Path, blob_store: ImageBlobStore | None) -> None:
+    # Blobs may be shared with other posts; orphans are pruned by the dedupe script instead.
+    if job.old_local_abs and blob_store is not None and blob_store.contains(job.old_local_abs):
+        return
+    if job.old_local_abs and job.old_local_abs.exists():
+        try:
+            if job.old_local_abs.resolve() != out_file.resolve():
+                job.old_local_abs.unlink(missing_ok=True)
+        except Exception:
+            pass
+
+
+@dataclass(frozen=True)
+class _EnrichContext:
+    slug: str
+    public_dir: Path
+    public_picks_dir: Path
+    dry_run: bool
+    http_cache: HttpCache | None = None
+    # Force runs revalidate cached responses (304s) instead of trusting the TTL.
+    revalidate: bool = False
+    max_image_bytes: int = DEFAULT_MAX_IMAGE_BYTES
+    stats: EnrichmentStats | None = None
+    policy: NetworkPolicy | None = None
+    image_resolutions: ProductImageCache | None = None
+    blob_store: ImageBlobStore | None = None
+    variants: VariantEncoder | None = None
+    target_image_width: int | None = None
+    image_failures: ImageFailureCache | None = None
+
+    def public_url(self, path: Path) -> str:
+        return "/" + path.relative_to(self.public_dir).as_posix()
+
+
+def _host(url: str) -> str:
+    return (urlparse(url).hostname or "").lower()
+
+
+def _cached_resolution(*, job: _PickJob, ctx: _EnrichContext) -> ImageResolution | None:
+    # Force runs re-resolve from the retailer; the result still refreshes the cache.
+    if ctx.image_resolutions is None or ctx.revalidate:
+        return None
+    return ctx.image_resolutions.lookup(job.resolution_keys)
+
+
+def _reuse_resolved_file(*, resolution: ImageResolution, job: _PickJob, ctx: _EnrichContext) -> Path | None:
+    """Reuse the image already downloaded for the same product (usually by another post).
+
+    Blobs are shared as-is; a per-slug file is linked/copied (or adopted into the blob store).
+    """
+
+    local_file = str(resolution.get("local_file") or "")
+    if not local_file.startswith("/images/picks/"):
+        return None
+    src = ctx.public_dir / local_file.lstrip("/")
+    try:
+        if src.stat().st_size == 0:
+            return None
+        if ctx.blob_store is not None and ctx.blob_store.contains(src):
+            return src
+        out_file = ctx.public_picks_dir / f"{job.pick_id}{src.suffix}"
+        if ctx.blob_store is not None and not ctx.dry_run:
+            out_file = ctx.blob_store.put_file(src)
+        elif not ctx.dry_run:
+            link_or_copy(src, out_file)
+    except OSError:
+        return None
+    return out_file
+
+
+def _record_resolution(*, job: _PickJob, ctx: _EnrichContext, image_url: str, out_file: Path) -> None:
+    if ctx.image_resolutions is None or ctx.dry_run:
+        return
+    ctx.image_resolutions.record(
+        job.resolution_keys,
+        {"image_url": image_url, "local_file": ctx.public_url(out_file), "product_url": job.url},
+    )
+
+
+def _known_failure(*, job: _PickJob, ctx: _EnrichContext) -> _PickOutcome | None:
+    # Force runs retry known failures; a new failure refreshes the entry, a success drops it.
+    if ctx.image_failures is None or ctx.revalidate:
+        return None
+    entry = ctx.image_failures.lookup(job.url)
+    if entry is None:
+        return None
+    retry_at = iso_timestamp(ctx.image_failures.expires_at(entry))
+    return _PickOutcome(
+        index=job.index,
+        error=f"{entry.get('detail') or entry.get('reason')} (cached failure, retried after {retry_at})",
+        host=_host(job.url),
+        known_failure=True,
+    )
+
+
+def _failed(*, job: _PickJob, ctx: _EnrichContext, reason: str, error: str, host: str) -> _PickOutcome:
+    if ctx.image_failures is not None and not ctx.dry_run:
+        ctx.image_failures.record(job.url, reason=reason, detail=error, post=ctx.slug, pick_id=job.pick_id)
+    return _PickOutcome(index=job.index, error=error, host=host)
+
+
+def _picked(*, job: _PickJob, ctx: _EnrichContext, out_file: Path, reused: bool = False) -> _PickOutcome:
+    if not ctx.dry_run:
+        _remove_replaced_image(job=job, out_file=out_file, blob_store=ctx.blob_store)
+        if ctx.image_failures is not None:
+            ctx.image_failures.forget(job.url)
+    return _PickOutcome(index=job.index, image=ctx.public_url(out_file), reused=reused, path=out_file)
+
+
+# Frontmatter keys derived from the image file; dropped whenever the image changes.
+IMAGE_DERIVED_KEYS = ("imageWidth", "imageHeight", "imageVariants", "imagePlaceholder")
+
+
+def _variant_fields(*, ctx: _EnrichContext, encoded: EncodedImage) -> dict[str, Any]:
+    fields: dict[str, Any] = {
+        "imageWidth": encoded.width,
+        "imageHeight": encoded.height,
+        "imageVariants": [
+            {"src": ctx.public_url(v.path), "width": v.width, "height": v.height} for v in encoded.variants
+        ],
+    }
+    if encoded.placeholder:
+        fields["imagePlaceholder"] = encoded.placeholder
+    return fields
+
+
+def _variants_failed(outcome: _PickOutcome, exc: BaseException) -> _PickOutcome:
+    name = outcome.path.name if outcome.path else outcome.image
+    return replace(outcome, error=f"variants failed for {name}: {exc}")
+
+
+def _attach_variants(*, ctx: _EnrichContext, outcomes: list[_PickOutcome]) -> list[_PickOutcome]:
+    """Encode every picked image in the process pool (in parallel) and attach its fields."""
+
+    if ctx.variants is None or ctx.dry_run:
+        return outcomes
+    # Outcomes that already carry fields (restored from a checkpoint) are left as they are.
+    futures = {o.index: ctx.variants.submit(o.path) for o in outcomes if o.path is not None and o.fields is None}
+    attached: list[_PickOutcome] = []
+    for outcome in outcomes:
+        fut = futures.get(outcome.index)
+        if fut is None:
+            attached.append(outcome)
+            continue
+        try:
+            attached.append(replace(outcome, fields=_variant_fields(ctx=ctx, encoded=fut.result())))
+        except Exception as e:
+            attached.append(_variants_failed(outcome, e))
+    return attached
+
+
+async def _attach_variants_async(*, ctx: _EnrichContext, outcome: _PickOutcome) -> _PickOutcome:
+    if ctx.variants is None or ctx.dry_run or outcome.path is None or outcome.fields is not None:
+        return outcome
+    try:
+        encoded = await ctx.variants.encode_async(outcome.path)
+    except Exception as e:
+        return _variants_failed(outcome, e)
+    return replace(outcome, fields=_variant_fields(ctx=ctx, encoded=encoded))
+
+
+def _download_pick_image(*, client: httpx.Client, url: str, job: _PickJob, ctx: _EnrichContext) -> Path | None:
+    return _download_image(
+        client=client,
+        url=url,
+        out_dir=ctx.public_picks_dir,
+        stem=job.pick_id,
+        cache=ctx.http_cache,
+        revalidate=ctx.revalidate,
+        max_bytes=ctx.max_image_bytes,
+        dry_run=ctx.dry_run,
+        stats=ctx.stats,
+        policy=ctx.policy,
+        blob_store=ctx.blob_store,
+    )
+
+
+def _enrich_pick(*, client: httpx.Client, job: _PickJob, ctx: _EnrichContext) -> _PickOutcome:
+    t0 = time.perf_counter()
+    outcome = _resolve_pick(client=client, job=job, ctx=ctx)
+    return replace(outcome, seconds=time.perf_counter() - t0)
+
+
+def _resolve_pick(*, client: httpx.Client, job: _PickJob, ctx: _EnrichContext) -> _PickOutcome:
+    resolution = _cached_resolution(job=job, ctx=ctx)
+    if resolution:
+        reused = _reuse_resolved_file(resolution=resolution, job=job, ctx=ctx)
+        if reused is not None:
+            return _picked(job=job, ctx=ctx, out_file=reused, reused=True)
+    known = _known_failure(job=job, ctx=ctx)
+    if known is not None:
+        return known
+    try:
+        return _fetch_pick(client=client, job=job, ctx=ctx, resolution=resolution)
+    except _TransientFetchError as e:
+        return _PickOutcome(index=job.index, error=f"fetch failed for {job.pick_id}: {e}", host=e.host)
+
+
+def _fetch_pick(
+    *, client: httpx.Client, job: _PickJob, ctx: _EnrichContext, resolution: ImageResolution | None
+) -> _PickOutcome:
+    # A known image URL skips the product page; if it went stale, fall back to a fresh lookup.
+    cached_url = resolution.get("image_url") if resolution else None
+    out_file = _download_pick_image(client=client, url=cached_url, job=job, ctx=ctx) if cached_url else None
+    image_url = cached_url
+    if out_file is None:
+        image_url = _fetch_best_image_url(
+            client=client,
+            product_url=job.url,
+            cache=ctx.http_cache,
+            revalidate=ctx.revalidate,
+            stats=ctx.stats,
+            policy=ctx.policy,
+            target_width=ctx.target_image_width,
+        )
+        if not image_url:
+            return _failed(
+                job=job, ctx=ctx, reason=REASON_NO_IMAGE, error=f"no og image for {job.pick_id}", host=_host(job.url)
+            )
+        if image_url != cached_url:
+            out_file = _download_pick_image(client=client, url=image_url, job=job, ctx=ctx)
+        if out_file is None:
+            return _failed(
+                job=job,
+                ctx=ctx,
+                reason=REASON_DOWNLOAD_FAILED,
+                error=f"download failed for {job.pick_id}",
+                host=_host(image_url),
+            )
+
+    _record_resolution(job=job, ctx=ctx, image_url=image_url, out_file=out_file)
+    return _picked(job=job, ctx=ctx, out_file=out_file)
+
+
+class _PriorityGate:
+    """Counting gate whose image downloads go ahead of queued page fetches."""
+
+    def __init__(self, limit: int) -> None:
+        self._limit = max(1, int(limit))
+        self._in_use = 0
+        self._images_waiting = 0
+        self._cond = asyncio.Condition()
+
+    def _free(self, *, image: bool) -> bool:
+        return self._in_use < self._limit and (image or not self._images_waiting)
+
+    @asynccontextmanager
+    async def hold(self, *, image: bool) -> AsyncIterator[None]:
+        async with self._cond:
+            if image:
+                self._images_waiting += 1
             try:
-                head = client.head(image_url, timeout=20.0)
-                ext = _ext_from_content_type(head.headers.get("content-type"))
-            except Exception:
-                ext = None
-            if not ext:
-                # Fallback to jpg
-                ext = ".jpg"
-
-            out_file = public_picks_dir / f"{pick_id}{ext}"
-            if dry_run:
-                p["image"] = f"/images/picks/{slug}/{out_file.name}"
-                updated_any = True
-                picks_updated += 1
-                continue
+                await self._cond.wait_for(lambda: self._free(image=image))
+            finally:
+                if image:
+                    self._images_waiting -= 1
+                    self._cond.notify_all()  # page fetches held back by this waiter may go now
+            self._in_use += 1
+        try:
+            yield
+        finally:
+            async with self._cond:
+                self._in_use -= 1
+                self._cond.notify_all()
 
-            if not _download_image(client=client, url=image_url, out_path=out_file):
-                errors.append(f"download failed for {pick_id}")
-                picks_skipped += 1
-                continue
 
-            p["image"] = f"/images/picks/{slug}/{out_file.name}"
-            updated_any = True
-            picks_updated += 1
+class _ConcurrencyLimiter:
+    """Global + per-host request caps for the async enrichment path.
+
+    Image downloads of picks whose page is already resolved take free slots before new page
+    fetches, so picks under way finish first (depth-first) and a deadline run keeps what it got.
+    """
+
+    def __init__(self, *, max_concurrency: int, max_per_host: int) -> None:
+        self._global = _PriorityGate(max_concurrency)
+        self._max_per_host = max(1, int(max_per_host))
+        self._per_host: dict[str, _PriorityGate] = {}
+
+    @asynccontextmanager
+    async def slot(self, url: str, *, image: bool = False) -> AsyncIterator[None]:
+        host = _host(url)
+        host_gate = self._per_host.get(host)
+        if host_gate is None:
+            host_gate = _PriorityGate(self._max_per_host)
+            self._per_host[host] = host_gate
+        # Wait on the host first so a busy host does not hold global slots hostage.
+        async with host_gate.hold(image=image):
+            async with self._global.hold(image=image):
+                yield
+
+
+async def _download_pick_image_async(
+    *,
+    client: httpx.AsyncClient,
+    limiter: _ConcurrencyLimiter,
+    url: str,
+    job: _PickJob,
+    ctx: _EnrichContext,
+) -> Path | None:
+    async with limiter.slot(url, image=True):
+        return await _download_image_async(
+            client=client,
+            url=url,
+            out_dir=ctx.public_picks_dir,
+            stem=job.pick_id,
+            cache=ctx.http_cache,
+            revalidate=ctx.revalidate,
+            max_bytes=ctx.max_image_bytes,
+            dry_run=ctx.dry_run,
+            stats=ctx.stats,
+            policy=ctx.policy,
+            blob_store=ctx.blob_store,
+        )
+
+
+async def _enrich_pick_async(
+    *,
+    client: httpx.AsyncClient,
+    limiter: _ConcurrencyLimiter,
+    job: _PickJob,
+    ctx: _EnrichContext,
+) -> _PickOutcome:
+    t0 = time.perf_counter()
+    outcome = await _resolve_pick_async(client=client, limiter=limiter, job=job, ctx=ctx)
+    return replace(outcome, seconds=time.perf_counter() - t0)
 
-            if force and old_local_abs and old_local_abs.exists():
-                try:
-                    if old_local_abs.resolve() != out_file.resolve():
-                        old_local_abs.unlink(missing_ok=True)
-                except Exception:
-                    pass
+
+async def _resolve_pick_async(
+    *,
+    client: httpx.AsyncClient,
+    limiter: _ConcurrencyLimiter,
+    job: _PickJob,
+    ctx: _EnrichContext,
+) -> _PickOutcome:
+    resolution = _cached_resolution(job=job, ctx=ctx)
+    if resolution:
+        reused = _reuse_resolved_file(resolution=resolution, job=job, ctx=ctx)
+        if reused is not None:
+            return await _attach_variants_async(
+                ctx=ctx, outcome=_picked(job=job, ctx=ctx, out_file=reused, reused=True)
+            )
+    known = _known_failure(job=job, ctx=ctx)
+    if known is not None:
+        return known
+    try:
+        return await _fetch_pick_async(client=client, limiter=limiter, job=job, ctx=ctx, resolution=resolution)
+    except _TransientFetchError as e:
+        return _PickOutcome(index=job.index, error=f"fetch failed for {job.pick_id}: {e}", host=e.host)
+
+
+async def _fetch_pick_async(
+    *,
+    client: httpx.AsyncClient,
+    limiter: _ConcurrencyLimiter,
+    job: _PickJob,
+    ctx: _EnrichContext,
+    resolution: ImageResolution | None,
+) -> _PickOutcome:
+    cached_url = resolution.get("image_url") if resolution else None
+    out_file = None
+    if cached_url:
+        out_file = await _download_pick_image_async(client=client, limiter=limiter, url=cached_url, job=job, ctx=ctx)
+    image_url = cached_url
+    if out_file is None:
+        async with limiter.slot(job.url):
+            image_url = await _fetch_best_image_url_async(
+                client=client,
+                product_url=job.url,
+                cache=ctx.http_cache,
+                revalidate=ctx.revalidate,
+                stats=ctx.stats,
+                policy=ctx.policy,
+                target_width=ctx.target_image_width,
+            )
+        if not image_url:
+            return _failed(
+                job=job, ctx=ctx, reason=REASON_NO_IMAGE, error=f"no og image for {job.pick_id}", host=_host(job.url)
+            )
+        if image_url != cached_url:
+            out_file = await _download_pick_image_async(
+                client=client, limiter=limiter, url=image_url, job=job, ctx=ctx
+            )
+        if out_file is None:
+            return _failed(
+                job=job,
+                ctx=ctx,
+                reason=REASON_DOWNLOAD_FAILED,
+                error=f"download failed for {job.pick_id}",
+                host=_host(image_url),
+            )
+
+    _record_resolution(job=job, ctx=ctx, image_url=image_url, out_file=out_file)
+    # Encoding runs in the process pool while other picks keep downloading.
+    return await _attach_variants_async(ctx=ctx, outcome=_picked(job=job, ctx=ctx, out_file=out_file))
+
+
+def _finalize_post(
+    *,
+    markdown_path: Path,
+    post: _PostProducts,
+    outcomes: list[_PickOutcome],
+    picks_skipped: int,
+    allow_yaml_frontmatter_rewrite: bool,
+    dry_run: bool,
+) -> PickImageEnrichmentResult:
+    """Apply outcomes in product order and write the frontmatter (at most once)."""
+
+    errors: list[str] = []
+    picks_updated = 0
+    updated_any = False
+
+    for outcome in sorted(outcomes, key=lambda o: o.index):
+        if outcome.error:
+            errors.append(outcome.error)
+        if outcome.image is None:
+            picks_skipped += 1
+            continue
+        product = post.products[outcome.index]
+        product["image"] = outcome.image
+        for key in IMAGE_DERIVED_KEYS:
+            product.pop(key, None)
+        product.update(outcome.fields or {})
+        updated_any = True
+        picks_updated += 1
 
     if not updated_any:
         return PickImageEnrichmentResult(updated=False, picks_updated=picks_updated, picks_skipped=picks_skipped, errors=errors)
@@ -332,7 +1524,9 @@ def enrich_pick_images_for_markdown(
     if dry_run:
         return PickImageEnrichmentResult(updated=True, picks_updated=picks_updated, picks_skipped=picks_skipped, errors=errors)
 
-    if use_json_line and raw_products_json is not None:
+    md, fm, products = post.md, post.fm, post.products
+
+    if post.use_json_line:
         new_json = json.dumps(products, ensure_ascii=False)
         new_fm = RE_PRODUCTS_LINE_JSON.sub(f"products: {new_json}", fm)
         new_md = md.replace(f"---\n{fm}\n---", f"---\n{new_fm}\n---", 1)
@@ -352,3 +1546,511 @@ def enrich_pick_images_for_markdown(
             return PickImageEnrichmentResult(updated=False, picks_updated=picks_updated, picks_skipped=picks_skipped, errors=errors)
 
     return PickImageEnrichmentResult(updated=False, picks_updated=picks_updated, picks_skipped=picks_skipped, errors=errors)
+
+
+@dataclass
+class _PostWork:
+    """One post's planned picks plus everything needed to write its frontmatter once."""
+
+    markdown_path: Path
+    post: _PostProducts
+    jobs: list[_PickJob]
+    picks_skipped: int
+    ctx: _EnrichContext
+    allow_yaml_frontmatter_rewrite: bool
+    checkpoint: EnrichmentCheckpoint | None = None
+    restored: list[_PickOutcome] = field(default_factory=list)  # finished by an earlier run
+
+    def completed(self, job: _PickJob, outcome: _PickOutcome) -> None:
+        """Checkpoint a finished pick so a crashed or timed-out run can resume from it."""
+        if self.checkpoint is None or self.ctx.dry_run or outcome.image is None:
+            return
+        self.checkpoint.record(
+            self.ctx.slug, job.pick_id, {"url": job.url, "image": outcome.image, "fields": outcome.fields or {}}
+        )
+
+    def finalize(self, outcomes: list[_PickOutcome], *, timed_out: bool = False) -> PickImageEnrichmentResult:
+        outcomes = self.restored + outcomes
+        if self.ctx.stats is not None:
+            for outcome in outcomes:
+                self.ctx.stats.record(outcome)
+        if self.ctx.image_resolutions is not None:
+            self.ctx.image_resolutions.save()
+        if self.ctx.image_failures is not None:
+            self.ctx.image_failures.save()
+        result = _finalize_post(
+            markdown_path=self.markdown_path,
+            post=self.post,
+            outcomes=outcomes,
+            picks_skipped=self.picks_skipped,
+            allow_yaml_frontmatter_rewrite=self.allow_yaml_frontmatter_rewrite,
+            dry_run=self.ctx.dry_run,
+        )
+        # Keep the checkpoint only if finished picks could not be written to the frontmatter.
+        if self.checkpoint is not None and not self.ctx.dry_run:
+            if result.updated or not any(o.image is not None for o in outcomes):
+                self.checkpoint.clear(self.ctx.slug)
+        return replace(result, timed_out=timed_out)
+
+
+def _restore_checkpointed(
+    *, jobs: list[_PickJob], ctx: _EnrichContext, checkpoint: EnrichmentCheckpoint | None
+) -> tuple[list[_PickJob], list[_PickOutcome]]:
+    """Split jobs into (still to fetch, already finished by an interrupted run)."""
+
+    if checkpoint is None or ctx.dry_run:
+        return jobs, []
+    done = checkpoint.load(ctx.slug)
+    if not done:
+        return jobs, []
+    remaining: list[_PickJob] = []
+    restored: list[_PickOutcome] = []
+    for job in jobs:
+        entry = done.get(job.pick_id)
+        image = str(entry.get("image") or "") if entry else ""
+        path = ctx.public_dir / image.lstrip("/") if image.startswith("/") else None
+        if entry and entry.get("url") == job.url and path is not None and path.is_file():
+            restored.append(_PickOutcome(index=job.index, image=image, path=path, fields=entry.get("fields") or None))
+        else:
+            remaining.append(job)
+    return remaining, restored
+
+
+def _prepare_post(
+    *,
+    markdown_path: Path,
+    slug: str,
+    repo: Path,
+    allow_yaml_frontmatter_rewrite: bool,
+    dry_run: bool,
+    max_picks: int,
+    force: bool,
+    http_cache: HttpCache | None,
+    max_image_bytes: int,
+    stats: EnrichmentStats | None,
+    policy: NetworkPolicy | None,
+    image_resolutions: ProductImageCache | None,
+    blob_store: ImageBlobStore | None,
+    variants: VariantEncoder | None,
+    target_image_width: int | None,
+    checkpoint: EnrichmentCheckpoint | None,
+    image_failures: ImageFailureCache | None,
+) -> _PostWork | PickImageEnrichmentResult:
+    """Plan a post. Returns an early result when there is nothing to fetch."""
+
+    post, err = _load_post_products(
+        markdown_path=markdown_path, allow_yaml_frontmatter_rewrite=allow_yaml_frontmatter_rewrite
+    )
+    if post is None:
+        return PickImageEnrichmentResult(updated=False, picks_updated=0, picks_skipped=0, errors=[str(err)])
+
+    jobs, picks_skipped = _plan_pick_jobs(
+        products=post.products, slug=slug, repo=repo, max_picks=max_picks, force=force, blob_store=blob_store
+    )
+    public_dir = repo / "site" / "public"
+    ctx = _EnrichContext(
+        slug=slug,
+        public_dir=public_dir,
+        public_picks_dir=public_dir / "images" / "picks" / slug,
+        dry_run=dry_run,
+        http_cache=http_cache,
+        revalidate=force,
+        max_image_bytes=max_image_bytes,
+        stats=stats,
+        policy=policy,
+        image_resolutions=image_resolutions,
+        blob_store=blob_store,
+        variants=variants,
+        target_image_width=target_image_width,
+        image_failures=image_failures,
+    )
+    jobs, restored = _restore_checkpointed(jobs=jobs, ctx=ctx, checkpoint=checkpoint)
+    return _PostWork(
+        markdown_path=markdown_path,
+        post=post,
+        jobs=jobs,
+        picks_skipped=picks_skipped,
+        ctx=ctx,
+        allow_yaml_frontmatter_rewrite=allow_yaml_frontmatter_rewrite,
+        checkpoint=checkpoint,
+        restored=restored,
+    )
+
+
+def _deadline_outcome(job: _PickJob) -> _PickOutcome:
+    return _PickOutcome(index=job.index, error=f"deadline exceeded for {job.pick_id}", host=_host(job.url))
+
+
+async def _run_post_async(
+    *,
+    client: httpx.AsyncClient,
+    limiter: _ConcurrencyLimiter,
+    work: _PostWork,
+    deadline: float | None = None,
+) -> PickImageEnrichmentResult:
+    """Run a post's picks, checkpointing each as it finishes.
+
+    `deadline` is a `time.monotonic()` instant: picks still in flight then are cancelled and
+    the frontmatter is written with whatever finished.
+    """
+
+    if work.restored:
+        work.restored = list(
+            await asyncio.gather(*(_attach_variants_async(ctx=work.ctx, outcome=o) for o in work.restored))
+        )
+    tasks = {
+        asyncio.ensure_future(_enrich_pick_async(client=client, limiter=limiter, job=job, ctx=work.ctx)): job
+        for job in work.jobs
+    }
+    outcomes: list[_PickOutcome] = []
+    pending = set(tasks)
+    try:
+        while pending:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+            for task in done:
+                job = tasks[task]
+                try:
+                    outcome = task.result()
+                except Exception as e:
+                    # One broken pick (undecodable image, failed write) must not abort the batch's
+                    # shared gather: it is reported like any other failed pick.
+                    outcome = _PickOutcome(
+                        index=job.index, error=f"{job.pick_id} failed: {type(e).__name__}: {e}", host=_host(job.url)
+                    )
+                work.completed(job, outcome)
+                outcomes.append(outcome)
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    outcomes.extend(_deadline_outcome(tasks[task]) for task in pending)
+    return work.finalize(outcomes, timed_out=bool(pending))
+
+
+def enrich_pick_images_for_markdown(
+    *,
+    markdown_path: Path,
+    slug: str,
+    repo_root: Path | None = None,
+    allow_yaml_frontmatter_rewrite: bool = False,
+    dry_run: bool = False,
+    max_picks: int = 0,
+    force: bool = False,
+    max_concurrency: int = 1,
+    max_per_host: int = DEFAULT_MAX_PER_HOST,
+    http_cache: HttpCache | None = None,
+    max_image_bytes: int = DEFAULT_MAX_IMAGE_BYTES,
+    policy: NetworkPolicy | None = None,
+    image_resolutions: ProductImageCache | None = None,
+    blob_store: ImageBlobStore | None = None,
+    image_variants: VariantSpec | None = None,
+    target_image_width: int | None = DEFAULT_TARGET_IMAGE_WIDTH,
+    deadline_seconds: float | None = None,
+    checkpoint: EnrichmentCheckpoint | None = None,
+    image_failures: ImageFailureCache | None = None,
+    stats: EnrichmentStats | None = None,
+    client: httpx.Client | None = None,
+) -> PickImageEnrichmentResult:
+    """Populate products[].image and download images under site/public.
+
+    Supports the repo’s preferred Astro post format where `products:` is a single-line JSON array.
+    If `allow_yaml_frontmatter_rewrite=True`, will also handle YAML-list products by rewriting the
+    whole frontmatter block (used for content_factory outputs).
+
+    `max_concurrency > 1` runs the asyncio engine (see `enrich_pick_images_for_markdown_async`).
+    `http_cache` enables conditional requests for product pages and images; with `force=True`
+    cached entries are revalidated (304s) rather than re-downloaded.
+    `policy` applies per-host rate limits, 429/503 backoff and a circuit breaker
+    (a default `NetworkPolicy` is used when omitted).
+    `image_resolutions` is consulted before any request: a product already resolved (by
+    catalog_key, ASIN or normalized URL) is linked/copied from its earlier download.
+    `blob_store` stores images content-addressed (one file per distinct image, shared by
+    every post that features it) instead of under images/picks/<slug>/.
+    `image_variants` re-encodes each picked image (in a process pool) into width-bounded,
+    metadata-free WebP variants recorded as products[].imageVariants/imageWidth/imageHeight,
+    plus a blurred preview as products[].imagePlaceholder.
+    `target_image_width` makes Amazon image selection size-aware: the smallest rendition
+    covering that width is downloaded instead of the hi-res original (None = original).
+    `deadline_seconds` bounds the wall-clock time spent on picks (runs on the asyncio engine):
+    picks unfinished at the deadline are cancelled and reported as errors, the rest are written,
+    and the result has `timed_out=True`. `checkpoint` records each finished pick as it lands, so
+    a rerun after a crash or timeout only fetches the picks that are still missing.
+    `image_failures` is a negative cache: products whose page had no usable image (or whose
+    image download was refused) are skipped until the entry expires or `force` is set.
+    Unreachable hosts (network errors, 429/5xx, open breaker) are never cached.
+    `stats` accumulates throughput counters and per-pick latencies across calls.
+    The sequential path borrows the process-wide pooled client (lib/http_client.py), so
+    consecutive posts reuse warm connections; `client` replaces it (e.g. to replay recorded
+    traffic, see lib/http_replay.py). The asyncio engine builds its own per event loop.
+    """
+
+    if max_concurrency > 1 or deadline_seconds is not None:
+        return asyncio.run(
+            enrich_pick_images_for_markdown_async(
+                markdown_path=markdown_path,
+                slug=slug,
+                repo_root=repo_root,
+                allow_yaml_frontmatter_rewrite=allow_yaml_frontmatter_rewrite,
+                dry_run=dry_run,
+                max_picks=max_picks,
+                force=force,
+                max_concurrency=max_concurrency,
+                max_per_host=max_per_host,
+                http_cache=http_cache,
+                max_image_bytes=max_image_bytes,
+                policy=policy,
+                image_resolutions=image_resolutions,
+                blob_store=blob_store,
+                image_variants=image_variants,
+                target_image_width=target_image_width,
+                deadline_seconds=deadline_seconds,
+                checkpoint=checkpoint,
+                image_failures=image_failures,
+                stats=stats,
+            )
+        )
+
+    with ExitStack() as stack:
+        variants = stack.enter_context(VariantEncoder(image_variants)) if image_variants else None
+        work = _prepare_post(
+            markdown_path=markdown_path,
+            slug=slug,
+            repo=repo_root or Path(__file__).resolve().parents[1],
+            allow_yaml_frontmatter_rewrite=allow_yaml_frontmatter_rewrite,
+            dry_run=dry_run,
+            max_picks=max_picks,
+            force=force,
+            http_cache=http_cache,
+            max_image_bytes=max_image_bytes,
+            stats=stats,
+            policy=policy or NetworkPolicy(),
+            image_resolutions=image_resolutions,
+            blob_store=blob_store,
+            variants=variants,
+            target_image_width=target_image_width,
+            checkpoint=checkpoint,
+            image_failures=image_failures,
+        )
+        if isinstance(work, PickImageEnrichmentResult):
+            return work
+
+        outcomes: list[_PickOutcome] = []
+        if work.jobs:
+            if client is None:
+                client = shared_client()
+            for job in work.jobs:
+                outcome = _enrich_pick(client=client, job=job, ctx=work.ctx)
+                work.completed(job, outcome)
+                outcomes.append(outcome)
+
+        work.restored = _attach_variants(ctx=work.ctx, outcomes=work.restored)
+        return work.finalize(_attach_variants(ctx=work.ctx, outcomes=outcomes))
+
+
+async def enrich_pick_images_for_markdown_async(
+    *,
+    markdown_path: Path,
+    slug: str,
+    repo_root: Path | None = None,
+    allow_yaml_frontmatter_rewrite: bool = False,
+    dry_run: bool = False,
+    max_picks: int = 0,
+    force: bool = False,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    max_per_host: int = DEFAULT_MAX_PER_HOST,
+    http_cache: HttpCache | None = None,
+    max_image_bytes: int = DEFAULT_MAX_IMAGE_BYTES,
+    policy: NetworkPolicy | None = None,
+    image_resolutions: ProductImageCache | None = None,
+    blob_store: ImageBlobStore | None = None,
+    image_variants: VariantSpec | None = None,
+    target_image_width: int | None = DEFAULT_TARGET_IMAGE_WIDTH,
+    deadline_seconds: float | None = None,
+    checkpoint: EnrichmentCheckpoint | None = None,
+    image_failures: ImageFailureCache | None = None,
+    stats: EnrichmentStats | None = None,
+    client: httpx.AsyncClient | None = None,
+) -> PickImageEnrichmentResult:
+    """Concurrent variant of `enrich_pick_images_for_markdown` built on `httpx.AsyncClient`.
+
+    Picks are fanned out under a global cap (`max_concurrency`) and a per-host cap
+    (`max_per_host`). Outcomes are applied in product order, so the frontmatter written
+    is identical to the sequential path. Pass `client` (see `lib.http_client.build_async_client`)
+    to share one connection pool between calls on the same event loop.
+    `deadline_seconds`, `checkpoint` and `image_failures` behave as in `enrich_pick_images_for_markdown`.
+    """
+
+    deadline = None if deadline_seconds is None else time.monotonic() + deadline_seconds
+    async with AsyncExitStack() as stack:
+        variants = stack.enter_context(VariantEncoder(image_variants)) if image_variants else None
+        work = _prepare_post(
+            markdown_path=markdown_path,
+            slug=slug,
+            repo=repo_root or Path(__file__).resolve().parents[1],
+            allow_yaml_frontmatter_rewrite=allow_yaml_frontmatter_rewrite,
+            dry_run=dry_run,
+            max_picks=max_picks,
+            force=force,
+            http_cache=http_cache,
+            max_image_bytes=max_image_bytes,
+            stats=stats,
+            policy=policy or NetworkPolicy(),
+            image_resolutions=image_resolutions,
+            blob_store=blob_store,
+            variants=variants,
+            target_image_width=target_image_width,
+            checkpoint=checkpoint,
+            image_failures=image_failures,
+        )
+        if isinstance(work, PickImageEnrichmentResult):
+            return work
+        if not work.jobs and not work.restored:
+            return work.finalize([])
+
+        limiter = _ConcurrencyLimiter(max_concurrency=max_concurrency, max_per_host=max_per_host)
+        if client is None:
+            client = await stack.enter_async_context(build_async_client())
+        return await _run_post_async(client=client, limiter=limiter, work=work, deadline=deadline)
+
+
+async def enrich_pick_images_for_posts_async(
+    *,
+    posts_dir: Path,
+    repo_root: Path | None = None,
+    slugs: list[str] | None = None,
+    allow_yaml_frontmatter_rewrite: bool = False,
+    dry_run: bool = False,
+    max_picks: int = 0,
+    force: bool = False,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    max_per_host: int = DEFAULT_MAX_PER_HOST,
+    http_cache: HttpCache | None = None,
+    max_image_bytes: int = DEFAULT_MAX_IMAGE_BYTES,
+    policy: NetworkPolicy | None = None,
+    image_resolutions: ProductImageCache | None = None,
+    blob_store: ImageBlobStore | None = None,
+    image_variants: VariantSpec | None = None,
+    target_image_width: int | None = DEFAULT_TARGET_IMAGE_WIDTH,
+    deadline_seconds: float | None = None,
+    checkpoint: EnrichmentCheckpoint | None = None,
+    image_failures: ImageFailureCache | None = None,
+    client: httpx.AsyncClient | None = None,
+) -> BatchPickImageEnrichmentResult:
+    """Site-wide backfill: every missing (or, with `force`, every) pick across `posts_dir`.
+
+    All posts' picks share one work queue, one concurrency limiter and one connection pool.
+    Each post's frontmatter is still written exactly once, as soon as its own picks finish.
+    Post slugs are the markdown file stems (`YYYY-MM-DD-slug`).
+    `deadline_seconds` is one budget for the whole batch; posts still in flight when it
+    expires are written with the picks that finished (`timed_out=True` on their results).
+    """
+
+    repo = repo_root or Path(__file__).resolve().parents[1]
+    stats = EnrichmentStats()
+    policy = policy or NetworkPolicy()
+    wanted = set(slugs) if slugs else None
+    deadline = None if deadline_seconds is None else time.monotonic() + deadline_seconds
+
+    results: dict[str, PickImageEnrichmentResult] = {}
+    works: dict[str, _PostWork] = {}
+    async with AsyncExitStack() as stack:
+        variants = stack.enter_context(VariantEncoder(image_variants)) if image_variants else None
+        for md_path in sorted(posts_dir.glob("*.md")):
+            slug = md_path.stem
+            if wanted is not None and slug not in wanted:
+                continue
+            work = _prepare_post(
+                markdown_path=md_path,
+                slug=slug,
+                repo=repo,
+                allow_yaml_frontmatter_rewrite=allow_yaml_frontmatter_rewrite,
+                dry_run=dry_run,
+                max_picks=max_picks,
+                force=force,
+                http_cache=http_cache,
+                max_image_bytes=max_image_bytes,
+                stats=stats,
+                policy=policy,
+                image_resolutions=image_resolutions,
+                blob_store=blob_store,
+                variants=variants,
+                target_image_width=target_image_width,
+                checkpoint=checkpoint,
+                image_failures=image_failures,
+            )
+            if isinstance(work, PickImageEnrichmentResult):
+                results[slug] = work
+            elif not work.jobs and not work.restored:
+                results[slug] = work.finalize([])
+            else:
+                works[slug] = work
+
+        t0 = time.perf_counter()
+        if works:
+            limiter = _ConcurrencyLimiter(max_concurrency=max_concurrency, max_per_host=max_per_host)
+            if client is None:
+                client = await stack.enter_async_context(build_async_client())
+            post_results = await asyncio.gather(
+                *(
+                    _run_post_async(client=client, limiter=limiter, work=w, deadline=deadline)
+                    for w in works.values()
+                )
+            )
+            results.update(zip(works.keys(), post_results))
+    stats.elapsed_seconds = time.perf_counter() - t0
+
+    return BatchPickImageEnrichmentResult(results=dict(sorted(results.items())), stats=stats)
+
+
+def build_pick_image_variants_for_markdown(
+    *,
+    markdown_path: Path,
+    encoder: VariantEncoder,
+    repo_root: Path | None = None,
+    allow_yaml_frontmatter_rewrite: bool = False,
+    force: bool = False,
+) -> PickImageEnrichmentResult:
+    """Backfill products[].imageVariants/imageWidth/imageHeight/imagePlaceholder for already-downloaded picks.
+
+    No network: only picks whose `image` is a local /images/picks/ file are encoded, and
+    picks that already list variants and a placeholder are skipped unless `force`.
+    """
+
+    post, err = _load_post_products(
+        markdown_path=markdown_path, allow_yaml_frontmatter_rewrite=allow_yaml_frontmatter_rewrite
+    )
+    if post is None:
+        return PickImageEnrichmentResult(updated=False, picks_updated=0, picks_skipped=0, errors=[str(err)])
+
+    public_dir = (repo_root or Path(__file__).resolve().parents[1]) / "site" / "public"
+    ctx = _EnrichContext(
+        slug=markdown_path.stem,
+        public_dir=public_dir,
+        public_picks_dir=public_dir / "images" / "picks" / markdown_path.stem,
+        dry_run=False,
+        variants=encoder,
+    )
+
+    outcomes: list[_PickOutcome] = []
+    picks_skipped = 0
+    for i, p in enumerate(post.products):
+        image = str(p.get("image") or "").strip()
+        path = public_dir / image.lstrip("/") if image.startswith("/images/picks/") else None
+        done = bool(p.get("imageVariants") and p.get("imagePlaceholder"))
+        if path is None or not path.is_file() or (done and not force):
+            picks_skipped += 1
+            continue
+        outcomes.append(_PickOutcome(index=i, image=image, path=path))
+
+    return _finalize_post(
+        markdown_path=markdown_path,
+        post=post,
+        outcomes=_attach_variants(ctx=ctx, outcomes=outcomes),
+        picks_skipped=picks_skipped,
+        allow_yaml_frontmatter_rewrite=allow_yaml_frontmatter_rewrite,
+        dry_run=False,
+    )
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TypedDict
+
+from lib.json_files import read_json_items, write_json_atomic
+from lib.product_image_cache import normalize_product_url
+
+
+# Long enough that routine hydrations stop re-fetching known-bad pages, short enough that a
+# retailer page fixed upstream is picked up again without manual intervention.
+DEFAULT_FAILURE_TTL_SECONDS = 7 * 24 * 60 * 60
+
+REASON_NO_IMAGE = "no_image"  # product page fetched, but no usable og/hero image in it
+REASON_DOWNLOAD_FAILED = "download_failed"  # image URL found, but the download failed or was rejected
+
+
+def default_pick_image_failures_path(repo_root: Path) -> Path:
+    return repo_root / ".cache" / "pick_image_failures.json"
+
+
+def iso_timestamp(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+class ImageFailure(TypedDict, total=False):
+    product_url: str
+    reason: str  # REASON_NO_IMAGE | REASON_DOWNLOAD_FAILED
+    detail: str  # the error reported for the pick
+    post: str  # post slug and pick of the latest failure, to find it in the content
+    pick_id: str
+    failures: int  # consecutive failed attempts
+    first_failed_at: float
+    failed_at: float
+
+
+class ImageFailureCache:
+    """
+    Negative cache for pick image enrichment, keyed by normalized product URL.
+
+    A product whose page had no extractable image (or whose image could not be downloaded)
+    is skipped by later runs until `ttl_seconds` after its latest failure. A successful
+    resolution removes the entry. `scripts/report_pick_image_failures.py` lists the entries
+    so the products can be fixed in the catalog.
+
+    Key behaviors:
+    - lookup(url): live (unexpired) failure for the product, or None
+    - record(url, ...) / forget(url): in memory
+    - save(): writes the file if anything changed since the last save
+    """
+
+    def __init__(self, *, path: Path, ttl_seconds: float = DEFAULT_FAILURE_TTL_SECONDS) -> None:
+        self._path = path
+        self._ttl_seconds = float(ttl_seconds)
+        self._items: dict[str, ImageFailure] | None = None
+        self._dirty = False
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def ttl_seconds(self) -> float:
+        return self._ttl_seconds
+
+    def load(self) -> dict[str, ImageFailure]:
+        """Loads entries once; a missing, empty or corrupt file is an empty cache."""
+        if self._items is not None:
+            return self._items
+
+        items: dict[str, ImageFailure] = read_json_items(self._path)  # type: ignore[assignment]
+        self._items = items
+        return items
+
+    def expires_at(self, entry: ImageFailure) -> float:
+        return float(entry.get("failed_at") or 0.0) + self._ttl_seconds
+
+    def is_expired(self, entry: ImageFailure, *, now: float | None = None) -> bool:
+        return self.expires_at(entry) <= (time.time() if now is None else now)
+
+    def lookup(self, product_url: str) -> ImageFailure | None:
+        entry = self.load().get(normalize_product_url(product_url))
+        if entry is None or self.is_expired(entry):
+            return None
+        return entry
+
+    def record(self, product_url: str, *, reason: str, detail: str = "", post: str = "", pick_id: str = "") -> None:
+        key = normalize_product_url(product_url)
+        now = time.time()
+        items = self.load()
+        prev = items.get(key) or {}
+        items[key] = {
+            "product_url": product_url,
+            "reason": reason,
+            "detail": detail,
+            "post": post,
+            "pick_id": pick_id,
+            "failures": int(prev.get("failures") or 0) + 1,
+            "first_failed_at": float(prev.get("first_failed_at") or now),
+            "failed_at": now,
+        }
+        self._dirty = True
+
+    def forget(self, product_url: str) -> None:
+        if self.load().pop(normalize_product_url(product_url), None) is not None:
+            self._dirty = True
+
+    def prune_expired(self) -> int:
+        items = self.load()
+        now = time.time()
+        expired = [k for k, v in items.items() if self.is_expired(v, now=now)]
+        for key in expired:
+            del items[key]
+        self._dirty = self._dirty or bool(expired)
+        return len(expired)
+
+    def save(self) -> None:
+        if not self._dirty or self._items is None:
+            return
+        data = {"version": 1, "updated_at": iso_timestamp(time.time()), "items": self._items}
+        write_json_atomic(self._path, data)
+        self._dirty = False
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from lib.image_placeholders import lqip_data_uri
+
+try:
+    from PIL import Image, ImageOps  # type: ignore
+except Exception:  # pragma: no cover
+    Image = None  # type: ignore
+    ImageOps = None  # type: ignore
+
+
+# Pick thumbnails render at 96 CSS px in ProductCard; larger widths serve zoomed/hi-dpi layouts.
+DEFAULT_VARIANT_WIDTHS = (160, 320, 640)
+DEFAULT_VARIANT_QUALITY = 80
+
+
+@dataclass(frozen=True)
+class VariantSpec:
+    widths: tuple[int, ...] = DEFAULT_VARIANT_WIDTHS
+    quality: int = DEFAULT_VARIANT_QUALITY
+
+
+@dataclass(frozen=True)
+class ImageVariant:
+    path: Path
+    width: int
+    height: int
+
+
+@dataclass(frozen=True)
+class EncodedImage:
+    """Intrinsic size of the source image plus its WebP variants (ascending width) and blurred preview."""
+
+    width: int
+    height: int
+    variants: tuple[ImageVariant, ...]
+    placeholder: str | None = None  # tiny WebP data URI (see lib/image_placeholders.py)
+
+
+def variant_path(src: Path, width: int) -> Path:
+    return src.with_name(f"{src.stem}.w{int(width)}.webp")
+
+
+def _target_widths(source_width: int, widths: tuple[int, ...]) -> list[int]:
+    # Never upscale; a source smaller than every bound still gets one re-encoded variant.
+    out = sorted({int(w) for w in widths if 0 < int(w) < source_width})
+    max_bound = max((int(w) for w in widths), default=source_width)
+    if source_width <= max_bound:
+        out.append(source_width)
+    return out
+
+
+def _is_current(path: Path, src: Path) -> bool:
+    try:
+        return path.stat().st_mtime_ns >= src.stat().st_mtime_ns
+    except OSError:
+        return False
+
+
+def encode_variants(src: Path, spec: VariantSpec) -> EncodedImage:
+    """Decode `src` once and write metadata-free, width-bounded WebP variants next to it.
+
+    Variants already newer than the source are reused; the low-quality preview is always
+    recomputed from the decoded image (it is tiny). Runs in worker processes, so it
+    only takes and returns picklable values.
+    """
+
+    if Image is None or ImageOps is None:
+        raise RuntimeError("Pillow is required to build pick image variants")
+
+    with Image.open(src) as raw:
+        im = ImageOps.exif_transpose(raw)
+        width, height = im.size
+        targets = _target_widths(width, spec.widths)
+
+        variants: list[ImageVariant] = []
+        pending: list[tuple[int, int, Path]] = []
+        for w in targets:
+            h = max(1, round(height * w / width))
+            out = variant_path(src, w)
+            variants.append(ImageVariant(path=out, width=w, height=h))
+            if not _is_current(out, src):
+                pending.append((w, h, out))
+
+        if pending:
+            if im.mode not in ("RGB", "RGBA"):
+                im = im.convert("RGBA" if "A" in im.getbands() or "transparency" in im.info else "RGB")
+            for w, h, out in pending:
+                frame = im if (w, h) == im.size else im.resize((w, h), Image.Resampling.LANCZOS)
+                # No exif/icc_profile/xmp passed through: variants carry pixels only.
+                tmp = out.with_name(f".{out.name}.{os.getpid()}.part")
+                frame.save(str(tmp), format="WEBP", quality=int(spec.quality), method=6)
+                tmp.replace(out)
+
+        placeholder = lqip_data_uri(im)
+
+    return EncodedImage(width=width, height=height, variants=tuple(variants), placeholder=placeholder)
+
+
+class VariantEncoder:
+    """
+    Process pool for `encode_variants`.
+
+    The pool starts on first use, so runs that download nothing never spawn workers.
+    Use as a context manager (or call `close()`) to shut the workers down.
+    """
+
+    def __init__(self, spec: VariantSpec | None = None, *, max_workers: int | None = None) -> None:
+        self._spec = spec or VariantSpec()
+        self._max_workers = max_workers
+        self._pool: ProcessPoolExecutor | None = None
+
+    @property
+    def spec(self) -> VariantSpec:
+        return self._spec
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self._max_workers)
+        return self._pool
+
+    def submit(self, src: Path) -> "Future[EncodedImage]":
+        return self._executor().submit(encode_variants, src, self._spec)
+
+    async def encode_async(self, src: Path) -> EncodedImage:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor(), encode_variants, src, self._spec)
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self) -> "VariantEncoder":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
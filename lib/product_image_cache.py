@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, TypedDict
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+from lib.json_files import read_json_items, write_json_atomic
+
+
+RE_ASIN_IN_URL = re.compile(r"/(?:dp|gp/product|gp/aw/d|o/ASIN)/([A-Z0-9]{10})(?=[/?#]|$)", re.IGNORECASE)
+RE_ASIN = re.compile(r"^[A-Z0-9]{10}$")
+
+# Query parameters that only carry attribution/tracking and never change the product.
+_TRACKING_PARAMS = frozenset({"tag", "ref", "ref_", "psc", "th", "linkcode", "linkid", "camp", "creative"})
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+def default_product_image_cache_path(repo_root: Path) -> Path:
+    return repo_root / ".cache" / "product_images.json"
+
+
+def asin_from_url(url: str) -> str | None:
+    m = RE_ASIN_IN_URL.search(url or "")
+    return m.group(1).upper() if m else None
+
+
+def normalize_product_url(url: str) -> str:
+    """Canonical form of a product URL: lowercase host without `www.`, no fragment,
+    no trailing slash, and no affiliate/tracking query parameters."""
+
+    parsed = urlparse(str(url or "").strip())
+    host = (parsed.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = [
+        (k, v)
+        for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+        if k.lower() not in _TRACKING_PARAMS and not k.lower().startswith("utm_")
+    ]
+    path = parsed.path.rstrip("/")
+    return urlunparse(("https", host, path, "", urlencode(sorted(query)), ""))
+
+
+def resolution_keys(product: dict[str, Any]) -> list[str]:
+    """Cache keys for a product, most specific first: catalog_key, ASIN, normalized URL."""
+
+    keys: list[str] = []
+    catalog_key = str(product.get("catalog_key") or "").strip()
+    if catalog_key:
+        keys.append(f"catalog:{catalog_key}")
+
+    url = str(product.get("url") or "").strip()
+    asin = str(product.get("asin") or "").strip().upper()
+    if not RE_ASIN.match(asin):
+        asin = asin_from_url(url) or ""
+    if asin:
+        keys.append(f"asin:{asin}")
+
+    if url:
+        keys.append(f"url:{normalize_product_url(url)}")
+    return keys
+
+
+class ImageResolution(TypedDict, total=False):
+    image_url: str
+    local_file: str  # public path, e.g. /images/picks/<slug>/<pick_id>.jpg
+    product_url: str
+    resolved_at: str
+
+
+class ProductImageCacheFile(TypedDict):
+    version: int
+    updated_at: str
+    items: dict[str, ImageResolution]
+
+
+class ProductImageCache:
+    """
+    Persistent product -> image resolution cache, the image-side companion of ProductCatalog.
+
+    Each resolved product is stored under every key it is known by (`resolution_keys`), so a
+    product that reappears in another post with a catalog_key, the same ASIN, or the same
+    URL modulo tracking parameters resolves without fetching the retailer page again.
+
+    Key behaviors:
+    - lookup(keys): first entry matching any key, or None
+    - record(keys, resolution): stores the entry under all keys (in memory)
+    - save(): writes the file if anything was recorded since the last save
+    """
+
+    def __init__(self, *, path: Path) -> None:
+        self._path = path
+        self._items: dict[str, ImageResolution] | None = None
+        self._dirty = False
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def load(self) -> dict[str, ImageResolution]:
+        """Loads entries once; a missing, empty or corrupt file is an empty cache."""
+        if self._items is not None:
+            return self._items
+
+        items: dict[str, ImageResolution] = read_json_items(self._path)  # type: ignore[assignment]
+        self._items = items
+        return items
+
+    def lookup(self, keys: list[str] | tuple[str, ...]) -> ImageResolution | None:
+        items = self.load()
+        for key in keys:
+            entry = items.get(key)
+            if entry and entry.get("image_url"):
+                return entry
+        return None
+
+    def record(self, keys: list[str] | tuple[str, ...], resolution: ImageResolution) -> None:
+        if not keys:
+            return
+        entry: ImageResolution = {**resolution, "resolved_at": _utc_now_iso()}
+        items = self.load()
+        for key in keys:
+            items[key] = entry
+        self._dirty = True
+
+    def save(self) -> None:
+        if not self._dirty or self._items is None:
+            return
+        data: ProductImageCacheFile = {"version": 1, "updated_at": _utc_now_iso(), "items": self._items}
+        write_json_atomic(self._path, data)
+        self._dirty = False
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import httpx
+
+from lib.http_replay import Cassette, FaultInjector
+
+
+# Header carrying the original (retailer) URL from the routing transports to the server.
+ORIGIN_URL_HEADER = "x-standin-url"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_StandInHTTPServer"
+    protocol_version = "HTTP/1.1"  # keep-alive, so client connection pooling is exercised
+    disable_nagle_algorithm = True  # as production servers do; otherwise body tails wait on delayed ACKs
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - stdlib signature
+        return
+
+    def do_GET(self) -> None:  # noqa: N802 - stdlib naming
+        standin = self.server.standin
+        url = self.headers.get(ORIGIN_URL_HEADER) or _url_from_path(self.path)
+        delay, fault = standin.faults.draw()
+        if delay:
+            time.sleep(delay)
+        standin._count()
+
+        if fault == "reset":
+            self.close_connection = True
+            return
+        if fault == "503":
+            self._send(503, [("retry-after", "0")], b"")
+            return
+
+        entry = standin.cassette.lookup("GET", url)
+        if entry is None:
+            self._send(404, [("content-type", "text/plain")], b"not in cassette\n")
+            return
+        etag = entry.header("etag")
+        if etag and self.headers.get("if-none-match") == etag:
+            self._send(304, list(entry.headers), b"", length=False)
+            return
+        self._send(entry.status, list(entry.headers), entry.body)
+
+    def _send(self, status: int, headers: list[tuple[str, str]], body: bytes, *, length: bool = True) -> None:
+        self.send_response(status)
+        for k, v in headers:
+            self.send_header(k, v)
+        if length:
+            self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+
+def _url_from_path(path: str) -> str:
+    # Manual access without the routing header: /https/www.example.com/p/1 -> https://www.example.com/p/1
+    scheme, _, rest = path.lstrip("/").partition("/")
+    return f"{scheme}://{rest}"
+
+
+class _StandInHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, addr: tuple[str, int], standin: "RetailerStandIn") -> None:
+        super().__init__(addr, _Handler)
+        self.standin = standin
+
+    def handle_error(self, request: Any, client_address: Any) -> None:
+        # Clients hang up mid-body on purpose (the page scanner stops at the first image).
+        exc = sys.exc_info()[1]
+        if not isinstance(exc, (ConnectionResetError, BrokenPipeError)):
+            super().handle_error(request, client_address)
+
+
+class RetailerStandIn:
+    """
+    Local HTTP server replaying a `Cassette` in place of live retailers.
+
+    Clients keep using the real retailer URLs: `transport()` / `async_transport()` route
+    every request to this server (original URL in the `x-standin-url` header), so URL-based
+    logic (Amazon detection, rendition rewriting, redirects) behaves as in production while
+    the requests go over real local sockets. Latency and 503/reset failures are injected
+    per request by `faults`.
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        *,
+        faults: FaultInjector | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.cassette = cassette
+        self.faults = faults or FaultInjector()
+        self._addr = (host, int(port))
+        self._server: _StandInHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self.requests_served = 0
+
+    def _count(self) -> None:
+        with self._lock:
+            self.requests_served += 1
+
+    @property
+    def base_url(self) -> str:
+        if self._server is None:
+            raise RuntimeError("stand-in server is not running")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "RetailerStandIn":
+        if self._server is None:
+            self._server = _StandInHTTPServer(self._addr, self)
+            self._thread = threading.Thread(target=self._server.serve_forever, name="retailer-standin", daemon=True)
+            self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._server = _StandInHTTPServer(self._addr, self)
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "RetailerStandIn":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def transport(self, **kwargs: Any) -> "StandInTransport":
+        return StandInTransport(self.base_url, inner=httpx.HTTPTransport(**kwargs))
+
+    def async_transport(self, **kwargs: Any) -> "AsyncStandInTransport":
+        return AsyncStandInTransport(self.base_url, inner=httpx.AsyncHTTPTransport(**kwargs))
+
+
+def _routed(request: httpx.Request, base_url: str) -> httpx.Request:
+    headers = httpx.Headers(request.headers)
+    headers[ORIGIN_URL_HEADER] = str(request.url)
+    headers.pop("host", None)
+    return httpx.Request(request.method, base_url + "/", headers=headers, extensions=request.extensions)
+
+
+class StandInTransport(httpx.BaseTransport):
+    """Sends every request to a `RetailerStandIn`; responses keep the original request URL."""
+
+    def __init__(self, base_url: str, *, inner: httpx.BaseTransport | None = None) -> None:
+        self._base_url = base_url.rstrip("/")
+        self._inner = inner or httpx.HTTPTransport()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        return self._inner.handle_request(_routed(request, self._base_url))
+
+    def close(self) -> None:
+        self._inner.close()
+
+
+class AsyncStandInTransport(httpx.AsyncBaseTransport):
+    def __init__(self, base_url: str, *, inner: httpx.AsyncBaseTransport | None = None) -> None:
+        self._base_url = base_url.rstrip("/")
+        self._inner = inner or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._inner.handle_async_request(_routed(request, self._base_url))
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 import re
 from dataclasses import dataclass
 from typing import Any, Dict, Tuple
@@ -56,3 +57,26 @@ def rebuild_markdown_with_frontmatter(frontmatter: Dict[str, Any], body: str) ->
         width=10_000,
     ).strip()
     return f"---\n{fm_text}\n---\n\n{body.lstrip()}"
+
+
+def set_frontmatter_scalars(md_text: str, updates: Dict[str, Any]) -> str:
+    """
+    Set top-level scalar keys, replacing existing values; other lines are kept as they are
+    (no YAML re-dump). Values are written JSON-encoded; frontmatter is created if absent.
+    """
+    text = (md_text or "").replace("\r\n", "\n").replace("\r", "\n")
+    end = text.find("\n---\n", 4) if text.startswith("---\n") else -1
+    if end == -1:
+        lines, rest = [], "\n---\n\n" + text.lstrip("\n")
+    else:
+        lines, rest = text[4:end].split("\n"), text[end:]
+    inserted = 0
+    for k, v in updates.items():
+        line = f"{k}: {json.dumps(v, ensure_ascii=False)}"
+        at = next((i for i, existing in enumerate(lines) if existing.startswith(f"{k}:")), None)
+        if at is None:
+            lines.insert(inserted, line)
+            inserted += 1
+        else:
+            lines[at] = line
+    return "---\n" + "\n".join(lines) + rest
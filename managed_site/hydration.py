@@ -3,6 +3,7 @@ from __future__ import annotations
 import json
 import os
 from dataclasses import dataclass
+from functools import partial
 from datetime import date
 from pathlib import Path
 from typing import Any
@@ -10,8 +11,23 @@ from typing import Any
 import yaml
 
 from lib.validation.markdown_frontmatter import parse_markdown_frontmatter, rebuild_markdown_with_frontmatter
-from lib.pick_image_enrichment import enrich_pick_images_for_markdown
-from pipeline.hero_self_heal import ensure_hero_assets_exist
+from lib.http_cache import DEFAULT_TTL_SECONDS, HttpCache, default_http_cache_dir
+from lib.enrichment_checkpoint import EnrichmentCheckpoint, default_checkpoint_dir
+from lib.file_digests import FileDigestIndex, default_file_digest_index_path
+from lib.generated_image_cache import GeneratedImageCache, default_generated_image_cache_dir
+from lib.hero_jobs import HeroJobQueue, default_hero_job_dir
+from lib.image_store import default_pick_image_store
+from lib.pick_image_enrichment import IMAGE_DERIVED_KEYS, enrich_pick_images_for_markdown
+from lib.pick_image_failures import DEFAULT_FAILURE_TTL_SECONDS, ImageFailureCache, default_pick_image_failures_path
+from lib.pick_image_variants import VariantSpec
+from lib.product_image_cache import ProductImageCache, default_product_image_cache_path
+from pipeline.hero_self_heal import (
+    HERO_HEALTHY,
+    audit_hero_assets,
+    ensure_hero_assets_exist,
+    hero_image_placeholder,
+    set_hero_image_fields,
+)
 
 
 @dataclass(frozen=True)
@@ -23,6 +39,7 @@ class HydrationResult:
     pick_images_updated: int
     pick_images_skipped: int
     pick_image_errors: list[str]
+    hero_job_enqueued: bool = False
 
 
 def _read_json(path: Path) -> dict[str, Any]:
@@ -75,6 +92,10 @@ def _inject_missing_frontmatter_scalars(md: str, updates: dict[str, str]) -> str
 def _preserve_existing_product_images(*, existing_md: str, new_md: str) -> str:
     """When overwriting a post, preserve products[].image values if present.
 
+    The keys derived from the image (dimensions, variants, placeholder; see IMAGE_DERIVED_KEYS)
+    are carried over with it: enrichment skips picks that already have an image, so dropping
+    them here would lose them for good.
+
     This prevents re-running hydration from wiping managed-site enrichments.
     """
 
@@ -87,14 +108,16 @@ def _preserve_existing_product_images(*, existing_md: str, new_md: str) -> str:
     if not isinstance(existing_products, list) or not isinstance(incoming_products, list):
         return new_md
 
-    image_by_pick_id: dict[str, str] = {}
+    image_by_pick_id: dict[str, dict[str, Any]] = {}
     for p in existing_products:
         if not isinstance(p, dict):
             continue
         pid = str(p.get("pick_id") or "").strip()
         img = p.get("image")
         if pid and isinstance(img, str) and img.strip():
-            image_by_pick_id[pid] = img.strip()
+            preserved = {k: p[k] for k in IMAGE_DERIVED_KEYS if k in p}
+            preserved["image"] = img.strip()
+            image_by_pick_id[pid] = preserved
 
     if not image_by_pick_id:
         return new_md
@@ -104,16 +127,19 @@ def _preserve_existing_product_images(*, existing_md: str, new_md: str) -> str:
         if not isinstance(p, dict):
             continue
         pid = str(p.get("pick_id") or "").strip()
-        if not pid:
+        preserved = image_by_pick_id.get(pid) if pid else None
+        if not preserved:
             continue
 
         img = p.get("image")
         if isinstance(img, str) and img.strip():
-            continue
-
-        preserved = image_by_pick_id.get(pid)
-        if preserved:
-            p["image"] = preserved
+            if img.strip() != preserved["image"]:
+                continue  # a different image: its derived keys are for the package to provide
+            missing = {k: v for k, v in preserved.items() if k not in p}
+        else:
+            missing = preserved
+        if missing:
+            p.update(missing)
             changed = True
 
     if not changed:
@@ -123,6 +149,70 @@ def _preserve_existing_product_images(*, existing_md: str, new_md: str) -> str:
     return rebuild_markdown_with_frontmatter(incoming.data, incoming.body)
 
 
+def post_categories(post_path: Path) -> list[str]:
+    """The post's frontmatter `categories`, in order (empty if absent)."""
+    cats = _extract_frontmatter(post_path.read_text(encoding="utf-8")).get("categories")
+    return [str(c) for c in cats if str(c).strip()] if isinstance(cats, list) else []
+
+
+def regenerate_hero_image(**kwargs: Any) -> Any:
+    """`pipeline.image_step.generate_hero_image`, imported on call: it loads the OpenAI client."""
+    from pipeline.image_step import generate_hero_image
+
+    return generate_hero_image(**kwargs)
+
+
+def rederive_hero_image(**kwargs: Any) -> Any:
+    """`pipeline.image_step.rebuild_hero_derivatives`, imported on call (only damaged hero sets need it)."""
+    from pipeline.image_step import rebuild_hero_derivatives
+
+    return rebuild_hero_derivatives(**kwargs)
+
+
+def hero_regen_kwargs(
+    *,
+    post_path: Path,
+    post_slug: str,
+    public_dir: Path,
+    encoder_profile: str | None = None,
+    image_cache: GeneratedImageCache | None = None,
+) -> dict[str, Any]:
+    """`generate_hero_image` arguments for a post, taken from its frontmatter."""
+
+    # Minimal inputs for prompt quality; safe fallbacks.
+    fm = _extract_frontmatter(post_path.read_text(encoding="utf-8"))
+    title = str(fm.get("title") or post_slug)
+    category = None
+    cats = fm.get("categories")
+    if isinstance(cats, list) and cats:
+        category = str(cats[0])
+
+    # Use picks bodies if present.
+    pick_snippets: list[str] = []
+    picks = fm.get("picks")
+    if isinstance(picks, list):
+        for p in picks[:8]:
+            if isinstance(p, dict):
+                body = str(p.get("body") or "").strip()
+                if body:
+                    pick_snippets.append(body[:240])
+
+    if not pick_snippets:
+        pick_snippets = [title]
+
+    return {
+        "slug": post_slug,
+        "category": category,
+        "title": title,
+        "intro": "",
+        "picks": pick_snippets,
+        "alternatives": None,
+        "public_dir": public_dir,
+        "encoder_profile": encoder_profile,
+        "image_cache": image_cache,
+    }
+
+
 def hydrate_blog_post_from_package(
     *,
     repo_root: Path,
@@ -131,6 +221,16 @@ def hydrate_blog_post_from_package(
     enrich_pick_images: bool = True,
     dry_run: bool = False,
     regen_hero_if_possible: bool = True,
+    pick_image_concurrency: int = 1,
+    http_cache_ttl_seconds: float | None = DEFAULT_TTL_SECONDS,
+    reuse_resolved_pick_images: bool = True,
+    content_addressed_pick_images: bool = True,
+    pick_image_variants: bool = True,
+    pick_image_deadline_seconds: float | None = None,
+    retry_failed_pick_images: bool = False,
+    hero_encoder_profile: str | None = None,
+    reuse_generated_hero_images: bool = True,
+    defer_hero_generation: bool = False,
 ) -> HydrationResult:
     """Apply a Content Package v1 into the managed site's Astro structure.
 
@@ -141,6 +241,26 @@ def hydrate_blog_post_from_package(
       - ensure hero assets exist (regenerates if OPENAI_API_KEY is set; otherwise uses placeholder)
 
     `dry_run` skips networked pick-image downloads and hero regen, but will still write files.
+    `pick_image_concurrency > 1` fetches pick images concurrently (asyncio engine).
+    `http_cache_ttl_seconds` controls the on-disk retailer response cache (`.cache/http`);
+    None disables it, 0 always revalidates.
+    `reuse_resolved_pick_images` reuses images of products already resolved for other posts
+    (`.cache/product_images.json`) instead of fetching their retailer pages again.
+    `content_addressed_pick_images` stores pick images once per distinct image under
+    images/picks/_blobs/ rather than per post under images/picks/<post_slug>/.
+    `pick_image_variants` writes responsive WebP variants (products[].imageVariants) for srcset
+    and a blurred preview (products[].imagePlaceholder).
+    The hero's preview and size are written as heroImagePlaceholder/heroImageWidth/heroImageHeight.
+    `pick_image_deadline_seconds` caps time spent on pick images; picks not done by then are
+    reported as errors and picked up by the next run (progress is checkpointed in `.cache/enrichment`).
+    Products whose page recently yielded no usable image are skipped (`.cache/pick_image_failures.json`,
+    see scripts/report_pick_image_failures.py) unless `retry_failed_pick_images` is set.
+    `hero_encoder_profile` names the hero encoding settings (fast, balanced, max-compression;
+    see `pipeline.hero_profiles.HERO_ENCODER_PROFILES`).
+    `reuse_generated_hero_images` reuses an image already generated for the same prompt
+    (`.cache/generated_images`) instead of paying for a new one.
+    `defer_hero_generation` installs the placeholder hero and queues the generation
+    (`.cache/hero_jobs`) instead of waiting for it; scripts/run_hero_jobs.py swaps the real hero in later.
     """
 
     manifest_path = package_dir / "manifest.json"
@@ -185,11 +305,29 @@ def hydrate_blog_post_from_package(
     pick_errors: list[str] = []
 
     if enrich_pick_images and not dry_run:
+        http_cache = None
+        if http_cache_ttl_seconds is not None:
+            http_cache = HttpCache(root=default_http_cache_dir(repo_root), ttl_seconds=http_cache_ttl_seconds)
+        image_resolutions = None
+        if reuse_resolved_pick_images:
+            image_resolutions = ProductImageCache(path=default_product_image_cache_path(repo_root))
+
         res = enrich_pick_images_for_markdown(
             markdown_path=post_path,
             slug=post_slug,
             repo_root=repo_root,
             allow_yaml_frontmatter_rewrite=True,
+            max_concurrency=pick_image_concurrency,
+            http_cache=http_cache,
+            image_resolutions=image_resolutions,
+            blob_store=default_pick_image_store(repo_root) if content_addressed_pick_images else None,
+            image_variants=VariantSpec() if pick_image_variants else None,
+            deadline_seconds=pick_image_deadline_seconds,
+            checkpoint=EnrichmentCheckpoint(root=default_checkpoint_dir(repo_root)),
+            image_failures=ImageFailureCache(
+                path=default_pick_image_failures_path(repo_root),
+                ttl_seconds=0.0 if retry_failed_pick_images else DEFAULT_FAILURE_TTL_SECONDS,
+            ),
         )
         pick_updated = res.picks_updated
         pick_skipped = res.picks_skipped
@@ -200,6 +338,7 @@ def hydrate_blog_post_from_package(
     public_dir.mkdir(parents=True, exist_ok=True)
 
     placeholder_url = "/images/placeholder-hero.webp"
+    digest_index = FileDigestIndex(path=default_file_digest_index_path(repo_root))
 
     # Only attempt regen if we have an API key and caller allows it.
     should_regen = (
@@ -208,45 +347,29 @@ def hydrate_blog_post_from_package(
         and not dry_run
     )
 
-    if should_regen:
-        # Lazy-import only if actually needed.
-        from pipeline.image_step import generate_hero_image
-
-        # Minimal inputs for prompt quality; safe fallbacks.
-        fm = _extract_frontmatter(post_path.read_text(encoding="utf-8"))
-        title = str(fm.get("title") or post_slug)
-        category = None
-        cats = fm.get("categories")
-        if isinstance(cats, list) and cats:
-            category = str(cats[0])
-
-        # Use picks bodies if present.
-        pick_snippets: list[str] = []
-        picks = fm.get("picks")
-        if isinstance(picks, list):
-            for p in picks[:8]:
-                if isinstance(p, dict):
-                    body = str(p.get("body") or "").strip()
-                    if body:
-                        pick_snippets.append(body[:240])
-
-        if not pick_snippets:
-            pick_snippets = [title]
+    rederive = partial(rederive_hero_image, encoder_profile=hero_encoder_profile)
 
+    hero_job_enqueued = False
+    if should_regen and not defer_hero_generation:
         hero_paths_obj = ensure_hero_assets_exist(
             public_dir=public_dir,
             slug=post_slug,
             placeholder_url=placeholder_url,
-            regen_fn=generate_hero_image,
-            regen_kwargs={
-                "slug": post_slug,
-                "category": category,
-                "title": title,
-                "intro": "",
-                "picks": pick_snippets,
-                "alternatives": None,
-                "public_dir": public_dir,
-            },
+            regen_fn=regenerate_hero_image,
+            regen_kwargs=hero_regen_kwargs(
+                post_path=post_path,
+                post_slug=post_slug,
+                public_dir=public_dir,
+                encoder_profile=hero_encoder_profile,
+                image_cache=(
+                    GeneratedImageCache(root=default_generated_image_cache_dir(repo_root))
+                    if reuse_generated_hero_images
+                    else None
+                ),
+            ),
+            digest_index=digest_index,
+            rederive_fn=rederive,
+            categories=post_categories(post_path),
         )
     else:
         hero_paths_obj = ensure_hero_assets_exist(
@@ -255,7 +378,22 @@ def hydrate_blog_post_from_package(
             placeholder_url=placeholder_url,
             regen_fn=None,
             regen_kwargs=None,
+            digest_index=digest_index,
+            rederive_fn=rederive,
+            categories=post_categories(post_path),
         )
+        if should_regen:
+            audit = audit_hero_assets(
+                public_dir=public_dir, slug=post_slug, placeholder_url=placeholder_url, digest_index=digest_index
+            )
+            if audit.status != HERO_HEALTHY:
+                HeroJobQueue(root=default_hero_job_dir(repo_root)).enqueue(
+                    post_slug,
+                    encoder_profile=hero_encoder_profile,
+                    reuse_generated_images=reuse_generated_hero_images,
+                )
+                hero_job_enqueued = True
+    digest_index.save()
 
     # Inject hero keys if missing.
     hero_updates = {
@@ -269,6 +407,11 @@ def hydrate_blog_post_from_package(
     md2 = _inject_missing_frontmatter_scalars(post_path.read_text(encoding="utf-8"), hero_updates)
     post_path.write_text(md2, encoding="utf-8")
 
+    # Preview and intrinsic size of whatever hero is now in place (generated, stock or placeholder).
+    hero_placeholder = hero_image_placeholder(public_dir=public_dir, slug=post_slug)
+    if hero_placeholder is not None:
+        set_hero_image_fields(post_path, hero_placeholder)
+
     return HydrationResult(
         post_slug=post_slug,
         post_path=post_path,
@@ -282,4 +425,5 @@ def hydrate_blog_post_from_package(
         pick_images_updated=pick_updated,
         pick_images_skipped=pick_skipped,
         pick_image_errors=pick_errors,
+        hero_job_enqueued=hero_job_enqueued,
     )
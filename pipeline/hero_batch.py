@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+from openai import AsyncOpenAI
+
+from lib.generated_image_cache import GeneratedImageCache, generated_image_key
+from lib.hero_jobs import HeroJob, HeroJobQueue
+from lib.net_policy import TokenBucket
+from managed_site.hydration import hero_regen_kwargs
+from pipeline.hero_self_heal import HERO_HEALTHY, audit_hero_assets, set_hero_image_fields
+from pipeline.image_step import (
+    DEFAULT_ENCODE_WORKERS,
+    HERO_SOURCE_DIMENSIONS,
+    Image,
+    _build_prompt,
+    _generate_square_image_bytes_async,
+    _image_api_key,
+    _image_model,
+    _write_hero_set,
+    hero_encoder_profile,
+)
+
+
+# In-flight image API requests. Generation takes seconds per image, so a handful in
+# parallel already divides a backfill's wall time without tripping rate limits.
+DEFAULT_HERO_CONCURRENCY = 4
+
+HERO_FROM_API = "api"
+HERO_FROM_CACHE = "cache"
+
+
+@dataclass(frozen=True)
+class HeroBatchItem:
+    slug: str
+    ok: bool
+    source: str = ""  # HERO_FROM_API or HERO_FROM_CACHE when ok
+    error: str | None = None
+    seconds: float = 0.0
+
+
+@dataclass(frozen=True)
+class HeroBatchResult:
+    items: tuple[HeroBatchItem, ...]
+    elapsed_seconds: float
+    api_requests: int
+
+    @property
+    def generated(self) -> int:
+        return sum(1 for i in self.items if i.ok)
+
+    @property
+    def failed(self) -> int:
+        return sum(1 for i in self.items if not i.ok)
+
+    @property
+    def heroes_per_second(self) -> float:
+        return self.generated / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+
+async def generate_hero_images_async(
+    *,
+    slugs: Iterable[str],
+    posts_dir: Path,
+    public_dir: Path,
+    client: AsyncOpenAI | None = None,
+    concurrency: int = DEFAULT_HERO_CONCURRENCY,
+    requests_per_minute: float | None = None,
+    encode_workers: int | None = None,
+    encoder_profile: str | None = None,
+    image_cache: GeneratedImageCache | None = None,
+    model: str | None = None,
+) -> HeroBatchResult:
+    """
+    Generate heroes for many posts at once.
+
+    Prompts are built from each post's frontmatter (as hydration does), image API calls run
+    concurrently on one `AsyncOpenAI` client under `concurrency`, and their starts are paced
+    to `requests_per_minute` (None = unpaced). Decoding and WebP encoding run on a shared
+    pool of `encode_workers` threads, one slug per worker, so encoding overlaps with the
+    requests still in flight. Images already in `image_cache` skip the API entirely.
+    Each post's heroImagePlaceholder/Width/Height frontmatter is updated for its new hero.
+
+    Failures are per slug (reported in the result); the rest of the batch carries on.
+    Without `client`, one is created from OPENAI_API_KEY when the first uncached image is needed.
+    """
+
+    if Image is None:
+        raise RuntimeError("Pillow is required for hero image generation")
+    profile = hero_encoder_profile(encoder_profile)
+    m = _image_model(model)
+    limiter = asyncio.Semaphore(max(1, int(concurrency)))
+    pacer = TokenBucket(rate=requests_per_minute / 60.0, burst=1) if requests_per_minute else None
+    own_client: AsyncOpenAI | None = None
+    api_requests = 0
+    loop = asyncio.get_running_loop()
+
+    def api_client() -> AsyncOpenAI:
+        nonlocal own_client
+        if client is not None:
+            return client
+        if own_client is None:
+            own_client = AsyncOpenAI(api_key=_image_api_key())
+        return own_client
+
+    async def one(slug: str, pool: ThreadPoolExecutor) -> HeroBatchItem:
+        nonlocal api_requests
+        t0 = time.perf_counter()
+        try:
+            kwargs = hero_regen_kwargs(post_path=posts_dir / f"{slug}.md", post_slug=slug, public_dir=public_dir)
+            prompt = _build_prompt(title=kwargs["title"], category=kwargs["category"], picks=kwargs["picks"])
+            key = generated_image_key(prompt=prompt, model=m, size=HERO_SOURCE_DIMENSIONS)
+            raw = image_cache.get(key) if image_cache is not None else None
+            source = HERO_FROM_CACHE
+            if raw is None:
+                source = HERO_FROM_API
+                async with limiter:
+                    if pacer is not None:
+                        await asyncio.sleep(pacer.reserve())
+                    api_requests += 1
+                    raw = await _generate_square_image_bytes_async(
+                        client=api_client(), prompt=prompt, model=m, cache=image_cache
+                    )
+            out_dir = public_dir / "images" / "posts" / slug
+            placeholder = await loop.run_in_executor(
+                pool, lambda: _write_hero_set(raw, out_dir, profile=profile, max_workers=1)
+            )
+            set_hero_image_fields(posts_dir / f"{slug}.md", placeholder)
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            return HeroBatchItem(slug=slug, ok=False, error=error, seconds=time.perf_counter() - t0)
+        return HeroBatchItem(slug=slug, ok=True, source=source, seconds=time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    workers = DEFAULT_ENCODE_WORKERS if encode_workers is None else max(1, int(encode_workers))
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hero-encode") as pool:
+            items = await asyncio.gather(*(one(slug, pool) for slug in dict.fromkeys(slugs)))
+    finally:
+        if own_client is not None:
+            await own_client.close()
+    return HeroBatchResult(items=tuple(items), elapsed_seconds=time.perf_counter() - t0, api_requests=api_requests)
+
+
+def generate_hero_images(**kwargs: object) -> HeroBatchResult:
+    """Sync wrapper around `generate_hero_images_async` (same arguments)."""
+    return asyncio.run(generate_hero_images_async(**kwargs))  # type: ignore[arg-type]
+
+
+@dataclass(frozen=True)
+class HeroJobsResult:
+    claimed: int
+    generated: int
+    already_healthy: int  # healed some other way since they were enqueued
+    dropped: int  # post no longer exists
+    retrying: int
+    failed: int  # gave up; left in the queue's failed/
+    elapsed_seconds: float
+    errors: tuple[str, ...] = ()
+
+
+async def drain_hero_jobs_async(
+    *,
+    repo_root: Path,
+    queue: HeroJobQueue,
+    limit: int | None = None,
+    client: AsyncOpenAI | None = None,
+    concurrency: int = DEFAULT_HERO_CONCURRENCY,
+    requests_per_minute: float | None = None,
+    encode_workers: int | None = None,
+    image_cache: GeneratedImageCache | None = None,
+) -> HeroJobsResult:
+    """
+    Claims up to `limit` due jobs from `queue` (deferred by hydration) and generates their heroes
+    with `generate_hero_images_async`. The new files replace the post's placeholders only once the
+    whole set is encoded (see `pipeline.image_step._write_hero_set`); the frontmatter already
+    points at them, so only its hero placeholder fields change. Failed jobs go back to the queue
+    with a backoff. Jobs that allow reuse consult `image_cache` (None = always call the API).
+    """
+
+    t0 = time.perf_counter()
+    posts_dir = repo_root / "site" / "src" / "content" / "posts"
+    public_dir = repo_root / "site" / "public"
+    jobs = queue.claim(limit=limit)
+
+    healthy = dropped = 0
+    todo: dict[tuple[str | None, bool], list[HeroJob]] = {}
+    for job in jobs:
+        if not (posts_dir / f"{job.slug}.md").exists():
+            queue.complete(job)
+            dropped += 1
+        elif audit_hero_assets(public_dir=public_dir, slug=job.slug).status == HERO_HEALTHY:
+            queue.complete(job)
+            healthy += 1
+        else:
+            todo.setdefault((job.encoder_profile, job.reuse_generated_images), []).append(job)
+
+    generated = retrying = failed = 0
+    errors: list[str] = []
+    for (profile, reuse), group in todo.items():
+        by_slug = {job.slug: job for job in group}
+        try:
+            result = await generate_hero_images_async(
+                slugs=list(by_slug),
+                posts_dir=posts_dir,
+                public_dir=public_dir,
+                client=client,
+                concurrency=concurrency,
+                requests_per_minute=requests_per_minute,
+                encode_workers=encode_workers,
+                encoder_profile=profile,
+                image_cache=image_cache if reuse else None,
+            )
+            items = result.items
+        except Exception as e:  # e.g. unknown encoder profile: fail the group, keep the jobs
+            items = tuple(HeroBatchItem(slug=slug, ok=False, error=str(e) or type(e).__name__) for slug in by_slug)
+        for item in items:
+            job = by_slug[item.slug]
+            if item.ok:
+                queue.complete(job)
+                generated += 1
+                continue
+            errors.append(f"{item.slug}: {item.error}")
+            if queue.fail(job, item.error or "unknown error"):
+                retrying += 1
+            else:
+                failed += 1
+
+    return HeroJobsResult(
+        claimed=len(jobs),
+        generated=generated,
+        already_healthy=healthy,
+        dropped=dropped,
+        retrying=retrying,
+        failed=failed,
+        elapsed_seconds=time.perf_counter() - t0,
+        errors=tuple(errors),
+    )
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+try:
+    from PIL import Image, ImageOps  # type: ignore
+except Exception:  # pragma: no cover
+    Image = None  # type: ignore
+    ImageOps = None  # type: ignore
+
+
+# Hero sizes and the Pillow-only resize/encode steps, kept apart from pipeline.image_step
+# (OpenAI client) so self-heal can render placeholder sets without loading the image API stack.
+
+HERO_SOURCE_SIZE = 1024
+
+# (file name, width, height) of the crops derived from the square source image.
+HERO_DERIVATIVES = (
+    ("hero.webp", 1600, 900),
+    ("hero_home.webp", 1200, 630),
+    ("hero_card.webp", 800, 800),
+)
+
+
+def cover_resize(im: "Image.Image", width: int, height: int) -> "Image.Image":
+    if ImageOps is None:
+        return im
+    return ImageOps.fit(im, (int(width), int(height)), method=Image.Resampling.LANCZOS, centering=(0.5, 0.5))
+
+
+def save_image(im: "Image.Image", path: Path, *, format: str, **params: Any) -> None:
+    # Written aside and swapped in: the old file may be a hardlinked placeholder shared by many posts.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.part")
+    try:
+        im.save(str(tmp), format=format, **params)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def save_webp(im: "Image.Image", path: Path, *, quality: int = 85, method: int = 6) -> None:
+    save_image(im, path, format="WEBP", quality=int(quality), method=int(method))
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+# Kept apart from pipeline.image_step (Pillow, OpenAI client) so CLIs can offer the profile
+# names without loading the image stack.
+
+
+@dataclass(frozen=True)
+class HeroEncoderProfile:
+    """
+    How hero files are encoded.
+
+    Only WebP is written: the canonical hero paths are .webp and the site serves them as is.
+    """
+
+    name: str
+    quality: int = 85  # derivatives
+    source_quality: int = 90  # hero_source.webp, kept high: later crops are re-derived from it
+    method: int = 6  # WebP effort, 0 (fastest) .. 6 (smallest)
+
+
+HERO_ENCODER_PROFILES = {
+    "fast": HeroEncoderProfile(name="fast", quality=80, source_quality=88, method=2),
+    "balanced": HeroEncoderProfile(name="balanced"),
+    "max-compression": HeroEncoderProfile(name="max-compression", quality=75, source_quality=85, method=6),
+}
+DEFAULT_HERO_ENCODER_PROFILE = "balanced"
+
+
+def hero_encoder_profile(name: str | None) -> HeroEncoderProfile:
+    key = (name or DEFAULT_HERO_ENCODER_PROFILE).strip().lower()
+    if key not in HERO_ENCODER_PROFILES:
+        raise ValueError(f"Unknown hero encoder profile {name!r} (use one of: {', '.join(HERO_ENCODER_PROFILES)})")
+    return HERO_ENCODER_PROFILES[key]
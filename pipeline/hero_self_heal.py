@@ -1,12 +1,26 @@
 from __future__ import annotations
 
+import os
 import shutil
+import tempfile
+import threading
 import traceback
 from dataclasses import dataclass
-import hashlib
 from pathlib import Path
 from typing import Iterable, Optional
 
+from lib.file_digests import FileDigestIndex
+from lib.image_placeholders import ImagePlaceholder, image_placeholder_for_file, pillow_available
+from lib.image_store import link_or_copy
+from lib.validation.markdown_frontmatter import set_frontmatter_scalars
+from pipeline.hero_files import HERO_DERIVATIVES, HERO_SOURCE_SIZE, Image, cover_resize, save_webp
+from pipeline.stock_heroes import stock_hero_library
+
+
+# Used when the caller passes no index: every file (the placeholder included) is hashed
+# at most once per process while its size and mtime are unchanged.
+_PROCESS_DIGESTS = FileDigestIndex()
+
 
 @dataclass(frozen=True)
 class HeroPaths:
@@ -35,28 +49,247 @@ def _disk_path(public_dir: Path, url_path: str) -> Path:
     return public_dir / url_path.lstrip("/")
 
 
-def _ensure_parent(p: Path) -> None:
-    p.parent.mkdir(parents=True, exist_ok=True)
+def hero_image_placeholder(*, public_dir: Path, slug: str) -> Optional[ImagePlaceholder]:
+    """Placeholder of the post's hero.webp as it is on disk (None if it is missing or Pillow is not installed)."""
+    path = _disk_path(public_dir, HeroPaths.for_slug(slug).hero)
+    return image_placeholder_for_file(path) if pillow_available() and path.is_file() else None
 
 
-def _missing_or_empty(p: Path) -> bool:
-    return (not p.exists()) or p.stat().st_size == 0
+# Frontmatter keys describing the current hero.webp (see `hero_image_placeholder`).
+HERO_PLACEHOLDER_KEYS = ("heroImagePlaceholder", "heroImageWidth", "heroImageHeight")
 
 
-def _sha256(path: Path) -> str:
-    h = hashlib.sha256()
-    with path.open("rb") as f:
-        for chunk in iter(lambda: f.read(1024 * 1024), b""):
-            h.update(chunk)
-    return h.hexdigest()
+def set_hero_image_fields(post_path: Path, placeholder: ImagePlaceholder) -> bool:
+    """Writes heroImagePlaceholder/heroImageWidth/heroImageHeight for the post's hero; True if they changed."""
 
-
-def _is_same_file(a: Path, b: Path) -> bool:
-    if (not a.exists()) or (not b.exists()):
-        return False
-    if a.stat().st_size != b.stat().st_size:
+    md = post_path.read_text(encoding="utf-8")
+    values = (placeholder.data_uri, placeholder.width, placeholder.height)
+    md2 = set_frontmatter_scalars(md, dict(zip(HERO_PLACEHOLDER_KEYS, values)))
+    if md2 == md:
         return False
-    return _sha256(a) == _sha256(b)
+    post_path.write_text(md2, encoding="utf-8")
+    return True
+
+
+def _stat(p: Path) -> Optional[os.stat_result]:
+    try:
+        return p.stat()
+    except FileNotFoundError:
+        return None
+
+
+# File names of the hero variants; the pre-sized placeholder and stock hero sets use the same names.
+HERO_FILE_NAMES = ("hero.webp", "hero_home.webp", "hero_card.webp", "hero_source.webp")
+
+_sized_set_lock = threading.Lock()
+
+
+def build_sized_hero_set(path: Path, set_dir: Path, *, only_missing: bool = False) -> None:
+    """
+    Renders an image at every hero size into `set_dir`, skipping files newer than it
+    (with `only_missing`, every file already there, whatever its mtime).
+    """
+
+    if Image is None:
+        return
+    sizes = (*HERO_DERIVATIVES, ("hero_source.webp", HERO_SOURCE_SIZE, HERO_SOURCE_SIZE))
+    base_mtime = path.stat().st_mtime_ns
+
+    def is_fresh(name: str) -> bool:
+        st = _stat(set_dir / name)
+        return st is not None and (only_missing or st.st_mtime_ns > base_mtime)
+
+    with _sized_set_lock:
+        stale = [(n, w, h) for n, w, h in sizes if not is_fresh(n)]
+        if not stale:
+            return
+        with Image.open(path) as im:
+            im = im.convert("RGB")
+            for name, width, height in stale:
+                save_webp(cover_resize(im, width, height), set_dir / name, quality=85)
+
+
+class _PlaceholderFiles:
+    """
+    Stat snapshot of the placeholder hero, its pre-sized set (e.g. /images/placeholder-hero/hero_home.webp
+    at 1200x630) and the stock hero sets (see pipeline/stock_heroes.py), which count as placeholders too.
+
+    Built once per process and site (see `_load_placeholder`) and shared by every check.
+    `watched` are the files and directories whose (mtime, size) change when any of these
+    files is added, replaced or removed; a different `signature` means a rebuild.
+
+    The pre-sized set is committed with the site. Files missing from it are rendered before
+    the snapshot is taken, never after: a post backfilled with a sized file the snapshot does
+    not know would audit as ok. Existing files are kept as they are, since backfilled copies
+    are only recognised while they stay byte-identical; delete the set to re-render it.
+    """
+
+    def __init__(self, path: Path, extra_files: Iterable[Path] = (), extra_dirs: Iterable[Path] = ()) -> None:
+        self.path = path
+        self.set_dir = path.with_suffix("")
+        self._extra_files = tuple(extra_files)
+        if path.is_file():
+            try:
+                build_sized_hero_set(path, self.set_dir, only_missing=True)
+            except Exception as e:
+                print(f"🟠 Could not build sized placeholders in {self.set_dir}; using {path.name}. Error: {e}")
+        self.watched = (path, self.set_dir, *extra_dirs, *sorted({f.parent for f in self._extra_files}))
+        self.signature = _signature(self.watched)  # taken first: a change while statting forces a rebuild
+        st = _stat(path)
+        if st is None:
+            raise FileNotFoundError(
+                f"Placeholder hero missing at {path}. "
+                f"Create it (e.g. site/public/images/placeholder-hero.webp) so self-heal can backfill."
+            )
+        self.stat = st
+        self._stat_set()
+
+    def _stat_set(self) -> None:
+        files: dict[Path, os.stat_result] = {self.path: self.stat}
+        for f in (*(self.set_dir / name for name in HERO_FILE_NAMES), *self._extra_files):
+            f_st = _stat(f)
+            if f_st is not None:
+                files[f] = f_st
+        self.files = files
+        self.inodes = {(f.st_dev, f.st_ino) for f in files.values()}
+
+    def source_for(self, name: str) -> Path:
+        sized = self.set_dir / name
+        return sized if sized in self.files else self.path
+
+
+class _Placeholder:
+    """
+    `_PlaceholderFiles` checked against (and backfilled with) one digest index.
+
+    Backfill hardlinks the right-sized file into place, so recognising a backfilled file is
+    an inode comparison. Copies (older backfills, filesystems without links) are matched by
+    size, then digest; digests are only computed on a size match.
+    """
+
+    def __init__(self, files: _PlaceholderFiles, index: FileDigestIndex) -> None:
+        self._files = files
+        self._index = index
+
+    def _digest(self, path: Path) -> str:
+        return self._index.digest(path, self._files.files.get(path))
+
+    def matches(self, p: Path, st: Optional[os.stat_result] = None) -> bool:
+        st = st if st is not None else _stat(p)
+        if st is None:
+            return False
+        if (st.st_dev, st.st_ino) in self._files.inodes:
+            return True
+        same_size = [f for f, f_st in self._files.files.items() if f_st.st_size == st.st_size]
+        return bool(same_size) and self._index.digest(p, st) in {self._digest(f) for f in same_size}
+
+    def backfill(self, p: Path, stock_dir: Optional[Path] = None) -> None:
+        """Puts the right-sized placeholder (from `stock_dir`, if given) at `p`: hardlink, else reflink, else copy."""
+        src = stock_dir / p.name if stock_dir is not None else self._files.source_for(p.name)
+        link_or_copy(src, p)
+        if not os.path.samefile(src, p):
+            # A copy: record its digest so the next check needs no hashing.
+            self._index.remember(p, self._digest(src))
+
+
+# Per-file audit states, and the per-slug summary derived from them.
+HERO_FILE_OK = "ok"
+HERO_FILE_MISSING = "missing"  # absent or empty
+HERO_FILE_PLACEHOLDER = "placeholder"
+
+HERO_HEALTHY = "healthy"
+
+
+@dataclass(frozen=True)
+class HeroAudit:
+    slug: str
+    files: tuple[tuple[str, str], ...]  # (url path, state) for each hero variant
+
+    @property
+    def status(self) -> str:
+        """`missing` if any variant is missing, else `placeholder` if any is the placeholder, else `healthy`."""
+        states = {state for _, state in self.files}
+        for state in (HERO_FILE_MISSING, HERO_FILE_PLACEHOLDER):
+            if state in states:
+                return state
+        return HERO_HEALTHY
+
+
+# Placeholder snapshots by placeholder path. Re-statting the sets and globbing the stock heroes
+# for every post dominated audits; now a check costs one stat per watched path.
+_placeholder_files: dict[str, _PlaceholderFiles] = {}
+_placeholder_files_lock = threading.Lock()
+
+
+def _signature(paths: Iterable[Path]) -> tuple[Optional[tuple[int, int]], ...]:
+    stats = (_stat(p) for p in paths)
+    return tuple((st.st_mtime_ns, st.st_size) if st is not None else None for st in stats)
+
+
+def _load_placeholder(public_dir: Path, placeholder_url: str, digest_index: Optional[FileDigestIndex]) -> _Placeholder:
+    placeholder_disk = _disk_path(public_dir, placeholder_url)
+    index = digest_index if digest_index is not None else _PROCESS_DIGESTS
+    key = os.path.abspath(placeholder_disk)
+    with _placeholder_files_lock:
+        files = _placeholder_files.get(key)
+    if files is None or _signature(files.watched) != files.signature:
+        library = stock_hero_library(public_dir)
+        files = _PlaceholderFiles(placeholder_disk, library.files(), (library.root,))
+        with _placeholder_files_lock:
+            _placeholder_files[key] = files
+    return _Placeholder(files, index)
+
+
+def placeholder_recognition_problems(
+    *, public_dir: Path, placeholder_url: str = "/images/placeholder-hero.webp"
+) -> list[str]:
+    """
+    Why a hero byte-identical to a known placeholder (the placeholder, its sized set, a stock
+    hero) could audit as ok: a sized file is missing, or a copy of one is not matched. Copies
+    rule out inode matches, so this exercises the size and digest path. Empty when sound.
+    """
+    files = _load_placeholder(public_dir, placeholder_url, None)._files
+    problems = [
+        f"sized placeholder {files.set_dir / name} is missing"
+        for name in HERO_FILE_NAMES
+        if files.set_dir / name not in files.files
+    ]
+    placeholder = _Placeholder(files, FileDigestIndex())
+    with tempfile.TemporaryDirectory(prefix="hero-placeholder-check-") as tmp:
+        for i, known in enumerate(files.files):
+            copy = Path(tmp) / f"{i}{known.suffix}"
+            shutil.copyfile(known, copy)
+            if not placeholder.matches(copy):
+                problems.append(f"a copy of {known} is not recognised as a placeholder")
+    return problems
+
+
+def audit_hero_assets(
+    *,
+    public_dir: Path,
+    slug: str,
+    placeholder_url: str = "/images/placeholder-hero.webp",
+    digest_index: Optional[FileDigestIndex] = None,
+) -> HeroAudit:
+    """
+    Read-only counterpart of `ensure_hero_assets_exist`: classifies each hero variant of
+    a slug as ok, missing or placeholder. Safe to call from several threads.
+    """
+    paths = HeroPaths.for_slug(slug)
+    placeholder = _load_placeholder(public_dir, placeholder_url, digest_index)
+
+    files: list[tuple[str, str]] = []
+    for url_path in (paths.hero, paths.hero_home, paths.hero_card, paths.hero_source):
+        disk = _disk_path(public_dir, url_path)
+        st = _stat(disk)
+        if st is None or st.st_size == 0:
+            state = HERO_FILE_MISSING
+        elif placeholder.matches(disk, st):
+            state = HERO_FILE_PLACEHOLDER
+        else:
+            state = HERO_FILE_OK
+        files.append((url_path, state))
+    return HeroAudit(slug=slug, files=tuple(files))
 
 
 def ensure_hero_assets_exist(
@@ -66,27 +299,35 @@ def ensure_hero_assets_exist(
     placeholder_url: str = "/images/placeholder-hero.webp",
     regen_fn=None,
     regen_kwargs: Optional[dict] = None,
+    digest_index: Optional[FileDigestIndex] = None,
+    rederive_fn=None,
+    categories: Optional[Iterable[str]] = None,
 ) -> HeroPaths:
     """
     Self-heal hero assets for a slug.
 
     Strategy:
     - If all expected hero files exist and are non-empty: do nothing.
+    - Else, if rederive_fn is provided and hero_source.webp is intact: rebuild the crops
+      from it locally (no image API call).
     - Else, if regen_fn is provided: attempt regeneration.
-    - If regen fails OR regen_fn not provided: copy placeholder into ALL expected paths.
+    - If regen fails OR regen_fn not provided: link the placeholder, pre-sized for each slot,
+      into every missing path (hardlink, else reflink, else copy). With `categories` (the
+      post's frontmatter), the stock hero set for its category is linked instead, when built.
 
     regen_fn should be something like:
         regen_fn(**regen_kwargs) -> object with attributes:
             hero_image_path, hero_image_home_path, hero_image_card_path, hero_source_path (optional)
+    rederive_fn(public_dir=..., slug=...) rebuilds the crops from the existing source, e.g.
+    `pipeline.image_step.rebuild_hero_derivatives`.
+
+    Placeholder detection compares inodes, then sizes, and digests only on a size match.
+    Digests come from `digest_index` (persist one across runs, see lib/file_digests.py) or a
+    per-process index, so checking a healthy post costs a handful of `stat` calls.
     """
     paths = HeroPaths.for_slug(slug)
 
-    placeholder_disk = _disk_path(public_dir, placeholder_url)
-    if not placeholder_disk.exists():
-        raise FileNotFoundError(
-            f"Placeholder hero missing at {placeholder_disk}. "
-            f"Create it (e.g. site/public/images/placeholder-hero.webp) so self-heal can backfill."
-        )
+    placeholder = _load_placeholder(public_dir, placeholder_url, digest_index)
 
     expected = [
         _disk_path(public_dir, paths.hero),
@@ -96,12 +337,23 @@ def ensure_hero_assets_exist(
     ]
 
     def _missing_or_placeholder(p: Path) -> bool:
-        return _missing_or_empty(p) or _is_same_file(p, placeholder_disk)
+        st = _stat(p)
+        return st is None or st.st_size == 0 or placeholder.matches(p, st)
 
     if all(not _missing_or_placeholder(p) for p in expected):
         return paths
 
-    # Try regeneration first (if provided)
+    # A healthy source only needs its crops redone: sub-second, and no paid generation.
+    source = expected[-1]
+    if rederive_fn is not None and not _missing_or_placeholder(source):
+        try:
+            rederive_fn(public_dir=public_dir, slug=slug)
+            if all(not _missing_or_placeholder(p) for p in expected):
+                return paths
+        except Exception as e:
+            print(f"🟠 Hero rebuild from source failed for slug '{slug}'; falling back. Error: {e}")
+
+    # Try regeneration next (if provided)
     if regen_fn is not None:
         try:
             regen_kwargs = regen_kwargs or {}
@@ -110,7 +362,7 @@ def ensure_hero_assets_exist(
             # them as "already generated" and skip regeneration.
             for p in expected:
                 try:
-                    if _is_same_file(p, placeholder_disk):
+                    if placeholder.matches(p):
                         p.unlink(missing_ok=True)
                 except Exception:
                     pass
@@ -136,9 +388,11 @@ def ensure_hero_assets_exist(
             print(traceback.format_exc())
             pass
 
+    stock_dir = None
+    if categories:
+        stock_dir = stock_hero_library(public_dir).hero_set_for(slug, categories, HERO_FILE_NAMES)
     for p in expected:
         if _missing_or_placeholder(p):
-            _ensure_parent(p)
-            shutil.copyfile(placeholder_disk, p)
+            placeholder.backfill(p, stock_dir)
 
     return paths
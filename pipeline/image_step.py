@@ -2,12 +2,30 @@ from __future__ import annotations
 
 import base64
 import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from io import BytesIO
 from pathlib import Path
 from typing import Any, Iterable
 
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
+
+from lib.generated_image_cache import GeneratedImageCache, generated_image_key
+from lib.image_placeholders import LQIP_MAX_SIDE, ImagePlaceholder, lqip_data_uri
+from pipeline.hero_files import (  # noqa: F401 - re-exported for the hero scripts and benches
+    HERO_DERIVATIVES,
+    HERO_SOURCE_SIZE,
+    cover_resize,
+    save_webp,
+)
+from pipeline.hero_profiles import (  # noqa: F401 - re-exported for the hero scripts and benches
+    DEFAULT_HERO_ENCODER_PROFILE,
+    HERO_ENCODER_PROFILES,
+    HeroEncoderProfile,
+    hero_encoder_profile,
+)
 
 try:
     from PIL import Image, ImageOps  # type: ignore
@@ -22,25 +40,57 @@ class HeroGenResult:
     hero_image_home_path: Path
     hero_image_card_path: Path
     hero_source_path: Path
-
-
-def _ensure_parent(p: Path) -> None:
-    p.parent.mkdir(parents=True, exist_ok=True)
+    placeholder: ImagePlaceholder | None = None  # of hero.webp, for heroImagePlaceholder/Width/Height
 
 
 def _disk_path(public_dir: Path, url_path: str) -> Path:
     return public_dir / url_path.lstrip("/")
 
 
-def _cover_resize(im: "Image.Image", width: int, height: int) -> "Image.Image":
-    if ImageOps is None:
-        return im
-    return ImageOps.fit(im, (int(width), int(height)), method=Image.Resampling.LANCZOS, centering=(0.5, 0.5))
+# Pillow releases the GIL while resizing and encoding, so the four hero files encode in parallel.
+DEFAULT_ENCODE_WORKERS = max(1, min(1 + len(HERO_DERIVATIVES), os.cpu_count() or 1))
+
+
+def _encode_hero_files(
+    im: "Image.Image",
+    out_dir: Path,
+    *,
+    with_source: bool,
+    max_workers: int | None = None,
+    profile: HeroEncoderProfile | None = None,
+) -> list[Path]:
+    """Writes the derivatives (and the square source, if `with_source`) of a decoded RGB image.
+
+    Returns the derivative paths in `HERO_DERIVATIVES` order. `max_workers=1` encodes serially.
+    `profile` defaults to the balanced profile.
+    """
+
+    profile = profile or hero_encoder_profile(None)
+
+    def derive(name: str, width: int, height: int) -> Path:
+        path = out_dir / name
+        save_webp(cover_resize(im, width, height), path, quality=profile.quality, method=profile.method)
+        return path
 
+    def save_source() -> Path:
+        path = out_dir / "hero_source.webp"
+        save_webp(im, path, quality=profile.source_quality, method=profile.method)
+        return path
 
-def _save_webp(im: "Image.Image", path: Path, *, quality: int = 85) -> None:
-    _ensure_parent(path)
-    im.save(str(path), format="WEBP", quality=int(quality), method=6)
+    workers = DEFAULT_ENCODE_WORKERS if max_workers is None else max(1, int(max_workers))
+    im.load()  # decode once up front; the workers only read the pixel data
+    if workers == 1:
+        if with_source:
+            save_source()
+        return [derive(*d) for d in HERO_DERIVATIVES]
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hero-encode") as pool:
+        futures = [pool.submit(derive, *d) for d in HERO_DERIVATIVES]
+        source = pool.submit(save_source) if with_source else None
+        paths = [f.result() for f in futures]
+        if source is not None:
+            source.result()
+    return paths
 
 
 def _build_prompt(*, title: str, category: str | None, picks: Iterable[str]) -> str:
@@ -63,28 +113,105 @@ def _build_prompt(*, title: str, category: str | None, picks: Iterable[str]) ->
     return "\n".join(parts).strip()
 
 
-def _generate_square_image_bytes(*, prompt: str, model: str | None = None) -> bytes:
+def _image_model(model: str | None = None) -> str:
+    return (model or os.environ.get("OPENAI_IMAGE_MODEL") or "gpt-image-1").strip()
+
+
+def _image_api_key() -> str:
     api_key = (os.environ.get("OPENAI_API_KEY") or "").strip()
     if not api_key:
         raise RuntimeError("OPENAI_API_KEY is required to regenerate hero images")
+    return api_key
 
-    client = OpenAI(api_key=api_key)
-    m = (model or os.environ.get("OPENAI_IMAGE_MODEL") or "gpt-image-1").strip()
 
-    resp = client.images.generate(
-        model=m,
-        prompt=prompt,
-        size="1024x1024",
-    )
+HERO_SOURCE_DIMENSIONS = f"{HERO_SOURCE_SIZE}x{HERO_SOURCE_SIZE}"
+
 
+def _image_bytes(resp: Any) -> bytes:
     first = resp.data[0]
     b64 = getattr(first, "b64_json", None) or getattr(first, "base64", None)
     if not b64:
         raise RuntimeError("Image API response did not include base64 data")
-
     return base64.b64decode(b64)
 
 
+def _generate_square_image_bytes(
+    *, prompt: str, model: str | None = None, cache: GeneratedImageCache | None = None
+) -> bytes:
+    m = _image_model(model)
+
+    # The same prompt, model and size were already paid for: reuse that image.
+    key = generated_image_key(prompt=prompt, model=m, size=HERO_SOURCE_DIMENSIONS)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    client = OpenAI(api_key=_image_api_key())
+
+    resp = client.images.generate(
+        model=m,
+        prompt=prompt,
+        size=HERO_SOURCE_DIMENSIONS,
+    )
+
+    raw = _image_bytes(resp)
+    if cache is not None:
+        cache.put(key, raw, prompt=prompt, model=m, size=HERO_SOURCE_DIMENSIONS)
+    return raw
+
+
+async def _generate_square_image_bytes_async(
+    *, client: AsyncOpenAI, prompt: str, model: str | None = None, cache: GeneratedImageCache | None = None
+) -> bytes:
+    """Async counterpart of `_generate_square_image_bytes` on a caller-owned `AsyncOpenAI` client."""
+    m = _image_model(model)
+    key = generated_image_key(prompt=prompt, model=m, size=HERO_SOURCE_DIMENSIONS)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    resp = await client.images.generate(model=m, prompt=prompt, size=HERO_SOURCE_DIMENSIONS)
+
+    raw = _image_bytes(resp)
+    if cache is not None:
+        cache.put(key, raw, prompt=prompt, model=m, size=HERO_SOURCE_DIMENSIONS)
+    return raw
+
+
+def _hero_placeholder(im: "Image.Image") -> ImagePlaceholder:
+    """Placeholder of hero.webp, from the decoded source (the preview uses the same crop)."""
+    _, width, height = HERO_DERIVATIVES[0]
+    preview = cover_resize(im, LQIP_MAX_SIDE, max(1, round(LQIP_MAX_SIDE * height / width)))
+    return ImagePlaceholder(width=width, height=height, data_uri=lqip_data_uri(preview))
+
+
+def _write_hero_set(
+    raw: bytes, out_dir: Path, *, profile: HeroEncoderProfile, max_workers: int | None = None
+) -> ImagePlaceholder:
+    """Decodes a generated image and writes hero_source.webp plus the derivatives into `out_dir`.
+
+    Returns the placeholder of the new hero.webp.
+
+    The set is encoded into a staging directory next to `out_dir` and only then swapped in,
+    file by file, so a post keeps its previous (e.g. placeholder) hero until the new one is complete.
+    """
+    with Image.open(BytesIO(raw)) as im:
+        im = im.convert("RGB")
+
+        out_dir.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=f".{out_dir.name}.", suffix=".staging", dir=out_dir.parent))
+        try:
+            # Save source (square) and derived crops.
+            _encode_hero_files(im, staging, with_source=True, max_workers=max_workers, profile=profile)
+            for p in sorted(staging.iterdir()):
+                os.replace(p, out_dir / p.name)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        return _hero_placeholder(im)
+
+
 def generate_hero_image(
     *,
     public_dir: Path,
@@ -92,6 +219,9 @@ def generate_hero_image(
     title: str,
     category: str | None = None,
     picks: list[str] | None = None,
+    encode_workers: int | None = None,
+    encoder_profile: str | None = None,
+    image_cache: GeneratedImageCache | None = None,
     **_: Any,
 ) -> HeroGenResult:
     """Generate hero assets into `site/public/images/posts/<slug>/...`.
@@ -102,10 +232,16 @@ def generate_hero_image(
       - hero_home.webp (1200x630)
       - hero_card.webp (800x800)
       - hero_source.webp (1024x1024)
+    The four files are encoded concurrently on up to `encode_workers` threads
+    (default: `DEFAULT_ENCODE_WORKERS`; 1 = serial) with the named `encoder_profile`
+    (see `HERO_ENCODER_PROFILES`; default balanced).
+    With `image_cache`, an image already generated for the same prompt/model/size is
+    reused instead of calling the API (see lib/generated_image_cache.py).
     """
 
     if Image is None or ImageOps is None:
         raise RuntimeError("Pillow is required for hero image generation")
+    profile = hero_encoder_profile(encoder_profile)
 
     base_url = f"/images/posts/{slug}"
     hero_path = _disk_path(public_dir, f"{base_url}/hero.webp")
@@ -114,26 +250,52 @@ def generate_hero_image(
     source_path = _disk_path(public_dir, f"{base_url}/hero_source.webp")
 
     prompt = _build_prompt(title=title, category=category, picks=picks or [])
-    raw = _generate_square_image_bytes(prompt=prompt)
+    raw = _generate_square_image_bytes(prompt=prompt, cache=image_cache)
 
-    with Image.open(BytesIO(raw)) as im:
-        im = im.convert("RGB")
+    placeholder = _write_hero_set(raw, source_path.parent, profile=profile, max_workers=encode_workers)
+
+    return HeroGenResult(
+        hero_image_path=hero_path,
+        hero_image_home_path=home_path,
+        hero_image_card_path=card_path,
+        hero_source_path=source_path,
+        placeholder=placeholder,
+    )
 
-        # Save source (square) and derived crops.
-        _save_webp(im, source_path, quality=90)
 
-        hero = _cover_resize(im, 1600, 900)
-        _save_webp(hero, hero_path, quality=85)
+def rebuild_hero_derivatives(
+    *,
+    public_dir: Path,
+    slug: str,
+    encode_workers: int | None = None,
+    encoder_profile: str | None = None,
+    **_: Any,
+) -> HeroGenResult:
+    """Re-derive hero/hero_home/hero_card from the existing `hero_source.webp`, without the image API.
+
+    Uses the same crops as `generate_hero_image`, encoded with `encoder_profile`. Designed to
+    be passed into `ensure_hero_assets_exist(... rederive_fn=...)`.
+    Raises if Pillow is missing or the source cannot be decoded.
+    """
 
-        home = _cover_resize(im, 1200, 630)
-        _save_webp(home, home_path, quality=85)
+    if Image is None or ImageOps is None:
+        raise RuntimeError("Pillow is required to rebuild hero images")
+    profile = hero_encoder_profile(encoder_profile)
+
+    base_url = f"/images/posts/{slug}"
+    source_path = _disk_path(public_dir, f"{base_url}/hero_source.webp")
 
-        card = _cover_resize(im, 800, 800)
-        _save_webp(card, card_path, quality=85)
+    with Image.open(source_path) as im:
+        im = im.convert("RGB")  # decodes fully: a truncated source fails here, before anything is written
+        hero_path, home_path, card_path = _encode_hero_files(
+            im, source_path.parent, with_source=False, max_workers=encode_workers, profile=profile
+        )
+        placeholder = _hero_placeholder(im)
 
     return HeroGenResult(
         hero_image_path=hero_path,
         hero_image_home_path=home_path,
         hero_image_card_path=card_path,
         hero_source_path=source_path,
+        placeholder=placeholder,
     )
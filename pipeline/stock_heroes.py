@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+
+CATEGORY_ASSETS_URL = "/images/category_assets"
+STOCK_HERO_URL = "/images/stock-hero"
+
+# Taxonomy group keys without artwork of their own, mapped to the asset they show (as
+# CategoryMiniCard.astro does): kids and health sit in the "family" group.
+STOCK_ASSET_ALIASES = {"family": "essentials"}
+
+_IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".webp"}
+
+# tech.PNG and tech-2.PNG are both "tech" artwork; the suffix only names the variant.
+_VARIANT_RE = re.compile(r"^(?P<key>.+?)(?:-\d+)?$")
+
+
+def default_taxonomy_path(public_dir: Path) -> Path:
+    return public_dir.parent / "src" / "content" / "site" / "taxonomy.json"
+
+
+def _norm(x: Any) -> str:
+    return str(x if x is not None else "").strip().lower()
+
+
+class _Taxonomy:
+    """The parts of the site taxonomy needed to map a post category to artwork (see site/src/lib/taxonomy.ts)."""
+
+    def __init__(self, raw: dict[str, Any]) -> None:
+        self._aliases = {_norm(k): _norm(v) for k, v in (raw.get("aliases") or {}).items()}
+        self._ids: dict[str, str] = {}
+        for c in raw.get("categories") or []:
+            if not isinstance(c, dict) or not c.get("id"):
+                continue
+            cid = _norm(c["id"])
+            for name in (cid, c.get("label"), *(c.get("aliases") or [])):
+                self._ids.setdefault(_norm(name), cid)
+        self._groups: dict[str, str] = {}
+        for g in raw.get("groups") or []:
+            if not isinstance(g, dict) or not g.get("key"):
+                continue
+            for cid in g.get("categoryIds") or g.get("categories") or []:
+                self._groups.setdefault(_norm(cid), _norm(g["key"]))
+
+    @classmethod
+    def load(cls, path: Path) -> "_Taxonomy":
+        try:
+            raw = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            raw = {}
+        return cls(raw if isinstance(raw, dict) else {})
+
+    def resolve(self, category: Any) -> str:
+        s = _norm(category)
+        s = self._aliases.get(s, s)
+        return self._ids.get(s, s)
+
+    def asset_keys(self, category: Any) -> list[str]:
+        """Asset keys to try for a category, most specific first: the category, its group, their aliases."""
+        cid = self.resolve(category)
+        keys = [cid, self._groups.get(cid, "")]
+        keys += [STOCK_ASSET_ALIASES.get(k, "") for k in keys]
+        return [k for k in dict.fromkeys(keys) if k]
+
+
+class StockHeroLibrary:
+    """
+    Per-category stock heroes, built from the artwork in /images/category_assets.
+
+    Every image there (tech.PNG, tech-2.PNG, ...) is pre-rendered once at each hero size into
+    /images/stock-hero/<variant>/ (scripts/build_stock_heroes.py). A post's categories pick the
+    artwork (through taxonomy aliases and groups) and its slug picks one variant, the same one
+    on every run, so self-heal only has to link existing files: no decoding, no network.
+    """
+
+    def __init__(self, *, public_dir: Path, taxonomy_path: Optional[Path] = None) -> None:
+        self._public_dir = public_dir
+        self._assets_dir = public_dir / CATEGORY_ASSETS_URL.lstrip("/")
+        self._root = public_dir / STOCK_HERO_URL.lstrip("/")
+        self._taxonomy = _Taxonomy.load(taxonomy_path or default_taxonomy_path(public_dir))
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def sources(self) -> dict[str, list[Path]]:
+        """Artwork by asset key, variants sorted by file name."""
+        out: dict[str, list[Path]] = {}
+        if not self._assets_dir.is_dir():
+            return out
+        for p in sorted(self._assets_dir.iterdir(), key=lambda p: p.name.lower()):
+            if p.is_file() and p.suffix.lower() in _IMAGE_SUFFIXES:
+                m = _VARIANT_RE.match(p.stem.lower())
+                out.setdefault(m.group("key") if m else p.stem.lower(), []).append(p)
+        return out
+
+    def set_dir(self, source: Path) -> Path:
+        return self._root / source.stem.lower()
+
+    def choose(self, slug: str, categories: Iterable[Any]) -> Optional[Path]:
+        """The artwork for a post: the first category with any, then a variant picked by slug."""
+        sources = self.sources()
+        for category in categories:
+            for key in self._taxonomy.asset_keys(category):
+                variants = sources.get(key)
+                if variants:
+                    n = int(hashlib.sha256(slug.encode("utf-8")).hexdigest()[:8], 16)
+                    return variants[n % len(variants)]
+        return None
+
+    def hero_set_for(self, slug: str, categories: Iterable[Any], names: Iterable[str]) -> Optional[Path]:
+        """Pre-rendered set directory for the post, if one is chosen and has every file in `names`."""
+        source = self.choose(slug, categories)
+        if source is None:
+            return None
+        set_dir = self.set_dir(source)
+        return set_dir if all((set_dir / name).is_file() for name in names) else None
+
+    def files(self) -> list[Path]:
+        """Every pre-rendered stock hero file (to recognise posts still showing one)."""
+        return sorted(self._root.glob("*/*.webp")) if self._root.is_dir() else []
+
+
+_libraries: dict[Path, StockHeroLibrary] = {}
+_libraries_lock = threading.Lock()
+
+
+def stock_hero_library(public_dir: Path) -> StockHeroLibrary:
+    """Process-wide library for a site (the taxonomy is read once)."""
+    key = Path(os.path.abspath(public_dir))
+    with _libraries_lock:
+        lib = _libraries.get(key)
+        if lib is None:
+            lib = _libraries[key] = StockHeroLibrary(public_dir=public_dir)
+        return lib
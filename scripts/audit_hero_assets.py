@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+
+from lib.file_digests import FileDigestIndex, default_file_digest_index_path
+from lib.generated_image_cache import GeneratedImageCache, default_generated_image_cache_dir
+from managed_site.hydration import hero_regen_kwargs, post_categories, rederive_hero_image, regenerate_hero_image
+from pipeline.hero_profiles import HERO_ENCODER_PROFILES
+from pipeline.hero_self_heal import (
+    HERO_FILE_MISSING,
+    HERO_FILE_OK,
+    HERO_FILE_PLACEHOLDER,
+    HERO_HEALTHY,
+    HeroAudit,
+    audit_hero_assets,
+    ensure_hero_assets_exist,
+    placeholder_recognition_problems,
+)
+
+
+PLACEHOLDER_URL = "/images/placeholder-hero.webp"
+
+
+def _repo_root() -> Path:
+    return Path(__file__).resolve().parents[1]
+
+
+def _audit_all(
+    slugs: list[str], *, public_dir: Path, digest_index: FileDigestIndex, workers: int
+) -> dict[str, HeroAudit]:
+    # Each audit is a few stat calls (plus a hash only for files the size of the placeholder).
+    def audit(slug: str) -> HeroAudit:
+        return audit_hero_assets(
+            public_dir=public_dir, slug=slug, placeholder_url=PLACEHOLDER_URL, digest_index=digest_index
+        )
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        return dict(zip(slugs, pool.map(audit, slugs)))
+
+
+def _heal(
+    audits: list[HeroAudit],
+    *,
+    posts_dir: Path,
+    public_dir: Path,
+    digest_index: FileDigestIndex,
+    regenerate: bool,
+    concurrency: int,
+    encoder_profile: str,
+    image_cache: GeneratedImageCache,
+) -> None:
+    regen_fn = regenerate_hero_image if regenerate else None
+
+    def heal(audit: HeroAudit) -> None:
+        post_path = posts_dir / f"{audit.slug}.md"
+        regen_kwargs = None
+        if regen_fn is not None:
+            regen_kwargs = hero_regen_kwargs(
+                post_path=post_path,
+                post_slug=audit.slug,
+                public_dir=public_dir,
+                encoder_profile=encoder_profile,
+                image_cache=image_cache,
+            )
+        ensure_hero_assets_exist(
+            public_dir=public_dir,
+            slug=audit.slug,
+            placeholder_url=PLACEHOLDER_URL,
+            regen_fn=regen_fn,
+            regen_kwargs=regen_kwargs,
+            digest_index=digest_index,
+            rederive_fn=partial(rederive_hero_image, encoder_profile=encoder_profile),
+            categories=post_categories(post_path) if post_path.exists() else None,
+        )
+
+    # Bounded: regeneration calls the image API and encodes four WebP files per slug.
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        list(pool.map(heal, audits))
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(
+        description="Report (and optionally heal) posts whose hero is missing or a placeholder"
+    )
+    ap.add_argument("--posts-dir", default=None, help="Override posts directory (defaults to site/src/content/posts)")
+    ap.add_argument("--slug", action="append", default=None, help="Only check this post slug (repeatable)")
+    ap.add_argument("--workers", type=int, default=16, help="Threads checking hero files")
+    ap.add_argument(
+        "--heal",
+        action="store_true",
+        help=(
+            "Rebuild crops from an intact hero_source.webp, else regenerate (needs OPENAI_API_KEY), "
+            "else backfill the placeholder"
+        ),
+    )
+    ap.add_argument("--heal-concurrency", type=int, default=2, help="Slugs healed at the same time")
+    ap.add_argument(
+        "--hero-profile",
+        choices=sorted(HERO_ENCODER_PROFILES),
+        default="fast",
+        help="Encoder profile for healed heroes (fast suits bulk backfills)",
+    )
+    ap.add_argument("--json", action="store_true", help="Print one JSON line per slug instead of the report")
+    args = ap.parse_args(argv)
+
+    repo_root = _repo_root()
+    posts_dir = Path(args.posts_dir) if args.posts_dir else repo_root / "site" / "src" / "content" / "posts"
+    if not posts_dir.exists():
+        print(f"[error] Posts directory not found: {posts_dir}")
+        return 2
+    public_dir = repo_root / "site" / "public"
+
+    wanted = set(args.slug) if args.slug else None
+    slugs = [p.stem for p in sorted(posts_dir.glob("*.md")) if wanted is None or p.stem in wanted]
+    digest_index = FileDigestIndex(path=default_file_digest_index_path(repo_root))
+
+    try:
+        # A placeholder that is not recognised would make its posts audit (and stay) healthy.
+        problems = placeholder_recognition_problems(public_dir=public_dir, placeholder_url=PLACEHOLDER_URL)
+        if problems:
+            for problem in problems:
+                print(f"[error] {problem}")
+            return 2
+        t0 = time.perf_counter()
+        audits = _audit_all(slugs, public_dir=public_dir, digest_index=digest_index, workers=int(args.workers))
+    except FileNotFoundError as e:
+        print(f"[error] {e}")
+        return 2
+    audit_seconds = time.perf_counter() - t0
+
+    healed: list[str] = []
+    if args.heal:
+        regenerate = bool(os.environ.get("OPENAI_API_KEY"))
+        to_heal = [a for a in audits.values() if a.status != HERO_HEALTHY]
+        if to_heal:
+            _heal(
+                to_heal,
+                posts_dir=posts_dir,
+                public_dir=public_dir,
+                digest_index=digest_index,
+                regenerate=regenerate,
+                concurrency=int(args.heal_concurrency),
+                encoder_profile=str(args.hero_profile),
+                image_cache=GeneratedImageCache(root=default_generated_image_cache_dir(repo_root)),
+            )
+            healed = [a.slug for a in to_heal]
+            audits.update(
+                _audit_all(healed, public_dir=public_dir, digest_index=digest_index, workers=int(args.workers))
+            )
+    digest_index.save()
+
+    if args.json:
+        for audit in audits.values():
+            files = {url: state for url, state in audit.files}
+            row = {"slug": audit.slug, "status": audit.status, "files": files, "healed": audit.slug in healed}
+            print(json.dumps(row))
+        return 0
+
+    by_status: dict[str, list[HeroAudit]] = {}
+    for audit in audits.values():
+        by_status.setdefault(audit.status, []).append(audit)
+    for status in (HERO_FILE_MISSING, HERO_FILE_PLACEHOLDER):
+        if by_status.get(status):
+            print(f"\n{status}:")
+            for audit in by_status[status]:
+                bad = ", ".join(Path(url).name for url, state in audit.files if state != HERO_FILE_OK)
+                print(f"- {audit.slug}: {bad}")
+
+    print()
+    statuses = (HERO_HEALTHY, HERO_FILE_PLACEHOLDER, HERO_FILE_MISSING)
+    counts = " ".join(f"{s}={len(by_status.get(s, []))}" for s in statuses)
+    print(f"Posts: {len(audits)} {counts} (checked in {audit_seconds:.2f}s)")
+    if healed:
+        fixed = sum(1 for slug in healed if audits[slug].status == HERO_HEALTHY)
+        note = "" if os.environ.get("OPENAI_API_KEY") else " (no OPENAI_API_KEY: rebuilt from source or backfilled)"
+        print(f"Healed: {fixed}/{len(healed)}{note}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
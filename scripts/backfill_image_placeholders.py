@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from lib.image_placeholders import pillow_available
+from lib.pick_image_enrichment import PickImageEnrichmentResult, build_pick_image_variants_for_markdown
+from lib.pick_image_variants import VariantEncoder
+from pipeline.hero_self_heal import hero_image_placeholder, set_hero_image_fields
+
+
+def _repo_root() -> Path:
+    return Path(__file__).resolve().parents[1]
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(
+        description="Write blurred previews and intrinsic sizes for existing hero and pick images (no network)"
+    )
+    ap.add_argument("--posts-dir", default=None, help="Override posts directory (defaults to site/src/content/posts)")
+    ap.add_argument("--slug", action="append", default=None, help="Only process this post slug (repeatable)")
+    ap.add_argument("--workers", type=int, default=None, help="Posts processed at once (defaults to CPU count)")
+    ap.add_argument("--force", action="store_true", help="Re-encode picks that already have a placeholder")
+    ap.add_argument("--no-heroes", action="store_true", help="Skip heroImagePlaceholder/Width/Height")
+    ap.add_argument("--no-picks", action="store_true", help="Skip products[].imagePlaceholder/imageWidth/imageHeight")
+    args = ap.parse_args(argv)
+
+    if not pillow_available():
+        print("[error] Pillow is required to build image placeholders")
+        return 2
+    repo_root = _repo_root()
+    posts_dir = Path(args.posts_dir) if args.posts_dir else repo_root / "site" / "src" / "content" / "posts"
+    if not posts_dir.exists():
+        print(f"[error] Posts directory not found: {posts_dir}")
+        return 2
+    public_dir = repo_root / "site" / "public"
+    wanted = set(args.slug) if args.slug else None
+    md_paths = [p for p in sorted(posts_dir.glob("*.md")) if wanted is None or p.stem in wanted]
+    workers = max(1, int(args.workers or os.cpu_count() or 1))
+
+    t0 = time.perf_counter()
+    heroes_updated = 0
+    if not args.no_heroes:
+
+        def hero(md_path: Path) -> bool:
+            placeholder = hero_image_placeholder(public_dir=public_dir, slug=md_path.stem)
+            return placeholder is not None and set_hero_image_fields(md_path, placeholder)
+
+        # Pillow releases the GIL while decoding, so threads decode heroes in parallel.
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            heroes_updated = sum(pool.map(hero, md_paths))
+        print(f"Heroes: updated={heroes_updated} of {len(md_paths)} posts")
+
+    picks_updated = 0
+    if not args.no_picks:
+        with VariantEncoder(max_workers=workers) as encoder:
+
+            def picks(md_path: Path) -> PickImageEnrichmentResult:
+                return build_pick_image_variants_for_markdown(
+                    markdown_path=md_path, encoder=encoder, repo_root=repo_root, force=bool(args.force)
+                )
+
+            # Posts are submitted together so the encoder processes stay busy across post boundaries.
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for md_path, res in zip(md_paths, pool.map(picks, md_paths)):
+                    picks_updated += res.picks_updated
+                    if res.errors:
+                        print(f"{md_path.stem}:")
+                        for e in res.errors:
+                            print(f"- {e}")
+        print(f"Picks: updated={picks_updated}")
+
+    print(f"Done in {time.perf_counter() - t0:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
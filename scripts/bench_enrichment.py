@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from lib.http_client import ConnectionStats, build_async_client, build_client
+from lib.http_replay import Cassette, FaultInjector, ReplayTransport
+from lib.net_policy import HostPolicyConfig, NetworkPolicy
+from lib.pick_image_enrichment import (
+    DEFAULT_MAX_PER_HOST,
+    PAGE_DRAIN_MAX_BYTES,
+    EnrichmentStats,
+    enrich_pick_images_for_markdown,
+    enrich_pick_images_for_posts_async,
+)
+from lib.retailer_standin import RetailerStandIn
+from scripts.bench_image_extractor import FIXTURES_DIR, _pad_page
+
+
+def _synthetic_jpeg(size_kb: int) -> bytes:
+    # Only the magic bytes matter to the image sink; variants are not built in the benchmark.
+    body = b"\xff\xd8\xff\xe0\x00\x10JFIF\x00"
+    return body + b"\x00" * max(0, size_kb * 1024 - len(body) - 2) + b"\xff\xd9"
+
+
+def fixture_cassette(fixtures_dir: Path, *, page_kb: int, image_kb: int) -> tuple[Cassette, list[str]]:
+    """Cassette built from the saved product pages (padded to `page_kb`) plus synthetic images.
+
+    Returns the cassette and its product page URLs.
+    """
+
+    manifest = json.loads((fixtures_dir / "manifest.json").read_text(encoding="utf-8"))
+    cassette = Cassette()
+    image = _synthetic_jpeg(image_kb)
+    product_urls: list[str] = []
+    for i, page in enumerate(manifest.get("pages", [])):
+        html = (fixtures_dir / page["file"]).read_text(encoding="utf-8")
+        body = _pad_page(html, page_kb=page_kb).encode("utf-8")
+        url = str(page["url"])
+        cassette.add(url, headers={"content-type": "text/html; charset=utf-8", "etag": f'"page-{i}"'}, body=body)
+        product_urls.append(url)
+        for key in ("expected_image", "expected_sized_image"):
+            if page.get(key):
+                cassette.add(str(page[key]), headers={"content-type": "image/jpeg", "etag": f'"img-{i}"'}, body=image)
+    return cassette, product_urls
+
+
+def _distinct_product_urls(cassette: Cassette, base_urls: list[str], n: int) -> list[str]:
+    """`n` distinct product URLs cycling over `base_urls` (copies get a `bench=<k>` query)."""
+
+    out: list[str] = []
+    for k in range(n):
+        base = base_urls[k % len(base_urls)]
+        copy = k // len(base_urls)
+        if copy == 0:
+            out.append(base)
+            continue
+        url = f"{base}{'&' if '?' in base else '?'}bench={copy}"
+        entry = cassette.lookup("GET", base)
+        if entry is not None:
+            cassette.add(url, status=entry.status, headers=dict(entry.headers), body=entry.body)
+        out.append(url)
+    return out
+
+
+def _write_posts(repo: Path, product_urls: list[str], *, picks_per_post: int) -> list[Path]:
+    posts_dir = repo / "site" / "src" / "content" / "posts"
+    posts_dir.mkdir(parents=True)
+    (repo / "site" / "public").mkdir(parents=True)
+    paths: list[Path] = []
+    for p in range(math.ceil(len(product_urls) / picks_per_post)):
+        urls = product_urls[p * picks_per_post : (p + 1) * picks_per_post]
+        products = [{"pick_id": f"pick-{i + 1}", "title": f"Pick {i + 1}", "url": u} for i, u in enumerate(urls)]
+        md_path = posts_dir / f"2026-01-{p + 1:02d}-bench-{p + 1}.md"
+        frontmatter = f'title: "Bench {p + 1}"\nproducts: {json.dumps(products)}'
+        md_path.write_text(f"---\n{frontmatter}\n---\n\nBody.\n", encoding="utf-8")
+        paths.append(md_path)
+    return paths
+
+
+def _percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+class _RequestTimer:
+    """httpx event hooks measuring time from sending a request to its response headers."""
+
+    def __init__(self) -> None:
+        self.seconds: list[float] = []
+
+    def on_request(self, request: httpx.Request) -> None:
+        request.extensions["bench_t0"] = time.perf_counter()
+
+    def on_response(self, response: httpx.Response) -> None:
+        t0 = response.request.extensions.get("bench_t0")
+        if t0 is not None:
+            self.seconds.append(time.perf_counter() - t0)
+
+    async def on_request_async(self, request: httpx.Request) -> None:
+        self.on_request(request)
+
+    async def on_response_async(self, response: httpx.Response) -> None:
+        self.on_response(response)
+
+
+def _policy(rate_per_host: float) -> NetworkPolicy:
+    if rate_per_host <= 0:
+        rate = 1e9  # effectively unthrottled: measure the engine, not the politeness budget
+        return NetworkPolicy(HostPolicyConfig(rate_per_second=rate, burst=10**9, max_rate_per_second=rate))
+    return NetworkPolicy(HostPolicyConfig(rate_per_second=rate_per_host))
+
+
+def _run_sync(
+    *,
+    posts: list[Path],
+    repo: Path,
+    transport: Any,
+    policy: NetworkPolicy,
+    timer: _RequestTimer,
+    connections: ConnectionStats,
+) -> EnrichmentStats:
+    stats = EnrichmentStats()
+    hooks = {"request": [timer.on_request], "response": [timer.on_response]}
+    t0 = time.perf_counter()
+    with build_client(transport=transport, stats=connections, event_hooks=hooks) as client:
+        for md_path in posts:
+            enrich_pick_images_for_markdown(
+                markdown_path=md_path, slug=md_path.stem, repo_root=repo, policy=policy, stats=stats, client=client
+            )
+    stats.elapsed_seconds = time.perf_counter() - t0
+    return stats
+
+
+async def _run_async(
+    *,
+    posts_dir: Path,
+    repo: Path,
+    transport: Any,
+    policy: NetworkPolicy,
+    timer: _RequestTimer,
+    connections: ConnectionStats,
+    concurrency: int,
+    per_host: int,
+) -> EnrichmentStats:
+    hooks = {"request": [timer.on_request_async], "response": [timer.on_response_async]}
+    async with build_async_client(transport=transport, stats=connections, event_hooks=hooks) as client:
+        batch = await enrich_pick_images_for_posts_async(
+            posts_dir=posts_dir,
+            repo_root=repo,
+            max_concurrency=concurrency,
+            max_per_host=per_host,
+            policy=policy,
+            client=client,
+        )
+    return batch.stats
+
+
+def _parse_paths(spec: str) -> list[tuple[str, int]]:
+    paths: list[tuple[str, int]] = []
+    for part in (p.strip() for p in spec.split(",") if p.strip()):
+        if part == "sync":
+            paths.append(("sync", 1))
+        elif part.startswith("async:"):
+            paths.append(("async", int(part.split(":", 1)[1])))
+        else:
+            raise SystemExit(f"[error] Unknown path {part!r} (use sync or async:<concurrency>)")
+    return paths
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Offline pick image enrichment benchmark on replayed retailer traffic")
+    ap.add_argument("--cassette", default=None, help="Recorded cassette directory (defaults to the page fixtures)")
+    ap.add_argument("--fixtures-dir", default=str(FIXTURES_DIR), help="Page fixtures used when no cassette is given")
+    ap.add_argument("--page-kb", type=int, default=300, help="Pad fixture pages to roughly this size")
+    ap.add_argument("--image-kb", type=int, default=60, help="Size of the synthetic fixture images")
+    ap.add_argument("--picks", type=int, default=48, help="Total picks (distinct product URLs)")
+    ap.add_argument("--picks-per-post", type=int, default=8, help="Picks per generated post")
+    ap.add_argument("--paths", default="sync,async:4,async:16", help="Comma-separated: sync, async:<concurrency>")
+    ap.add_argument("--per-host", type=int, default=DEFAULT_MAX_PER_HOST, help="Per-host cap for the async paths")
+    ap.add_argument(
+        "--transport",
+        choices=("server", "replay"),
+        default="server",
+        help="server: local stand-in over real sockets; replay: in-process transport (no sockets)",
+    )
+    ap.add_argument("--latency-ms", type=float, default=40.0, help="Injected latency per request")
+    ap.add_argument("--jitter-ms", type=float, default=20.0, help="Extra random latency per request (uniform 0..N)")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="Share of requests that fail (503 or reset)")
+    ap.add_argument("--reset-share", type=float, default=0.25, help="Share of failures injected as connection resets")
+    ap.add_argument("--rate-per-host", type=float, default=0.0, help="Policy request rate per host (0 = unthrottled)")
+    ap.add_argument("--seed", type=int, default=0, help="Seed for latency jitter and error injection")
+    args = ap.parse_args(argv)
+
+    if args.cassette:
+        cassette = Cassette(root=Path(args.cassette))
+        base_urls = cassette.urls(content_type="text/html")
+    else:
+        cassette, base_urls = fixture_cassette(
+            Path(args.fixtures_dir), page_kb=int(args.page_kb), image_kb=int(args.image_kb)
+        )
+    if not base_urls:
+        print("[error] Cassette has no product pages")
+        return 2
+    product_urls = _distinct_product_urls(cassette, base_urls, int(args.picks))
+
+    print(
+        f"{len(product_urls)} picks over {len(base_urls)} pages, transport={args.transport}, "
+        f"latency={args.latency_ms:.0f}+{args.jitter_ms:.0f}ms, error_rate={args.error_rate:.2f}"
+    )
+    print(
+        f"{'path':10} {'ok':>4} {'fail':>4} {'wall s':>7} {'picks/s':>8} {'pick p50':>9} {'pick p95':>9} "
+        f"{'req p50':>8} {'req p95':>8} {'reqs':>5} {'conns':>5} {'reused':>7} {'dropped':>7}"
+    )
+
+    unexpected_failures = 0
+    for kind, concurrency in _parse_paths(args.paths):
+        faults = FaultInjector(
+            latency_seconds=args.latency_ms / 1000.0,
+            jitter_seconds=args.jitter_ms / 1000.0,
+            error_rate=float(args.error_rate),
+            reset_share=float(args.reset_share),
+            seed=int(args.seed),
+        )
+        standin = RetailerStandIn(cassette, faults=faults).start() if args.transport == "server" else None
+        timer = _RequestTimer()
+        connections = ConnectionStats()
+        policy = _policy(float(args.rate_per_host))
+        try:
+            with tempfile.TemporaryDirectory(prefix="bench-enrich-") as tmp:
+                repo = Path(tmp)
+                posts = _write_posts(repo, product_urls, picks_per_post=max(1, int(args.picks_per_post)))
+                if kind == "sync":
+                    transport = standin.transport() if standin else ReplayTransport(cassette, faults=faults)
+                    stats = _run_sync(
+                        posts=posts,
+                        repo=repo,
+                        transport=transport,
+                        policy=policy,
+                        timer=timer,
+                        connections=connections,
+                    )
+                else:
+                    transport = standin.async_transport() if standin else ReplayTransport(cassette, faults=faults)
+                    stats = asyncio.run(
+                        _run_async(
+                            posts_dir=posts[0].parent,
+                            repo=repo,
+                            transport=transport,
+                            policy=policy,
+                            timer=timer,
+                            connections=connections,
+                            concurrency=concurrency,
+                            per_host=int(args.per_host),
+                        )
+                    )
+        finally:
+            if standin is not None:
+                standin.stop()
+
+        name = "sync" if kind == "sync" else f"async:{concurrency}"
+        counted = bool(connections.requests)
+        conns = str(connections.connections_opened) if counted else "-"
+        reused = f"{connections.reuse_ratio:.0%}" if counted else "-"
+        ms = 1000.0
+        print(
+            f"{name:10} {stats.picks_updated:4d} {stats.picks_failed:4d} {stats.elapsed_seconds:7.2f} "
+            f"{stats.picks_per_second:8.1f} {_percentile(stats.pick_seconds, 0.50) * ms:7.0f}ms "
+            f"{_percentile(stats.pick_seconds, 0.95) * ms:7.0f}ms {_percentile(timer.seconds, 0.50) * ms:6.0f}ms "
+            f"{_percentile(timer.seconds, 0.95) * ms:6.0f}ms {stats.requests:5d} {conns:>5} {reused:>7} "
+            f"{stats.connections_dropped:7d}"
+        )
+        if not args.error_rate:
+            unexpected_failures += stats.picks_failed
+
+    print("\npick latency: start of a pick to its outcome (async paths include waiting for a slot)")
+    print("conns: TCP connections opened; reused: share of requests sent on an already open connection")
+    print(
+        f"dropped: pages abandoned with more than {PAGE_DRAIN_MAX_BYTES // 1024} KB left after the image was found;"
+        "\n         their connection is closed rather than drained, so the next request opens a new one"
+    )
+    return 1 if unexpected_failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
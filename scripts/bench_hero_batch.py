@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import tempfile
+from pathlib import Path
+
+from openai import AsyncOpenAI
+
+from lib.http_replay import FaultInjector
+from lib.image_api_standin import ImageApiStandIn
+from pipeline.hero_batch import HeroBatchResult, generate_hero_images_async
+from pipeline.image_step import HERO_ENCODER_PROFILES, Image
+
+
+def _write_fixture_posts(posts_dir: Path, n: int) -> list[str]:
+    posts_dir.mkdir(parents=True, exist_ok=True)
+    slugs: list[str] = []
+    for i in range(n):
+        slug = f"bench-hero-{i:03d}"
+        picks = [{"body": f"Pick {k} for bench post {i}: a sturdy, well-reviewed everyday item."} for k in range(3)]
+        frontmatter = "\n".join(
+            [
+                "---",
+                f'title: "Bench post {i}"',
+                'categories: ["home"]',
+                f"picks: {json.dumps(picks)}",
+                "---",
+            ]
+        )
+        (posts_dir / f"{slug}.md").write_text(frontmatter + "\n\nBody.\n", encoding="utf-8")
+        slugs.append(slug)
+    return slugs
+
+
+async def _run(base_url: str, **kwargs: object) -> HeroBatchResult:
+    async with AsyncOpenAI(base_url=base_url, api_key="stub") as client:
+        return await generate_hero_images_async(client=client, **kwargs)  # type: ignore[arg-type]
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Batch hero generation against the local stand-in image API")
+    ap.add_argument("--posts", type=int, default=12, help="Number of synthetic posts")
+    ap.add_argument(
+        "--concurrency", default="1,4", help="Comma-separated concurrency levels to compare (default: 1,4)"
+    )
+    ap.add_argument("--latency-ms", type=float, default=1500.0, help="Stand-in latency per image request")
+    ap.add_argument("--encode-workers", type=int, default=None, help="Threads decoding and encoding hero files")
+    ap.add_argument(
+        "--hero-profile", choices=sorted(HERO_ENCODER_PROFILES), default="fast", help="Encoder profile for hero files"
+    )
+    args = ap.parse_args(argv)
+
+    if Image is None:
+        print("[error] Pillow is required for this benchmark")
+        return 2
+    levels = sorted({max(1, int(c)) for c in str(args.concurrency).split(",") if c.strip()})
+
+    print(f"posts={args.posts} latency={args.latency_ms:.0f}ms profile={args.hero_profile}")
+    print(f"{'concurrency':>11} {'wall s':>8} {'heroes/s':>9} {'api':>5} {'failed':>7}")
+    faults = FaultInjector(latency_seconds=args.latency_ms / 1000.0)
+    with ImageApiStandIn(faults=faults) as standin, tempfile.TemporaryDirectory(prefix="bench-hero-batch-") as tmp:
+        posts_dir = Path(tmp) / "posts"
+        slugs = _write_fixture_posts(posts_dir, max(1, int(args.posts)))
+        for level in levels:
+            result = asyncio.run(
+                _run(
+                    standin.base_url,
+                    slugs=slugs,
+                    posts_dir=posts_dir,
+                    public_dir=Path(tmp) / f"public-c{level}",
+                    concurrency=level,
+                    encode_workers=args.encode_workers,
+                    encoder_profile=str(args.hero_profile),
+                )
+            )
+            print(
+                f"{level:>11} {result.elapsed_seconds:8.2f} {result.heroes_per_second:9.2f} "
+                f"{result.api_requests:>5} {result.failed:>7}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
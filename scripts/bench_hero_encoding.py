@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from pipeline.image_step import DEFAULT_ENCODE_WORKERS, HERO_SOURCE_SIZE, Image, _encode_hero_files
+
+
+def fixture_hero_source(size: int = HERO_SOURCE_SIZE, *, seed: int = 0) -> "Image.Image":
+    """Deterministic photo-like square image: smooth gradients plus sensor-like noise.
+
+    Flat synthetic images encode unrealistically fast; the noise keeps WebP busy like a real photo.
+    """
+
+    gradient = Image.linear_gradient("L").resize((size, size))
+    radial = Image.radial_gradient("L").resize((size, size))
+    noise = Image.effect_noise((size, size), 48 + seed % 16)
+    return Image.merge("RGB", (gradient, radial, Image.blend(gradient, noise, 0.35)))
+
+
+def _time_encode(im: "Image.Image", *, workers: int, repeat: int) -> tuple[float, int]:
+    samples: list[float] = []
+    written = 0
+    with tempfile.TemporaryDirectory(prefix="bench-hero-") as tmp:
+        out_dir = Path(tmp)
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            _encode_hero_files(im, out_dir, with_source=True, max_workers=workers)
+            samples.append(time.perf_counter() - t0)
+        written = sum(p.stat().st_size for p in out_dir.iterdir())
+    return statistics.median(samples) * 1000.0, written
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Hero encoding benchmark: serial vs thread-pool WebP derivatives")
+    ap.add_argument("--source", default=None, help="Encode this image instead of the synthetic 1024x1024 fixture")
+    ap.add_argument(
+        "--workers",
+        default=f"1,{max(2, DEFAULT_ENCODE_WORKERS)},4",
+        help="Comma-separated worker counts to compare against the serial path (1, always run)",
+    )
+    ap.add_argument("--repeat", type=int, default=3, help="Timing repetitions per worker count (median is reported)")
+    args = ap.parse_args(argv)
+
+    if Image is None:
+        print("[error] Pillow is required for this benchmark")
+        return 2
+
+    if args.source:
+        with Image.open(args.source) as src:
+            im = src.convert("RGB")
+    else:
+        im = fixture_hero_source()
+    im.load()
+
+    counts = sorted({1} | {max(1, int(w)) for w in str(args.workers).split(",") if w.strip()})
+    print(f"source {im.width}x{im.height}, {os.cpu_count()} CPUs, default workers={DEFAULT_ENCODE_WORKERS}")
+    print(f"{'workers':>7} {'wall ms':>9} {'speedup':>8} {'bytes':>9}")
+
+    serial_ms = None
+    for workers in counts:
+        ms, written = _time_encode(im, workers=workers, repeat=max(1, int(args.repeat)))
+        if serial_ms is None:
+            serial_ms = ms
+        print(f"{workers:7d} {ms:9.0f} {serial_ms / ms:7.2f}x {written:9d}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
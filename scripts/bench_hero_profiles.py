@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from pipeline.hero_files import HERO_DERIVATIVES, Image, cover_resize, save_image
+from pipeline.hero_profiles import HERO_ENCODER_PROFILES
+from scripts.bench_hero_encoding import fixture_hero_source
+
+
+def _time_save(im: "Image.Image", path: Path, *, repeat: int, **params: object) -> tuple[float, int]:
+    samples: list[float] = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        save_image(im, path, **params)
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1000.0, path.stat().st_size
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Hero encoder profiles: encode time and bytes per derivative size")
+    ap.add_argument("--source", default=None, help="Encode this image instead of the synthetic 1024x1024 fixture")
+    ap.add_argument(
+        "--profiles", default=",".join(HERO_ENCODER_PROFILES), help="Comma-separated profile names to compare"
+    )
+    ap.add_argument("--repeat", type=int, default=3, help="Timing repetitions per file (median is reported)")
+    args = ap.parse_args(argv)
+
+    if Image is None:
+        print("[error] Pillow is required for this benchmark")
+        return 2
+    names = [n.strip() for n in str(args.profiles).split(",") if n.strip()]
+    unknown = [n for n in names if n not in HERO_ENCODER_PROFILES]
+    if unknown:
+        print(f"[error] Unknown profile(s): {', '.join(unknown)} (use: {', '.join(HERO_ENCODER_PROFILES)})")
+        return 2
+
+    if args.source:
+        with Image.open(args.source) as src:
+            im = src.convert("RGB")
+    else:
+        im = fixture_hero_source()
+    im.load()
+
+    # Crops are profile-independent: resize once so only encoding is timed.
+    files = [("hero_source", im, "source")] + [
+        (name.rsplit(".", 1)[0], cover_resize(im, w, h), "derivative") for name, w, h in HERO_DERIVATIVES
+    ]
+    print(f"source {im.width}x{im.height}")
+    print(f"{'profile':16} {'file':12} {'size':>9} {'q':>3} {'ms':>7} {'KB':>8}")
+
+    repeat = max(1, int(args.repeat))
+    with tempfile.TemporaryDirectory(prefix="bench-hero-profiles-") as tmp:
+        for name in names:
+            profile = HERO_ENCODER_PROFILES[name]
+            total_ms = total_bytes = 0.0
+            for label, image, kind in files:
+                quality = profile.source_quality if kind == "source" else profile.quality
+                path = Path(tmp) / f"{name}-{label}.webp"
+                ms, size = _time_save(
+                    image, path, repeat=repeat, format="WEBP", quality=quality, method=profile.method
+                )
+                total_ms += ms
+                total_bytes += size
+                dims = f"{image.width}x{image.height}"
+                print(f"{name:16} {label:12} {dims:>9} {quality:3d} {ms:7.0f} {size / 1024:8.1f}")
+            print(f"{name:16} {'= all files':12} {'':>9} {'':>3} {total_ms:7.0f} {total_bytes / 1024:8.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+
+from lib.pick_image_enrichment import (
+    PAGE_CHUNK_SIZE,
+    _best_image_url_from_html,
+    _extract_image_url_from_html,
+    _StreamingImageExtractor,
+)
+
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures" / "product_pages"
+
+# Share of the padding placed at each marker; real product pages are mostly body markup.
+_PAD_SHARES = {"<!-- pad:head -->": 0.05, "<!-- pad:before -->": 0.45, "<!-- pad:after -->": 0.50}
+
+_FILLER_BLOCK = (
+    '<div class="a-section a-spacing-small"><span class="a-size-base">Customers who viewed this item '
+    'also viewed</span><a class="a-link-normal" href="/dp/B000000000?ref=pd_sim">Related item</a></div>\n'
+    "<script>window.P && P.when('A').execute(function(A){ if (a < b) { A.state('x', {k: 1}); } });</script>\n"
+)
+
+
+def _pad_page(html: str, *, page_kb: int) -> str:
+    markers = [m for m in _PAD_SHARES if m in html]
+    if not markers or page_kb <= 0:
+        return html
+    total_share = sum(_PAD_SHARES[m] for m in markers)
+    missing = max(0, page_kb * 1024 - len(html.encode("utf-8")))
+    for m in markers:
+        n_chars = int(missing * _PAD_SHARES[m] / total_share)
+        filler = (_FILLER_BLOCK * (n_chars // len(_FILLER_BLOCK) + 1))[:n_chars]
+        html = html.replace(m, filler, 1)
+    return html
+
+
+def _legacy(raw: bytes, base_url: str) -> tuple[str | None, int]:
+    html = raw.decode("utf-8", errors="replace")
+    return _best_image_url_from_html(html=html, base_url=base_url), len(raw)
+
+
+def _streaming(raw: bytes, base_url: str) -> tuple[str | None, int]:
+    extractor = _StreamingImageExtractor(base_url=base_url)
+    consumed = 0
+    for i in range(0, len(raw), PAGE_CHUNK_SIZE):
+        chunk = raw[i : i + PAGE_CHUNK_SIZE]
+        consumed += len(chunk)
+        # Fixtures are ASCII-safe at chunk boundaries; the network path uses an incremental decoder.
+        if extractor.feed(chunk.decode("utf-8", errors="replace")):
+            break
+    return extractor.result(), consumed
+
+
+def _time(fn, raw: bytes, base_url: str, repeat: int) -> tuple[float, str | None, int]:
+    samples: list[float] = []
+    result: str | None = None
+    consumed = 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result, consumed = fn(raw, base_url)
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1000.0, result, consumed
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Microbenchmark: full-document vs streaming product image extraction")
+    ap.add_argument("--fixtures-dir", default=str(FIXTURES_DIR), help="Directory with manifest.json + saved pages")
+    ap.add_argument("--page-kb", type=int, default=1500, help="Pad each fixture to roughly this size (0 = as saved)")
+    ap.add_argument("--repeat", type=int, default=20, help="Timing repetitions per page (median is reported)")
+    args = ap.parse_args(argv)
+
+    fixtures_dir = Path(args.fixtures_dir)
+    manifest = json.loads((fixtures_dir / "manifest.json").read_text(encoding="utf-8"))
+
+    print(f"{'page':34} {'size KB':>8} {'legacy ms':>10} {'stream ms':>10} {'read KB':>8} {'speedup':>8}  match")
+    mismatches = 0
+    target_width = int(manifest.get("sized_target_width") or 640)
+    for page in manifest.get("pages", []):
+        html = (fixtures_dir / page["file"]).read_text(encoding="utf-8")
+        raw = _pad_page(html, page_kb=int(args.page_kb)).encode("utf-8")
+        base_url = str(page["url"])
+
+        legacy_ms, legacy_img, _ = _time(_legacy, raw, base_url, int(args.repeat))
+        stream_ms, stream_img, consumed = _time(_streaming, raw, base_url, int(args.repeat))
+
+        expected = page.get("expected_image")
+        ok = legacy_img == stream_img and (expected is None or stream_img == expected)
+        mismatches += 0 if ok else 1
+        speedup = legacy_ms / stream_ms if stream_ms > 0 else float("inf")
+        print(
+            f"{page['file']:34} {len(raw) / 1024:8.0f} {legacy_ms:10.2f} {stream_ms:10.2f} "
+            f"{consumed / 1024:8.0f} {speedup:7.1f}x  {'ok' if ok else 'MISMATCH'}"
+        )
+        if not ok:
+            print(f"  legacy={legacy_img!r}\n  stream={stream_img!r}\n  expected={expected!r}")
+
+        # Size-aware selection (what enrichment downloads) against the manifest's expectation.
+        expected_sized = page.get("expected_sized_image")
+        if expected_sized is not None:
+            sized = _extract_image_url_from_html(html=raw.decode("utf-8"), base_url=base_url, target_width=target_width)
+            if sized != expected_sized:
+                mismatches += 1
+                print(f"  SIZED MISMATCH @{target_width}px: got={sized!r} expected={expected_sized!r}")
+
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
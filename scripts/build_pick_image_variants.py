@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+from lib.pick_image_enrichment import build_pick_image_variants_for_markdown
+from lib.pick_image_variants import DEFAULT_VARIANT_QUALITY, DEFAULT_VARIANT_WIDTHS, VariantEncoder, VariantSpec
+
+
+def _repo_root() -> Path:
+    return Path(__file__).resolve().parents[1]
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Build responsive WebP variants for pick images already on disk")
+    ap.add_argument("--posts-dir", default=None, help="Override posts directory (defaults to site/src/content/posts)")
+    ap.add_argument("--slug", action="append", default=None, help="Only process this post slug (repeatable)")
+    ap.add_argument(
+        "--widths",
+        default=",".join(str(w) for w in DEFAULT_VARIANT_WIDTHS),
+        help="Comma-separated maximum variant widths in px",
+    )
+    ap.add_argument("--quality", type=int, default=DEFAULT_VARIANT_QUALITY, help="WebP quality (0-100)")
+    ap.add_argument("--workers", type=int, default=None, help="Encoder processes (defaults to CPU count)")
+    ap.add_argument("--force", action="store_true", help="Rebuild picks that already list variants")
+    args = ap.parse_args(argv)
+
+    repo_root = _repo_root()
+    posts_dir = Path(args.posts_dir) if args.posts_dir else repo_root / "site" / "src" / "content" / "posts"
+    if not posts_dir.exists():
+        print(f"[error] Posts directory not found: {posts_dir}")
+        return 2
+
+    spec = VariantSpec(widths=tuple(int(w) for w in str(args.widths).split(",") if w.strip()), quality=int(args.quality))
+    wanted = set(args.slug) if args.slug else None
+
+    t0 = time.perf_counter()
+    total = 0
+    with VariantEncoder(spec, max_workers=args.workers) as encoder:
+        for md_path in sorted(posts_dir.glob("*.md")):
+            if wanted is not None and md_path.stem not in wanted:
+                continue
+            res = build_pick_image_variants_for_markdown(
+                markdown_path=md_path, encoder=encoder, repo_root=repo_root, force=bool(args.force)
+            )
+            total += res.picks_updated
+            if res.picks_updated or res.errors:
+                print(f"{md_path.stem}: updated={res.picks_updated} skipped={res.picks_skipped}")
+                for e in res.errors:
+                    print(f"- {e}")
+
+    print(f"Encoded variants for {total} picks in {time.perf_counter() - t0:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
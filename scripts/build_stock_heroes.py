@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+from managed_site.hydration import post_categories
+from pipeline.hero_files import Image
+from pipeline.hero_self_heal import HERO_FILE_NAMES, build_sized_hero_set
+from pipeline.stock_heroes import StockHeroLibrary
+
+
+def _repo_root() -> Path:
+    return Path(__file__).resolve().parents[1]
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(
+        description="Pre-render the category artwork in /images/category_assets as stock hero sets"
+    )
+    ap.add_argument("--force", action="store_true", help="Re-render every set, even if newer than its artwork")
+    ap.add_argument(
+        "--show-posts", action="store_true", help="Also list which stock hero each post would fall back to"
+    )
+    args = ap.parse_args(argv)
+
+    if Image is None:
+        print("[error] Pillow is required to render stock heroes")
+        return 2
+
+    repo_root = _repo_root()
+    public_dir = repo_root / "site" / "public"
+    library = StockHeroLibrary(public_dir=public_dir)
+    sources = library.sources()
+    if not sources:
+        print(f"No artwork found in {public_dir / 'images' / 'category_assets'}")
+        return 0
+
+    for key, variants in sources.items():
+        for source in variants:
+            set_dir = library.set_dir(source)
+            if args.force:
+                for name in HERO_FILE_NAMES:
+                    (set_dir / name).unlink(missing_ok=True)
+            t0 = time.perf_counter()
+            build_sized_hero_set(source, set_dir)
+            kb = sum((set_dir / name).stat().st_size for name in HERO_FILE_NAMES) / 1024
+            print(f"{key:12} {source.name:20} -> {set_dir.relative_to(public_dir)}/ {kb:7.1f} KB "
+                  f"({time.perf_counter() - t0:.1f}s)")
+
+    if args.show_posts:
+        print()
+        posts_dir = repo_root / "site" / "src" / "content" / "posts"
+        for md_path in sorted(posts_dir.glob("*.md")):
+            cats = post_categories(md_path)
+            source = library.choose(md_path.stem, cats)
+            stock = library.set_dir(source).relative_to(public_dir) if source is not None else "(placeholder)"
+            print(f"{md_path.stem}: {', '.join(cats) or '-'} -> {stock}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
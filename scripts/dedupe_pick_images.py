@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import argparse
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from lib.image_store import BLOB_DIRNAME, default_pick_image_store, sha256_file
+
+
+RE_FRONTMATTER = re.compile(r"^---\s*\n(.*?)\n---\s*\n", re.DOTALL)
+RE_PICK_IMAGE_URL = re.compile(r"/images/picks/[^\s\"',\]}]+")
+
+
+def _repo_root() -> Path:
+    return Path(__file__).resolve().parents[1]
+
+
+@dataclass
+class _Plan:
+    # per-slug public URL -> blob public URL
+    moves: dict[str, str] = field(default_factory=dict)
+    files: list[Path] = field(default_factory=list)
+    bytes_before: int = 0
+    bytes_after: int = 0
+    distinct: set[str] = field(default_factory=set)
+
+
+def _referenced_urls(posts_dirs: list[Path]) -> dict[Path, set[str]]:
+    refs: dict[Path, set[str]] = {}
+    for md_path in sorted({p.resolve() for d in posts_dirs for p in d.glob("*.md")}):
+        m = RE_FRONTMATTER.search(md_path.read_text(encoding="utf-8"))
+        if m:
+            refs[md_path] = set(RE_PICK_IMAGE_URL.findall(m.group(1)))
+    return refs
+
+
+def _per_slug_files(picks_dir: Path) -> list[Path]:
+    files: list[Path] = []
+    for slug_dir in sorted(p for p in picks_dir.iterdir() if p.is_dir() and p.name != BLOB_DIRNAME):
+        files.extend(sorted(f for f in slug_dir.iterdir() if f.is_file() and not f.name.startswith(".")))
+    return files
+
+
+def _rewrite_post(md_path: Path, moves: dict[str, str]) -> bool:
+    md = md_path.read_text(encoding="utf-8")
+    m = RE_FRONTMATTER.search(md)
+    if not m:
+        return False
+    fm = m.group(1)
+    new_fm = RE_PICK_IMAGE_URL.sub(lambda u: moves.get(u.group(0), u.group(0)), fm)
+    if new_fm == fm:
+        return False
+    md_path.write_text(md[: m.start(1)] + new_fm + md[m.end(1) :], encoding="utf-8")
+    return True
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(
+        description="Move per-post pick images into the content-addressed store and repoint posts at it"
+    )
+    ap.add_argument(
+        "--posts-dir",
+        default=None,
+        help="Also scan this posts directory (site/src/content/posts is always scanned: its posts share the images)",
+    )
+    ap.add_argument("--prune", action="store_true", help="Also delete pick images and blobs no post references")
+    ap.add_argument("--dry-run", action="store_true", help="Report savings without changing anything")
+    args = ap.parse_args(argv)
+
+    repo_root = _repo_root()
+    public_dir = repo_root / "site" / "public"
+    picks_dir = public_dir / "images" / "picks"
+    # References always come from every post sharing site/public: moving or pruning a file
+    # one post still points at, because only a subset was scanned, would break that post.
+    posts_dirs = [repo_root / "site" / "src" / "content" / "posts"]
+    if args.posts_dir:
+        posts_dirs.append(Path(args.posts_dir))
+    for d in (picks_dir, *posts_dirs):
+        if not d.exists():
+            print(f"[error] Missing {d}")
+            return 2
+
+    store = default_pick_image_store(repo_root)
+    refs = _referenced_urls(posts_dirs)
+    referenced = set().union(*refs.values()) if refs else set()
+
+    plan = _Plan()
+    orphans: list[Path] = []
+    for f in _per_slug_files(picks_dir):
+        url = "/" + f.relative_to(public_dir).as_posix()
+        if url not in referenced:
+            orphans.append(f)
+            continue
+        digest = sha256_file(f)
+        size = f.stat().st_size
+        plan.files.append(f)
+        plan.bytes_before += size
+        if digest not in plan.distinct:
+            plan.distinct.add(digest)
+            plan.bytes_after += size
+        plan.moves[url] = store.url_for(store.path_for(digest, f.suffix))
+
+    print(
+        f"Referenced per-post images: {len(plan.files)} files, {plan.bytes_before / 1e6:.1f} MB -> "
+        f"{len(plan.distinct)} blobs, {plan.bytes_after / 1e6:.1f} MB"
+    )
+    if orphans:
+        print(f"Unreferenced per-post images: {len(orphans)}" + ("" if args.prune else " (kept; use --prune)"))
+    if args.dry_run:
+        return 0
+
+    # Blobs first, then posts, then the old files: an interruption never leaves a dangling URL.
+    for f in plan.files:
+        store.put_file(f)
+    rewritten = 0
+    for md_path, urls in refs.items():
+        if urls & plan.moves.keys() and _rewrite_post(md_path, plan.moves):
+            rewritten += 1
+    for f in plan.files:
+        f.unlink(missing_ok=True)
+
+    if args.prune:
+        for f in orphans:
+            f.unlink(missing_ok=True)
+        live: set[str] = set()
+        for urls in _referenced_urls(posts_dirs).values():
+            live |= urls
+        pruned = 0
+        if store.root.exists():
+            for blob in store.root.iterdir():
+                if blob.is_file() and store.url_for(blob) not in live:
+                    blob.unlink()
+                    pruned += 1
+        print(f"Pruned: {len(orphans)} per-post images, {pruned} blobs")
+
+    for slug_dir in picks_dir.iterdir():
+        if slug_dir.is_dir() and slug_dir.name != BLOB_DIRNAME and not any(slug_dir.iterdir()):
+            slug_dir.rmdir()
+
+    print(f"Rewrote {rewritten} posts; store: {store.root}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from lib.enrichment_checkpoint import EnrichmentCheckpoint, default_checkpoint_dir
+from lib.http_cache import DEFAULT_TTL_SECONDS, HttpCache, default_http_cache_dir
+from lib.http_client import DEFAULT_LIMITS, build_async_client, connection_stats, http2_available
+from lib.http_replay import AsyncRecordingTransport, Cassette, ReplayTransport
+from lib.image_store import default_pick_image_store
+from lib.net_policy import HostPolicyConfig, NetworkPolicy
+from lib.pick_image_failures import DEFAULT_FAILURE_TTL_SECONDS, ImageFailureCache, default_pick_image_failures_path
+from lib.pick_image_variants import VariantSpec
+from lib.product_image_cache import ProductImageCache, default_product_image_cache_path
+from lib.pick_image_enrichment import (
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_MAX_PER_HOST,
+    DEFAULT_TARGET_IMAGE_WIDTH,
+    BatchPickImageEnrichmentResult,
+    enrich_pick_images_for_posts_async,
+)
+
+
+def _repo_root() -> Path:
+    return Path(__file__).resolve().parents[1]
+
+
+async def _enrich(transport: httpx.AsyncBaseTransport | None, **kwargs: Any) -> BatchPickImageEnrichmentResult:
+    async with build_async_client(transport=transport) as client:
+        return await enrich_pick_images_for_posts_async(client=client, **kwargs)
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Backfill pick images for every post through one shared work queue")
+    ap.add_argument("--posts-dir", default=None, help="Override posts directory (defaults to site/src/content/posts)")
+    ap.add_argument("--slug", action="append", default=None, help="Only process this post slug (repeatable)")
+    ap.add_argument("--force", action="store_true", help="Re-resolve picks that already have an image")
+    ap.add_argument("--max-picks", type=int, default=0, help="Only consider the first N products of each post")
+    ap.add_argument("--concurrency", type=int, default=DEFAULT_MAX_CONCURRENCY, help="Max in-flight requests")
+    ap.add_argument("--per-host", type=int, default=DEFAULT_MAX_PER_HOST, help="Max in-flight requests per host")
+    ap.add_argument(
+        "--rate-per-host",
+        type=float,
+        default=HostPolicyConfig.rate_per_second,
+        help="Initial requests/second per host (adapts down on 429/503, back up on success)",
+    )
+    ap.add_argument(
+        "--http-cache-ttl",
+        type=float,
+        default=DEFAULT_TTL_SECONDS,
+        help="Seconds a cached retailer response is reused before revalidating (0 = always revalidate)",
+    )
+    ap.add_argument("--no-http-cache", action="store_true", help="Disable the on-disk retailer response cache")
+    ap.add_argument(
+        "--no-resolution-cache",
+        action="store_true",
+        help="Always fetch product pages, even for products already resolved for another post",
+    )
+    ap.add_argument(
+        "--per-slug-pick-images",
+        action="store_true",
+        help="Store pick images under images/picks/<slug>/ instead of the shared content-addressed store",
+    )
+    ap.add_argument(
+        "--no-image-variants",
+        action="store_true",
+        help="Do not build responsive WebP variants (products[].imageVariants) for downloaded pick images",
+    )
+    ap.add_argument(
+        "--image-width",
+        type=int,
+        default=DEFAULT_TARGET_IMAGE_WIDTH,
+        help="Download the smallest retailer rendition at least this wide (0 = original size)",
+    )
+    ap.add_argument(
+        "--failure-ttl",
+        type=float,
+        default=DEFAULT_FAILURE_TTL_SECONDS,
+        help="Seconds a product whose page had no usable image is skipped before being retried",
+    )
+    ap.add_argument(
+        "--retry-failed",
+        action="store_true",
+        help="Retry every product in the failure cache now (successes are removed from it)",
+    )
+    ap.add_argument(
+        "--deadline",
+        type=float,
+        default=None,
+        help="Wall-clock budget in seconds; picks still in flight are dropped and posts written with the rest",
+    )
+    ap.add_argument(
+        "--no-checkpoint",
+        action="store_true",
+        help="Do not record finished picks in .cache/enrichment (a rerun then starts from scratch)",
+    )
+    traffic = ap.add_mutually_exclusive_group()
+    traffic.add_argument(
+        "--record-cassette", default=None, help="Record every retailer response into this cassette directory"
+    )
+    traffic.add_argument(
+        "--replay-cassette", default=None, help="Answer from this cassette instead of the network (fully offline)"
+    )
+    ap.add_argument("--dry-run", action="store_true", help="Resolve images but do not download or rewrite posts")
+    args = ap.parse_args(argv)
+
+    repo_root = _repo_root()
+    posts_dir = Path(args.posts_dir) if args.posts_dir else repo_root / "site" / "src" / "content" / "posts"
+    if not posts_dir.exists():
+        print(f"[error] Posts directory not found: {posts_dir}")
+        return 2
+
+    http_cache = None
+    if not args.no_http_cache:
+        http_cache = HttpCache(root=default_http_cache_dir(repo_root), ttl_seconds=float(args.http_cache_ttl))
+
+    image_resolutions = None
+    if not args.no_resolution_cache:
+        image_resolutions = ProductImageCache(path=default_product_image_cache_path(repo_root))
+
+    # --retry-failed keeps the cache (new failures are still recorded) but treats every entry as expired.
+    image_failures = ImageFailureCache(
+        path=default_pick_image_failures_path(repo_root),
+        ttl_seconds=0.0 if args.retry_failed else float(args.failure_ttl),
+    )
+
+    policy = NetworkPolicy(HostPolicyConfig(rate_per_second=float(args.rate_per_host)))
+
+    cassette = None
+    transport: httpx.AsyncBaseTransport | None = None
+    if args.record_cassette or args.replay_cassette:
+        cassette = Cassette(root=Path(args.record_cassette or args.replay_cassette))
+        if args.record_cassette:
+            inner = httpx.AsyncHTTPTransport(limits=DEFAULT_LIMITS, http2=http2_available())
+            transport = AsyncRecordingTransport(cassette, inner=inner)
+        else:
+            transport = ReplayTransport(cassette)
+
+    batch = asyncio.run(
+        _enrich(
+            transport,
+            posts_dir=posts_dir,
+            repo_root=repo_root,
+            slugs=args.slug,
+            dry_run=bool(args.dry_run),
+            max_picks=int(args.max_picks),
+            force=bool(args.force),
+            max_concurrency=int(args.concurrency),
+            max_per_host=int(args.per_host),
+            http_cache=http_cache,
+            policy=policy,
+            image_resolutions=image_resolutions,
+            blob_store=None if args.per_slug_pick_images else default_pick_image_store(repo_root),
+            image_variants=None if args.no_image_variants else VariantSpec(),
+            target_image_width=int(args.image_width) or None,
+            deadline_seconds=args.deadline,
+            image_failures=image_failures,
+            checkpoint=None if args.no_checkpoint else EnrichmentCheckpoint(root=default_checkpoint_dir(repo_root)),
+        )
+    )
+
+    if cassette is not None and args.record_cassette:
+        cassette.save()
+        print(f"Recorded {len(cassette)} responses into {cassette.root}")
+
+    for slug, res in batch.results.items():
+        note = " (deadline hit)" if res.timed_out else ""
+        print(f"{slug}: updated={res.picks_updated} skipped={res.picks_skipped}{note}")
+        for e in res.errors:
+            print(f"- {e}")
+
+    stats = batch.stats
+    print()
+    print(
+        f"Picks: attempted={stats.picks_attempted} updated={stats.picks_updated} failed={stats.picks_failed} "
+        f"in {stats.elapsed_seconds:.1f}s ({stats.picks_per_second:.2f} picks/s)"
+    )
+    if stats.picks_reused:
+        print(f"Reused from resolution cache: {stats.picks_reused}")
+    if stats.picks_known_failed:
+        print(
+            f"Skipped as known failures: {stats.picks_known_failed} "
+            "(see scripts/report_pick_image_failures.py; --retry-failed to retry)"
+        )
+    print(f"Network: requests={stats.requests} bytes={stats.bytes_downloaded} ({stats.bytes_downloaded / 1e6:.1f} MB)")
+    connections = connection_stats().snapshot()
+    if connections.requests:
+        print(f"Connections: {connections.summary()}")
+    throttled_hosts = {h: st for h, st in policy.stats().items() if st.throttled or st.errors or st.short_circuited}
+    if throttled_hosts:
+        print("Throttling by host:")
+        for host, st in throttled_hosts.items():
+            print(
+                f"- {host}: throttled={st.throttled} errors={st.errors} retries={st.retries} "
+                f"short_circuited={st.short_circuited}"
+            )
+    if stats.failures_by_host:
+        print("Failures by host:")
+        for host, n in sorted(stats.failures_by_host.items(), key=lambda kv: (-kv[1], kv[0])):
+            print(f"- {host}: {n}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+from pathlib import Path
+from typing import Any
+
+from openai import AsyncOpenAI
+
+from lib.file_digests import FileDigestIndex, default_file_digest_index_path
+from lib.generated_image_cache import GeneratedImageCache, default_generated_image_cache_dir
+from lib.http_replay import FaultInjector
+from lib.image_api_standin import ImageApiStandIn
+from pipeline.hero_batch import DEFAULT_HERO_CONCURRENCY, HeroBatchResult, generate_hero_images_async
+from pipeline.hero_self_heal import HERO_HEALTHY, audit_hero_assets
+from pipeline.image_step import DEFAULT_HERO_ENCODER_PROFILE, HERO_ENCODER_PROFILES
+
+
+def _repo_root() -> Path:
+    return Path(__file__).resolve().parents[1]
+
+
+async def _generate(base_url: str | None, **kwargs: Any) -> HeroBatchResult:
+    if base_url is None:
+        return await generate_hero_images_async(**kwargs)
+    async with AsyncOpenAI(base_url=base_url, api_key="stub") as client:
+        return await generate_hero_images_async(client=client, **kwargs)
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Generate hero images for many posts concurrently")
+    ap.add_argument("--posts-dir", default=None, help="Override posts directory (defaults to site/src/content/posts)")
+    ap.add_argument("--slug", action="append", default=None, help="Generate this post's hero (repeatable)")
+    ap.add_argument(
+        "--needing-heal",
+        action="store_true",
+        help="Generate every post whose hero is missing or a placeholder (see scripts/audit_hero_assets.py)",
+    )
+    ap.add_argument("--concurrency", type=int, default=DEFAULT_HERO_CONCURRENCY, help="Max in-flight API requests")
+    ap.add_argument("--rpm", type=float, default=0.0, help="Pace API requests to N per minute (0 = unpaced)")
+    ap.add_argument("--encode-workers", type=int, default=None, help="Threads decoding and encoding hero files")
+    ap.add_argument(
+        "--hero-profile",
+        choices=sorted(HERO_ENCODER_PROFILES),
+        default=DEFAULT_HERO_ENCODER_PROFILE,
+        help="Encoder profile for the hero files",
+    )
+    ap.add_argument("--no-image-cache", action="store_true", help="Always call the API, even for cached prompts")
+    ap.add_argument(
+        "--repo-root",
+        default=None,
+        help="Work on this checkout (its posts and site/public) instead of the one holding this script",
+    )
+    ap.add_argument(
+        "--stub",
+        action="store_true",
+        help="Answer from a local stand-in image API (offline; writes stub images, so requires a scratch --repo-root)",
+    )
+    ap.add_argument("--stub-latency-ms", type=float, default=1500.0, help="Stand-in latency per request")
+    ap.add_argument("--stub-error-rate", type=float, default=0.0, help="Share of stand-in requests that fail")
+    args = ap.parse_args(argv)
+
+    repo_root = Path(args.repo_root).resolve() if args.repo_root else _repo_root()
+    if args.stub and repo_root == _repo_root():
+        print("[error] --stub writes stand-in images into the site; pass --repo-root pointing at a scratch copy")
+        return 2
+    posts_dir = Path(args.posts_dir) if args.posts_dir else repo_root / "site" / "src" / "content" / "posts"
+    if not posts_dir.exists():
+        print(f"[error] Posts directory not found: {posts_dir}")
+        return 2
+    public_dir = repo_root / "site" / "public"
+
+    slugs = list(args.slug or [])
+    if args.needing_heal:
+        index = FileDigestIndex(path=default_file_digest_index_path(repo_root))
+        for md_path in sorted(posts_dir.glob("*.md")):
+            if audit_hero_assets(public_dir=public_dir, slug=md_path.stem, digest_index=index).status != HERO_HEALTHY:
+                slugs.append(md_path.stem)
+        index.save()
+    if not slugs:
+        print("Nothing to generate (pass --slug or --needing-heal)")
+        return 0
+
+    standin = None
+    if args.stub:
+        faults = FaultInjector(
+            latency_seconds=args.stub_latency_ms / 1000.0, error_rate=float(args.stub_error_rate), seed=None
+        )
+        standin = ImageApiStandIn(faults=faults).start()
+    try:
+        result = asyncio.run(
+            _generate(
+                standin.base_url if standin else None,
+                slugs=slugs,
+                posts_dir=posts_dir,
+                public_dir=public_dir,
+                concurrency=int(args.concurrency),
+                requests_per_minute=float(args.rpm) or None,
+                encode_workers=args.encode_workers,
+                encoder_profile=str(args.hero_profile),
+                image_cache=(
+                    None
+                    if args.no_image_cache or args.stub
+                    else GeneratedImageCache(root=default_generated_image_cache_dir(repo_root))
+                ),
+            )
+        )
+    finally:
+        if standin is not None:
+            standin.stop()
+
+    for item in result.items:
+        if item.ok:
+            print(f"{item.slug}: ok ({item.source}, {item.seconds:.1f}s)")
+        else:
+            print(f"{item.slug}: FAILED {item.error}")
+    print()
+    print(
+        f"Heroes: generated={result.generated} failed={result.failed} api_requests={result.api_requests} "
+        f"in {result.elapsed_seconds:.1f}s ({result.heroes_per_second:.2f}/s)"
+    )
+    return 1 if result.failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
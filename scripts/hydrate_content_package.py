@@ -3,7 +3,10 @@ from __future__ import annotations
 import argparse
 from pathlib import Path
 
+from lib.http_cache import DEFAULT_TTL_SECONDS
+from lib.http_client import connection_stats
 from managed_site.hydration import hydrate_blog_post_from_package
+from pipeline.hero_profiles import DEFAULT_HERO_ENCODER_PROFILE, HERO_ENCODER_PROFILES
 
 
 def _repo_root() -> Path:
@@ -15,12 +18,67 @@ def main(argv: list[str] | None = None) -> int:
     ap.add_argument("--package-dir", required=True, help="Path to content_factory/packages/<brand_id>/<run_id>")
     ap.add_argument("--overwrite", action="store_true", help="Overwrite existing post if present")
     ap.add_argument("--no-pick-images", action="store_true", help="Skip pick image enrichment")
+    ap.add_argument(
+        "--pick-image-concurrency",
+        type=int,
+        default=1,
+        help="Fetch pick images concurrently with up to N in-flight requests (1 = sequential)",
+    )
+    ap.add_argument(
+        "--http-cache-ttl",
+        type=float,
+        default=DEFAULT_TTL_SECONDS,
+        help="Seconds a cached retailer response is reused before revalidating (0 = always revalidate)",
+    )
+    ap.add_argument("--no-http-cache", action="store_true", help="Disable the on-disk retailer response cache")
+    ap.add_argument(
+        "--no-resolution-cache",
+        action="store_true",
+        help="Always fetch product pages, even for products already resolved for another post",
+    )
+    ap.add_argument(
+        "--per-slug-pick-images",
+        action="store_true",
+        help="Store pick images under images/picks/<slug>/ instead of the shared content-addressed store",
+    )
+    ap.add_argument(
+        "--no-image-variants",
+        action="store_true",
+        help="Do not build responsive WebP variants (products[].imageVariants) for downloaded pick images",
+    )
+    ap.add_argument(
+        "--retry-failed-pick-images",
+        action="store_true",
+        help="Retry products recorded in the pick image failure cache instead of skipping them",
+    )
+    ap.add_argument(
+        "--pick-image-deadline",
+        type=float,
+        default=None,
+        help="Stop fetching pick images after N seconds and write what finished (a rerun resumes the rest)",
+    )
     ap.add_argument("--dry-run", action="store_true", help="Skip networked hydration steps (still writes the post)")
     ap.add_argument(
         "--no-hero-regen",
         action="store_true",
         help="Do not attempt hero regeneration even if OPENAI_API_KEY is set (uses placeholder)",
     )
+    ap.add_argument(
+        "--defer-hero",
+        action="store_true",
+        help="Install the placeholder hero and queue generation for scripts/run_hero_jobs.py instead of waiting",
+    )
+    ap.add_argument(
+        "--hero-profile",
+        choices=sorted(HERO_ENCODER_PROFILES),
+        default=DEFAULT_HERO_ENCODER_PROFILE,
+        help="Hero encoding: fast (bulk backfills), balanced, or max-compression (smallest files)",
+    )
+    ap.add_argument(
+        "--no-hero-image-cache",
+        action="store_true",
+        help="Always call the image API, even if this hero prompt was already generated (.cache/generated_images)",
+    )
 
     args = ap.parse_args(argv)
 
@@ -36,17 +94,32 @@ def main(argv: list[str] | None = None) -> int:
         enrich_pick_images=not bool(args.no_pick_images),
         dry_run=bool(args.dry_run),
         regen_hero_if_possible=not bool(args.no_hero_regen),
+        pick_image_concurrency=int(args.pick_image_concurrency),
+        http_cache_ttl_seconds=None if args.no_http_cache else float(args.http_cache_ttl),
+        reuse_resolved_pick_images=not bool(args.no_resolution_cache),
+        content_addressed_pick_images=not bool(args.per_slug_pick_images),
+        pick_image_variants=not bool(args.no_image_variants),
+        pick_image_deadline_seconds=args.pick_image_deadline,
+        retry_failed_pick_images=bool(args.retry_failed_pick_images),
+        hero_encoder_profile=args.hero_profile,
+        reuse_generated_hero_images=not bool(args.no_hero_image_cache),
+        defer_hero_generation=bool(args.defer_hero),
     )
 
     print(f"Applied package: {res.package_dir}")
     print(f"Wrote post: {res.post_path}")
     print(f"Hero: {res.hero_paths.get('heroImage')}")
+    if res.hero_job_enqueued:
+        print("Hero generation queued (run: python -m scripts.run_hero_jobs)")
     if not args.no_pick_images:
         print(f"Pick images: updated={res.pick_images_updated} skipped={res.pick_images_skipped}")
         if res.pick_image_errors:
             print("Pick image errors:")
             for e in res.pick_image_errors:
                 print(f"- {e}")
+        connections = connection_stats().snapshot()
+        if connections.requests:
+            print(f"Connections: {connections.summary()}")
 
     return 0
 
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from lib.pick_image_failures import (
+    DEFAULT_FAILURE_TTL_SECONDS,
+    ImageFailureCache,
+    default_pick_image_failures_path,
+    iso_timestamp,
+)
+
+
+def _repo_root() -> Path:
+    return Path(__file__).resolve().parents[1]
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(
+        description="List products whose pick image could not be resolved (the enrichment negative cache)"
+    )
+    ap.add_argument("--all", action="store_true", help="Include expired entries (they are retried on the next run)")
+    ap.add_argument(
+        "--ttl",
+        type=float,
+        default=DEFAULT_FAILURE_TTL_SECONDS,
+        help="TTL used to decide which entries are still skipped (match the enrichment runs)",
+    )
+    ap.add_argument("--json", action="store_true", help="Print entries as JSON lines")
+    ap.add_argument("--prune", action="store_true", help="Remove expired entries from the cache")
+    ap.add_argument("--forget", action="append", default=None, help="Remove this product URL (repeatable)")
+    args = ap.parse_args(argv)
+
+    cache = ImageFailureCache(path=default_pick_image_failures_path(_repo_root()), ttl_seconds=float(args.ttl))
+    now = time.time()
+
+    if args.forget:
+        for url in args.forget:
+            cache.forget(url)
+    pruned = cache.prune_expired() if args.prune else 0
+    cache.save()
+
+    entries = sorted(
+        cache.load().values(), key=lambda e: (str(e.get("reason")), str(e.get("post")), str(e.get("pick_id")))
+    )
+    if not args.all:
+        entries = [e for e in entries if not cache.is_expired(e, now=now)]
+
+    if args.json:
+        for e in entries:
+            print(json.dumps({**e, "expires_at": iso_timestamp(cache.expires_at(e))}, ensure_ascii=False))
+        return 0
+
+    reason = None
+    for e in entries:
+        if e.get("reason") != reason:
+            reason = e.get("reason")
+            print(f"\n{reason}:")
+        state = "expired" if cache.is_expired(e, now=now) else f"skipped until {iso_timestamp(cache.expires_at(e))}"
+        print(
+            f"- {e.get('post')} {e.get('pick_id')}: {e.get('product_url')}\n"
+            f"  {e.get('failures')}x since {iso_timestamp(float(e.get('first_failed_at') or 0))}, {state}"
+        )
+
+    print()
+    print(f"Failures: {len(entries)}" + (f" (pruned {pruned} expired)" if pruned else ""))
+    print(f"Cache: {cache.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
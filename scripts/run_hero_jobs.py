@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from pathlib import Path
+
+from openai import AsyncOpenAI
+
+from lib.generated_image_cache import GeneratedImageCache, default_generated_image_cache_dir
+from lib.hero_jobs import HeroJobQueue, default_hero_job_dir
+from lib.http_replay import FaultInjector
+from lib.image_api_standin import ImageApiStandIn
+from lib.pick_image_failures import iso_timestamp
+from pipeline.hero_batch import DEFAULT_HERO_CONCURRENCY, HeroJobsResult, drain_hero_jobs_async
+
+
+def _repo_root() -> Path:
+    return Path(__file__).resolve().parents[1]
+
+
+async def _drain(repo_root: Path, queue: HeroJobQueue, base_url: str | None, **kwargs: object) -> HeroJobsResult:
+    if base_url is None:
+        return await drain_hero_jobs_async(repo_root=repo_root, queue=queue, **kwargs)  # type: ignore[arg-type]
+    async with AsyncOpenAI(base_url=base_url, api_key="stub") as client:
+        return await drain_hero_jobs_async(
+            repo_root=repo_root, queue=queue, client=client, **kwargs  # type: ignore[arg-type]
+        )
+
+
+def _print_status(queue: HeroJobQueue) -> None:
+    pending, running, failed = queue.pending(), queue.running(), queue.failed()
+    print(f"Hero jobs: pending={len(pending)} running={len(running)} failed={len(failed)}")
+    for label, jobs in (("pending", pending), ("running", running), ("failed", failed)):
+        for job in jobs:
+            line = f"- {label:8} {job.slug} (enqueued {iso_timestamp(job.enqueued_at)}, attempts={job.attempts})"
+            if job.not_before > time.time():
+                line += f" retry after {iso_timestamp(job.not_before)}"
+            if job.last_error:
+                line += f": {job.last_error}"
+            print(line)
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Generate heroes queued by deferred hydration and swap them in")
+    ap.add_argument("--status", action="store_true", help="List queued jobs and exit")
+    ap.add_argument("--limit", type=int, default=None, help="Claim at most N jobs per pass")
+    ap.add_argument(
+        "--watch",
+        type=float,
+        default=0.0,
+        metavar="SECONDS",
+        help="Keep polling the queue every N seconds instead of exiting once it is drained",
+    )
+    ap.add_argument("--concurrency", type=int, default=DEFAULT_HERO_CONCURRENCY, help="Max in-flight API requests")
+    ap.add_argument("--rpm", type=float, default=0.0, help="Pace API requests to N per minute (0 = unpaced)")
+    ap.add_argument("--encode-workers", type=int, default=None, help="Threads decoding and encoding hero files")
+    ap.add_argument(
+        "--repo-root",
+        default=None,
+        help="Work on this checkout (its queue, posts and site/public) instead of the one holding this script",
+    )
+    ap.add_argument(
+        "--stub",
+        action="store_true",
+        help="Answer from a local stand-in image API (offline; writes stub images, so requires a scratch --repo-root)",
+    )
+    ap.add_argument("--stub-latency-ms", type=float, default=1500.0, help="Stand-in latency per request")
+    args = ap.parse_args(argv)
+
+    repo_root = Path(args.repo_root).resolve() if args.repo_root else _repo_root()
+    if args.stub and repo_root == _repo_root():
+        print("[error] --stub writes stand-in images into the site; pass --repo-root pointing at a scratch copy")
+        return 2
+    queue = HeroJobQueue(root=default_hero_job_dir(repo_root))
+    if args.status:
+        _print_status(queue)
+        return 0
+
+    standin = None
+    if args.stub:
+        standin = ImageApiStandIn(faults=FaultInjector(latency_seconds=args.stub_latency_ms / 1000.0)).start()
+    failed = 0
+    try:
+        while True:
+            res = asyncio.run(
+                _drain(
+                    repo_root,
+                    queue,
+                    standin.base_url if standin else None,
+                    limit=args.limit,
+                    concurrency=int(args.concurrency),
+                    requests_per_minute=float(args.rpm) or None,
+                    encode_workers=args.encode_workers,
+                    # Stand-in images must never land in the cache real runs reuse.
+                    image_cache=(
+                        None if args.stub else GeneratedImageCache(root=default_generated_image_cache_dir(repo_root))
+                    ),
+                )
+            )
+            if res.claimed:
+                print(
+                    f"Hero jobs: claimed={res.claimed} generated={res.generated} "
+                    f"already_healthy={res.already_healthy} dropped={res.dropped} "
+                    f"retrying={res.retrying} failed={res.failed} in {res.elapsed_seconds:.1f}s"
+                )
+                for e in res.errors:
+                    print(f"- {e}")
+            failed += res.failed
+            if args.watch <= 0:
+                if res.claimed and args.limit is None:
+                    continue  # jobs enqueued while this pass ran
+                break
+            if not res.claimed:
+                time.sleep(float(args.watch))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if standin is not None:
+            standin.stop()
+
+    if args.watch <= 0:
+        _print_status(queue)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
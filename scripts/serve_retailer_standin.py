@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from lib.http_replay import Cassette, FaultInjector
+from lib.retailer_standin import ORIGIN_URL_HEADER, RetailerStandIn
+from scripts.bench_image_extractor import FIXTURES_DIR
+from scripts.bench_enrichment import fixture_cassette
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Serve recorded retailer traffic locally with injected latency and errors")
+    ap.add_argument("--cassette", default=None, help="Recorded cassette directory (defaults to the page fixtures)")
+    ap.add_argument("--fixtures-dir", default=str(FIXTURES_DIR), help="Page fixtures used when no cassette is given")
+    ap.add_argument("--page-kb", type=int, default=300, help="Pad fixture pages to roughly this size")
+    ap.add_argument("--image-kb", type=int, default=60, help="Size of the synthetic fixture images")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency-ms", type=float, default=0.0, help="Injected latency per request")
+    ap.add_argument("--jitter-ms", type=float, default=0.0, help="Extra random latency per request (uniform 0..N)")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="Share of requests that fail (503 or reset)")
+    ap.add_argument("--reset-share", type=float, default=0.25, help="Share of failures injected as connection resets")
+    ap.add_argument("--seed", type=int, default=None, help="Seed for jitter and error injection (default: random)")
+    args = ap.parse_args(argv)
+
+    if args.cassette:
+        cassette = Cassette(root=Path(args.cassette))
+        product_urls = cassette.urls(content_type="text/html")
+    else:
+        cassette, product_urls = fixture_cassette(
+            Path(args.fixtures_dir), page_kb=int(args.page_kb), image_kb=int(args.image_kb)
+        )
+
+    faults = FaultInjector(
+        latency_seconds=args.latency_ms / 1000.0,
+        jitter_seconds=args.jitter_ms / 1000.0,
+        error_rate=float(args.error_rate),
+        reset_share=float(args.reset_share),
+        seed=args.seed,
+    )
+    standin = RetailerStandIn(cassette, faults=faults, host=args.host, port=int(args.port))
+    base = f"http://{args.host}:{args.port}"
+    print(f"Serving {len(cassette)} recorded responses on {base}")
+    print(f"Route clients with lib.retailer_standin.StandInTransport({base!r}) or send '{ORIGIN_URL_HEADER}'.")
+    for url in product_urls[:5]:
+        scheme, _, rest = url.partition("://")
+        print(f"- {url}\n  {base}/{scheme}/{rest}")
+    try:
+        standin.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -41,6 +41,14 @@ const posts = defineCollection({
     heroImageCard: z.string().optional(),
     heroImageSource: z.string().optional(),
 
+    /**
+     * Written by hydration / hero generation: intrinsic size of heroImage and a
+     * tiny blurred WebP data URI shown while it loads.
+     */
+    heroImagePlaceholder: z.string().startsWith("data:image/").optional(),
+    heroImageWidth: z.number().int().positive().optional(),
+    heroImageHeight: z.number().int().positive().optional(),
+
     heroAlt: z.string().optional(),
     imageCreditName: z.string().optional(),
     imageCreditUrl: z.string().optional(),
@@ -80,6 +88,24 @@ const posts = defineCollection({
               z.literal(""),
             ])
             .optional(),
+
+          /**
+           * Written by pick image enrichment: intrinsic size of `image`,
+           * width-bounded WebP variants (ascending width) for srcset, and a
+           * tiny blurred WebP data URI shown while `image` loads.
+           */
+          imageWidth: z.number().int().positive().optional(),
+          imageHeight: z.number().int().positive().optional(),
+          imagePlaceholder: z.string().startsWith("data:image/").optional(),
+          imageVariants: z
+            .array(
+              z.object({
+                src: z.string().regex(/^\/[^\s]+$/),
+                width: z.number().int().positive(),
+                height: z.number().int().positive(),
+              }),
+            )
+            .optional(),
         }),
       )
       .default([]),